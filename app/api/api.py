@@ -4,10 +4,12 @@ from app.api.routes.economic import router as economic_router
 from app.api.routes.balance import router as balance_router
 from app.api.routes.stocks import router as stocks_router
 from app.api.routes.stock_management import router as stock_management_router
+from app.api.routes.health import router as health_router
 
 api_router = APIRouter()
 api_router.include_router(stock_recommendations_router, prefix="/stocks/recommendations", tags=["주식 추천"])
 api_router.include_router(economic_router, prefix="/economic", tags=["경제 지표"])
 api_router.include_router(balance_router, prefix="/balance", tags=["잔고"])
 api_router.include_router(stocks_router, prefix="/stocks", tags=["주식"])
-api_router.include_router(stock_management_router, prefix="/api/management", tags=["종목 관리"])
\ No newline at end of file
+api_router.include_router(stock_management_router, prefix="/api/management", tags=["종목 관리"])
+api_router.include_router(health_router, prefix="/health", tags=["상태"])
\ No newline at end of file
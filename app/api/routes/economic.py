@@ -1,38 +1,76 @@
 from fastapi import APIRouter, BackgroundTasks, HTTPException, Depends
 from app.schemas.stock import UpdateResponse
-from app.utils.scheduler import run_economic_data_update_now
+from app.services.economic_service import submit_economic_data_update, economic_ingest_worker
+from app.utils.telemetry import collection_telemetry
+from app.utils.rate_limiter import get_rate_limiter_status
+from typing import Optional
 from datetime import date, datetime, timedelta
+from stock import collect_ohlcv, build_ohlcv_field_frame, OHLCV_FIELDS
 import pandas as pd
-import yfinance as yf
 import asyncio
 import os
 
 router = APIRouter()
 
 @router.post("/update", summary="경제 및 주식 데이터 업데이트", response_model=UpdateResponse)
-async def update_economic_data(
-    background_tasks: BackgroundTasks
-):
+async def update_economic_data():
     """
     경제 및 주식 데이터를 Supabase에 저장합니다.
-    이 작업은 백그라운드에서 실행되어 API 응답을 블로킹하지 않습니다.
+    이 작업은 전용 작업자 스레드에서 실행되어 API 응답과 이벤트 루프를 블로킹하지 않습니다.
+    진행 상황은 /update/status 에서 job_id로 확인할 수 있습니다.
     
     DB에서 마지막 수집 날짜를 자동으로 찾아 그 다음 날부터 수집합니다.
     기존 데이터의 NULL 값은 새 데이터로 자동 업데이트됩니다.
     """
     try:
-        # 백그라운드 작업으로 경제 데이터 업데이트 실행
-        background_tasks.add_task(run_economic_data_update_now)
+        # 작업자 스레드에 제출 (이미 실행 중이면 실행 중인 작업을 반환)
+        job = submit_economic_data_update()
         
         return {
             "success": True,
             "message": "경제 데이터 업데이트가 백그라운드에서 시작되었습니다.",
             "total_records": 0,
-            "updated_records": 0
+            "updated_records": 0,
+            "job_id": job.id
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"데이터 업데이트 중 오류 발생: {str(e)}")
 
+@router.get("/update/status", summary="경제 데이터 업데이트 진행 상황 조회", response_model=dict)
+async def get_update_status(job_id: Optional[str] = None):
+    """
+    경제 데이터 업데이트 작업의 상태, 단계, 진행률을 반환합니다.
+
+    Parameters:
+    - job_id: 조회할 작업 ID (생략 시 가장 최근 작업)
+    """
+    job = economic_ingest_worker.get(job_id) if job_id else economic_ingest_worker.current
+    if job is None:
+        raise HTTPException(status_code=404, detail="업데이트 작업 기록이 없습니다.")
+    return {"job": job.to_dict(), "jobs": economic_ingest_worker.list_jobs()}
+
+@router.get("/telemetry", summary="데이터 수집 텔레메트리 조회", response_model=dict)
+async def get_collection_telemetry(run_id: Optional[str] = None):
+    """
+    FRED, Yahoo Finance, Alpha Vantage 요청의 수집 실행별 텔레메트리 요약을 반환합니다.
+
+    - 제공자별 요청 수, 실패/빈 응답 수, 재시도 횟수, 응답 크기, 반환 행 수
+    - 지연 시간 p50/p95/max 및 히스토그램
+    - 가장 느린 시리즈와 누락된 시리즈 목록
+    - 제공자별 속도 제한기의 현재 요청 속도와 회로 차단기 상태
+
+    Parameters:
+    - run_id: 조회할 수집 실행 ID (생략 시 가장 최근 실행)
+    """
+    summary = collection_telemetry.get_summary(run_id)
+    if summary is None:
+        raise HTTPException(status_code=404, detail="텔레메트리 기록이 없습니다.")
+    return {
+        "summary": summary,
+        "runs": collection_telemetry.list_runs(),
+        "rate_limiters": get_rate_limiter_status()
+    }
+
 @router.post("/collect-volume", summary="주식 거래량 데이터 수집", response_model=UpdateResponse)
 async def collect_volume_data(
     background_tasks: BackgroundTasks,
@@ -41,8 +79,10 @@ async def collect_volume_data(
     """
     주요 주식의 거래량 데이터를 수집합니다.
     
-    현재 날짜에서 최대 200일 전까지의 거래량 데이터를 수집하여 
-    CSV 파일로 저장하고, 추후 DB에 저장할 수 있습니다.
+    현재 날짜에서 최대 200일 전까지의 OHLCV(시가/고가/저가/종가/거래량) 데이터를 종목당 한 번의 요청으로 수집하여
+    거래량은 volume.csv, 전체 OHLCV는 ohlcv.csv로 저장하고, 추후 DB에 저장할 수 있습니다.
+    경제 데이터 수집이 stock_daily_ohlcv에 기록한 OHLCV가 기간을 빠짐없이 덮는 종목은 다시 요청하지 않고,
+    새로 받은 종목은 stock_daily_ohlcv/stock_daily_volume에 기록합니다.
     
     Parameters:
     - lookback_days: 수집할 과거 데이터 일수 (기본값: 200일)
@@ -62,7 +102,7 @@ async def collect_volume_data(
 
 async def collect_stock_volume_data(lookback_days=200):
     """
-    주요 주식의 거래량 데이터를 수집하는 백그라운드 작업
+    주요 주식의 OHLCV 데이터를 수집해 거래량/OHLCV CSV로 저장하는 백그라운드 작업
     
     Args:
         lookback_days (int): 수집할 과거 데이터 일수 (기본값: 200일)
@@ -113,38 +153,19 @@ async def collect_stock_volume_data(lookback_days=200):
         
         print(f"거래량 데이터 수집 시작: {start_date} ~ {end_date}")
         
-        # 결과 저장을 위한 DataFrame 생성
-        result_df = pd.DataFrame()
+        # 종목당 한 번의 Chart API 요청으로 OHLCV 수집 (동기 요청이므로 스레드에서 실행)
+        loop = asyncio.get_running_loop()
+        frames = await loop.run_in_executor(None, collect_ohlcv, stock_to_ticker, start_date, end_date)
         
-        # 각 종목에 대해 데이터 수집
-        for stock_name, ticker in stock_to_ticker.items():
-            try:
-                print(f"{stock_name} ({ticker}) 데이터 수집 중...")
-                
-                # Yahoo Finance에서 데이터 다운로드
-                df = yf.download(ticker, start=start_date, end=end_date, auto_adjust=True, progress=False)
-                
-                if not df.empty:
-                    # 거래량 데이터만 추출
-                    volume_data = df[['Volume']].copy()
-                    volume_data.columns = [stock_name]
-                    
-                    # 첫 종목이면 날짜 인덱스 설정, 아니면 기존 데이터에 병합
-                    if result_df.empty:
-                        result_df = volume_data
-                    else:
-                        result_df = pd.merge(result_df, volume_data, left_index=True, right_index=True, how='outer')
-                    
-                    print(f"  - {stock_name}: {len(df)}일치 데이터 수집 완료")
-                else:
-                    print(f"  - {stock_name}: 데이터가 없습니다.")
-                
-                # API 호출 제한 방지를 위한 지연
-                await asyncio.sleep(0.5)
-                
-            except Exception as e:
-                print(f"  - {stock_name} 데이터 수집 중 오류: {str(e)}")
-                continue
+        for stock_name in stock_to_ticker:
+            df = frames.get(stock_name)
+            if df is not None and not df.empty:
+                print(f"  - {stock_name}: {len(df)}일치 데이터 수집 완료")
+            else:
+                print(f"  - {stock_name}: 데이터가 없습니다.")
+        
+        # 거래량만 모은 날짜 × 종목 데이터프레임 (기존 volume.csv 형식 유지)
+        result_df = build_ohlcv_field_frame(frames, "Volume")
         
         # 결과가 있는 경우 CSV 파일로 저장
         if not result_df.empty:
@@ -158,6 +179,17 @@ async def collect_stock_volume_data(lookback_days=200):
             result_df.to_csv(file_path, index=False, encoding='utf-8-sig')
             
             print(f"총 {len(result_df)}일치의 거래량 데이터를 {file_path}에 저장했습니다.")
+            
+            # 전체 OHLCV는 날짜/종목 기준 세로 형식으로 저장
+            ohlcv_df = pd.concat(
+                [df.assign(종목=stock_name) for stock_name, df in frames.items() if not df.empty]
+            )
+            ohlcv_df.index.name = "날짜"
+            ohlcv_df = ohlcv_df.reset_index()[["날짜", "종목", *OHLCV_FIELDS]]
+            ohlcv_df["날짜"] = ohlcv_df["날짜"].dt.strftime('%Y-%m-%d')
+            ohlcv_path = os.path.join(os.getcwd(), "ohlcv.csv")
+            ohlcv_df.to_csv(ohlcv_path, index=False, encoding='utf-8-sig')
+            print(f"OHLCV 데이터 {len(ohlcv_df)}행을 {ohlcv_path}에 저장했습니다.")
             return {
                 "success": True, 
                 "message": f"거래량 데이터 수집 완료: {len(result_df)}일치", 
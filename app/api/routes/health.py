@@ -0,0 +1,47 @@
+from fastapi import APIRouter, Response
+from app.services.economic_service import get_data_freshness, economic_ingest_worker
+from app.utils.scheduler import get_scheduler_status
+import app.utils.scheduler as scheduler
+
+router = APIRouter()
+
+@router.get("/", summary="서비스 동작 확인")
+async def read_health():
+    """프로세스가 요청을 처리할 수 있으면 즉시 200을 반환합니다 (liveness)."""
+    return {"status": "ok"}
+
+@router.get("/ready", summary="서비스 준비 상태 및 데이터 최신 여부 조회")
+def read_readiness(response: Response, require_fresh: bool = False):
+    """
+    DB 연결, 경제 데이터 최신 여부, 초기/정기 수집 작업 진행 상황, 스케줄러 상태를 반환합니다.
+
+    - DB 조회에 실패하면 503
+    - require_fresh=true 이면 데이터가 최신(어제 날짜까지 저장됨)이 아닐 때도 503
+
+    Parameters:
+    - require_fresh: 데이터가 최신일 때만 준비 완료로 판단할지 여부 (기본값: False)
+    """
+    job = economic_ingest_worker.current
+    result = {
+        "ready": True,
+        "database": "ok",
+        "freshness": None,
+        "ingest_job": job.to_dict() if job else None,
+        "schedulers": {
+            **get_scheduler_status(),
+            "economic_running": scheduler.economic_data_scheduler_running,
+        },
+    }
+
+    try:
+        result["freshness"] = get_data_freshness()
+    except Exception as e:
+        result["ready"] = False
+        result["database"] = f"error: {str(e)}"
+
+    if require_fresh and not (result["freshness"] or {}).get("fresh"):
+        result["ready"] = False
+
+    if not result["ready"]:
+        response.status_code = 503
+    return result
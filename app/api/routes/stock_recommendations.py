@@ -1,4 +1,6 @@
 from fastapi import APIRouter, HTTPException
+from app.db.read_cache import read_cache
+from app.services.intraday_indicators import intraday_indicators
 from app.services.stock_recommendation_service import StockRecommendationService
 from app.utils.scheduler import run_auto_buy_now, start_scheduler, stop_scheduler, stock_scheduler, run_auto_sell_now, start_sell_scheduler, stop_sell_scheduler, get_scheduler_status
 
@@ -43,27 +45,47 @@ async def analyze_news_sentiment():
         raise HTTPException(status_code=500, detail=f"뉴스 감정 분석 중 오류 발생: {str(e)}")
 
 @router.post("/recommended-stocks/generate-technical-recommendations", response_model=dict)
-async def generate_technical_recommendations():
+async def generate_technical_recommendations(reset: bool = False):
     """
     기술적 지표를 기반으로 추천 데이터를 생성하고 Supabase에 저장합니다.
+    reset=true이면 저장된 지표 상태를 버리고 조회 기간 전체를 다시 계산해 지표 이력(indicator_history)도 다시 기록합니다.
     """
     try:
-        recommendations = service.generate_technical_recommendations()
+        recommendations = service.generate_technical_recommendations(reset=reset)
         return {"message": "기술적 추천 데이터가 성공적으로 생성되고 저장되었습니다", "data": recommendations}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"기술적 추천 데이터 생성 중 오류 발생: {str(e)}")
 
+@router.get("/intraday-indicators", response_model=dict)
+async def get_intraday_indicators():
+    """
+    매도 판단에서 마지막으로 계산한 장중 기술적 지표를 반환합니다 (DB 조회 없음).
+    현재가를 오늘의 임시 봉으로 반영한 값이며, 임시_봉=false이면 확정 종가 기준 지표입니다.
+    """
+    rows = intraday_indicators.snapshot()
+    return {"count": len(rows), "results": rows}
+
+@router.get("/read-cache", response_model=dict)
+async def get_read_cache_stats():
+    """
+    추천 서비스 조회 캐시의 테이블별 적중/실패 횟수, 적중률, TTL을 반환합니다.
+    적중률이 낮으면 같은 주기 안에서도 DB 조회가 반복되고 있다는 뜻입니다.
+    """
+    return read_cache.stats()
+
 @router.get("/recommended-stocks/with-technical-and-sentiment", response_model=dict)
-async def get_recommended_stocks_with_technical_and_sentiment():
+async def get_recommended_stocks_with_technical_and_sentiment(refresh: bool = False):
     """
-    추천 주식 목록을 기술적 지표(stock_recommendations 테이블)와 감정 분석(ticker_sentiment_analysis 테이블)을
-    결합하여 반환합니다.
-    - stock_recommendations에서 골든_크로스=true, MACD_매수_신호=true, RSI<50 중 하나 이상 만족하는 종목 필터링
+    추천 주식 목록을 기술적 지표(indicator_history 최신 행)와 감정 분석(ticker_sentiment_analysis 테이블)을
+    결합한 매수 후보 결정 스냅샷을 반환합니다.
+    - 최신 지표에서 골든_크로스=true, MACD_매수_신호=true, RSI<50 중 2개 이상 만족하는 종목 필터링
     - ticker_sentiment_analysis에서 average_sentiment_score >= 0.15인 데이터와 결합
-    - get_stock_recommendations의 결과와 통합하여 반환
+    - get_stock_recommendations의 결과와 통합, 종합 점수와 매수 근거(buy_reason) 포함
+    - 상위 테이블이 바뀌었을 때만 다시 계산하며 snapshot에 계산 시각과 run_id를 함께 반환
+    - refresh=true이면 지금 다시 계산
     """
     try:
-        result = service.get_combined_recommendations_with_technical_and_sentiment()
+        result = service.get_combined_recommendations_with_technical_and_sentiment(refresh=refresh)
         return result
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"기술적 지표 및 감정 분석 조회 중 오류 발생: {str(e)}")
@@ -86,9 +108,9 @@ async def generate_complete_analysis():
         sentiment_results = service.fetch_and_store_sentiment_for_recommendations()
         print(f"뉴스 감정 분석 완료: {sentiment_results['message']}")
         
-        # 3. 통합 분석 조회
-        print("3단계: 통합 분석 결과 조회...")
-        combined_results = service.get_combined_recommendations_with_technical_and_sentiment()
+        # 3. 갱신된 지표/감성으로 매수 후보 결정 스냅샷 다시 계산
+        print("3단계: 매수 후보 결정 스냅샷 갱신...")
+        combined_results = service.get_combined_recommendations_with_technical_and_sentiment(refresh=True)
         
         # 4. 결과 통합 및 반환
         return {
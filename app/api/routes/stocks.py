@@ -1,7 +1,9 @@
 from fastapi import APIRouter, HTTPException
-from typing import List
+from typing import List, Optional
 import pandas as pd
-from app.db.supabase import supabase
+from app.db.queries import TableQuery
+from app.db.snapshots import snapshot_store
+from app.services.indicator_engine import HISTORY_TABLE, indicator_engine
 from app.schemas.stock import StockPrediction
 
 router = APIRouter()
@@ -66,17 +68,32 @@ TICKER_TO_KOREAN = {
     "QQQ": "QQQ ETF"
 }
 
+# /predictions 응답에 필요한 stock_analysis_results 컬럼
+PREDICTION_COLUMNS = [
+    "Stock", "Last Actual Price", "Predicted Future Price", "Rise Probability (%)", "Recommendation", "Analysis"
+]
+
+# 종목 상세 조회에 포함하는 컬럼
+ANALYSIS_COLUMNS = [
+    "Stock", "Accuracy (%)", "Rise Probability (%)", "Last Actual Price", "Predicted Future Price",
+    "Recommendation", "Analysis", "created_at"
+]
+TECHNICAL_COLUMNS = [
+    "날짜", "종목", "SMA20", "SMA50", "골든_크로스", "RSI", "MACD", "Signal", "MACD_매수_신호", "추천_여부"
+]
+SENTIMENT_COLUMNS = ["ticker", "average_sentiment_score", "article_count", "calculation_date", "created_at"]
+
 @router.get("/predictions", summary="주식 예측 결과 조회", response_model=List[StockPrediction])
 def read_predictions():
     try:
         # Supabase에서 예측 결과를 가져옴
-        response = supabase.table("stock_analysis_results").select("*").execute()
+        rows = TableQuery("stock_analysis_results", PREDICTION_COLUMNS).cached().fetch()
 
-        if not response.data:
+        if not rows:
             raise HTTPException(status_code=404, detail="예측 결과가 없습니다.")
 
         predictions = []
-        for row in response.data:
+        for row in rows:
             predictions.append(
                 StockPrediction(
                     stock=row.get("stock_name", row.get("Stock", "")),
@@ -107,43 +124,46 @@ def read_stock_info(ticker: str):
         result = {"ticker": ticker, "korean_name": korean_name}
 
         # 1. stock_analysis_results 테이블에서 분석 결과 조회 (컬럼명: Stock)
-        analysis_response = supabase.table("stock_analysis_results").select("*").eq("Stock", korean_name).execute()
-        if analysis_response.data:
-            result["analysis"] = analysis_response.data[0]
+        analysis = TableQuery("stock_analysis_results", ANALYSIS_COLUMNS).where("Stock", "eq", korean_name).cached().fetch_one()
+        if analysis:
+            result["analysis"] = analysis
 
         # 2. predicted_stocks 테이블에서 예측 데이터 조회 (컬럼명: 날짜, {주식명}_Predicted)
-        predicted_response = supabase.table("predicted_stocks").select("*").order("날짜", desc=True).limit(30).execute()
-        if predicted_response.data:
-            # 한글명에 해당하는 컬럼 찾기 (예: 테슬라_Predicted, 테슬라_Actual)
+        # 지원 종목일 때만 해당 종목의 두 컬럼만 조회 (예: 테슬라_Predicted, 테슬라_Actual)
+        if korean_name in TICKER_TO_KOREAN.values():
             predicted_col = f"{korean_name}_Predicted"
             actual_col = f"{korean_name}_Actual"
-
-            predictions = []
-            for row in predicted_response.data:
-                if predicted_col in row and actual_col in row:
-                    predictions.append({
-                        "date": row.get("날짜"),
-                        "predicted": row.get(predicted_col),
-                        "actual": row.get(actual_col)
-                    })
-
+            try:
+                predicted_rows = TableQuery("predicted_stocks", ["날짜", predicted_col, actual_col]) \
+                    .order_by("날짜", desc=True).limit(30).fetch()
+            except Exception:
+                # 해당 종목 컬럼이 없으면 건너뜀
+                predicted_rows = []
+
+            predictions = [
+                {"date": row.get("날짜"), "predicted": row.get(predicted_col), "actual": row.get(actual_col)}
+                for row in predicted_rows
+            ]
             if predictions:
                 result["predictions"] = predictions
 
-        # 3. stock_recommendations 테이블에서 기술적 분석 조회
+        # 3. indicator_history 테이블에서 종목의 최신 기술적 분석 조회
         try:
-            recommendations_response = supabase.table("stock_recommendations").select("*").eq("ticker", ticker).order("timestamp", desc=True).limit(1).execute()
-            if recommendations_response.data:
-                result["technical_analysis"] = recommendations_response.data[0]
+            technical = TableQuery(HISTORY_TABLE, TECHNICAL_COLUMNS) \
+                .latest_per("종목", order_by="날짜").where("종목", "eq", korean_name).cached().fetch_one()
+            if technical:
+                result["technical_analysis"] = technical
         except Exception:
-            # stock_recommendations 테이블이 없거나 오류 발생 시 건너뜀
+            # indicator_history 테이블이 없거나 오류 발생 시 건너뜀
             pass
 
         # 4. ticker_sentiment_analysis 테이블에서 뉴스 감성 분석 조회
         try:
-            sentiment_response = supabase.table("ticker_sentiment_analysis").select("*").eq("ticker", ticker).order("time_published", desc=True).limit(10).execute()
-            if sentiment_response.data:
-                result["sentiment_analysis"] = sentiment_response.data
+            # 게시된 스냅샷 버전만 조회 (게시 중인 버전이나 이전 버전의 행은 제외)
+            sentiment_rows = snapshot_store.query("ticker_sentiment_analysis", SENTIMENT_COLUMNS) \
+                .where("ticker", "eq", ticker.upper()).fetch()
+            if sentiment_rows:
+                result["sentiment_analysis"] = sentiment_rows
         except Exception:
             # ticker_sentiment_analysis 테이블이 없거나 오류 발생 시 건너뜀
             pass
@@ -156,4 +176,26 @@ def read_stock_info(ticker: str):
     except HTTPException as he:
         raise he
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"주식 정보 조회 중 오류 발생: {str(e)}")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=f"주식 정보 조회 중 오류 발생: {str(e)}")
+
+
+@router.get("/{ticker}/technical/history", summary="종목의 날짜별 기술적 지표 조회")
+def read_technical_history(ticker: str, start_date: Optional[str] = None, end_date: Optional[str] = None):
+    """
+    indicator_history에 저장된 날짜별 SMA/RSI/MACD를 반환합니다 (다시 계산하지 않음).
+    날짜는 YYYY-MM-DD 형식이며 지정하지 않으면 저장된 전체 기간을 조회합니다.
+    """
+    korean_name = ticker
+    for key, value in TICKER_TO_KOREAN.items():
+        if key.upper() == ticker.upper():
+            korean_name = value
+            break
+    try:
+        history = indicator_engine.read_history([korean_name], start_date=start_date, end_date=end_date)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"기술적 지표 이력 조회 중 오류 발생: {str(e)}")
+    if history.empty:
+        raise HTTPException(status_code=404, detail=f"{ticker} 기술적 지표 이력이 없습니다.")
+    history["날짜"] = history["날짜"].dt.strftime("%Y-%m-%d")
+    history = history.astype(object).where(history.notna(), None)
+    return {"ticker": ticker, "korean_name": korean_name, "count": len(history), "history": history.to_dict("records")}
@@ -19,6 +19,10 @@ class Settings(BaseSettings):
     
     SUPABASE_URL: str = os.getenv("SUPABASE_URL", "")
     SUPABASE_KEY: str = os.getenv("SUPABASE_KEY", "")
+
+    # 저장소 백엔드: supabase(기본값), sqlite, duckdb (내장 백엔드는 오프라인 실행/부하 테스트용)
+    DB_BACKEND: str = os.getenv("DB_BACKEND", "supabase")
+    LOCAL_DB_PATH: str = os.getenv("LOCAL_DB_PATH", "stockmaru_local.db")
     
     # 한국투자증권 API 설정
     KIS_APPKEY: str = os.getenv("KIS_APPKEY", "")
@@ -56,6 +60,11 @@ class Settings(BaseSettings):
     ALPHA_VANTAGE_API_KEY: str = os.getenv("ALPHA_VANTAGE_API_KEY", "")
     FRED_API_KEY: str = os.getenv("FRED_API_KEY", "")
 
+    # 외부 데이터 제공자 주소 (오프라인 벤치마크 시 app.utils.replay_server 주소로 지정)
+    FRED_BASE_URL: str = os.getenv("FRED_BASE_URL", "https://api.stlouisfed.org")
+    YAHOO_CHART_BASE_URL: str = os.getenv("YAHOO_CHART_BASE_URL", "https://query1.finance.yahoo.com")
+    ALPHA_VANTAGE_BASE_URL: str = os.getenv("ALPHA_VANTAGE_BASE_URL", "https://www.alphavantage.co")
+
     class Config:
         env_file = ".env"
         env_file_encoding = "utf-8"
@@ -0,0 +1,251 @@
+"""
+로컬 추가 전용(write-ahead) 쓰기 저널
+
+일괄 쓰기 작업을 실행하기 전에 계획한 배치 전체를 로컬 파일에 기록하고,
+배치를 DB에 반영할 때마다 완료 기록을 덧붙입니다. 프로세스가 중간에 종료되면
+다음 실행에서 recover()가 완료 기록이 없는 배치부터 이어서 반영하므로
+복구 비용은 끝나지 않은 부분만큼입니다.
+
+작업 하나는 저널 디렉터리의 JSONL 파일 하나입니다.
+    {"event": "plan", "job": ..., "id": ..., "operations": [...]}   첫 줄: 계획한 배치 목록
+    {"event": "commit", "batch": 0}                                 배치 반영 완료
+    {"event": "failure", "batch": 1, "error": ...}                  배치 반영 실패
+    ...
+모든 배치가 반영되면 파일을 삭제합니다. 반영 실패가 MAX_REPLAY_FAILURES번 쌓인 작업은
+.quarantine 파일로 옮겨 더 이상 복구하지 않으므로 반영할 수 없는 배치 하나가 이후 실행을 계속 막지 않습니다.
+
+배치 연산:
+    {"op": "upsert", "table": ..., "rows": [...], "on_conflict": "날짜"}
+    {"op": "insert", "table": ..., "rows": [...]}
+    {"op": "delete_all", "table": ..., "key": "id"}    전체 삭제 후 다시 쓰는 작업용
+
+완료 기록은 배치 반영 직후에 남기므로 반영과 기록 사이에 종료되면 그 배치는 한 번 더 반영됩니다.
+upsert는 다시 반영해도 결과가 같고, insert 배치만 중복될 수 있습니다.
+
+사용 예:
+    entry = write_journal.plan("economic_ingest", operations)
+    write_journal.run(entry)
+    write_journal.recover("economic_ingest")   # 시작 시 끝나지 않은 작업 이어서 반영
+"""
+import json
+import os
+import threading
+import uuid
+from datetime import datetime
+
+from app.db.read_cache import read_cache
+
+DEFAULT_JOURNAL_DIR = os.getenv("WRITE_JOURNAL_DIR", ".write_journal")
+
+# 이 횟수만큼 반영에 실패한 작업은 격리(.quarantine)하고 복구 대상에서 제외
+MAX_REPLAY_FAILURES = int(os.getenv("WRITE_JOURNAL_MAX_FAILURES", "3"))
+
+
+def apply_operation(client, operation):
+    """배치 연산 하나를 DB에 반영하고 반영한 행 수를 반환합니다."""
+    table = client.table(operation["table"])
+    kind = operation["op"]
+    rows = operation.get("rows") or []
+    if kind == "upsert":
+        on_conflict = operation.get("on_conflict")
+        query = table.upsert(rows, on_conflict=on_conflict) if on_conflict else table.upsert(rows)
+    elif kind == "insert":
+        query = table.insert(rows)
+    elif kind == "delete_all":
+        # PostgREST는 조건 없는 삭제를 허용하지 않으므로 항상 참인 조건 사용
+        query = table.delete().neq(operation.get("key", "id"), operation.get("value", 0))
+    else:
+        raise ValueError(f"지원하지 않는 저널 연산: {kind}")
+    query.execute()
+    # 같은 프로세스의 조회 캐시가 기록 전 결과를 반환하지 않도록 무효화
+    read_cache.invalidate(operation["table"])
+    return len(rows)
+
+
+class JournalEntry:
+    """저널에 기록된 쓰기 작업 하나"""
+
+    def __init__(self, path, job, entry_id, operations, committed=None, created_at=None, failures=0):
+        self.path = path
+        self.job = job
+        self.id = entry_id
+        self.operations = operations
+        self.committed = set(committed or ())
+        self.created_at = created_at
+        self.failures = failures
+
+    @property
+    def pending_batches(self):
+        return [i for i in range(len(self.operations)) if i not in self.committed]
+
+    @property
+    def finished(self):
+        return not self.pending_batches
+
+
+class WriteJournal:
+    """작업별 JSONL 파일로 계획/완료 배치를 기록하는 쓰기 저널"""
+
+    def __init__(self, directory=DEFAULT_JOURNAL_DIR, client=None, max_failures=MAX_REPLAY_FAILURES):
+        """
+        Args:
+            directory (str): 저널 파일 디렉터리
+            client (optional): 배치를 반영할 DB 클라이언트 (기본값: app.db.supabase.supabase)
+            max_failures (int): 이 횟수만큼 반영에 실패한 작업은 격리
+        """
+        self.directory = directory
+        self._client = client
+        self.max_failures = max_failures
+        self._lock = threading.Lock()
+
+    @property
+    def client(self):
+        if self._client is None:
+            from app.db.supabase import supabase
+            self._client = supabase
+        return self._client
+
+    def _append(self, path, record):
+        """한 줄을 덧붙이고 디스크에 반영될 때까지 기다립니다."""
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    def plan(self, job, operations):
+        """
+        배치 연산 목록을 저널에 기록합니다 (DB에는 아직 반영하지 않음).
+
+        Args:
+            job (str): 작업 이름 (recover에서 같은 이름의 작업을 찾는 데 사용)
+            operations (list): 배치 연산 목록
+
+        Returns:
+            JournalEntry
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        entry_id = f"{datetime.now().strftime('%Y%m%d%H%M%S')}-{uuid.uuid4().hex[:8]}"
+        safe_job = "".join(ch if ch.isalnum() or ch in "-_" else "_" for ch in job)
+        path = os.path.join(self.directory, f"{safe_job}-{entry_id}.jsonl")
+        created_at = datetime.now().isoformat(timespec="seconds")
+        self._append(path, {"event": "plan", "job": job, "id": entry_id, "created_at": created_at,
+                            "operations": operations})
+        return JournalEntry(path, job, entry_id, operations, created_at=created_at)
+
+    def run(self, entry, client=None):
+        """
+        완료 기록이 없는 배치를 순서대로 반영하고 배치마다 완료를 기록합니다.
+        모든 배치를 반영하면 저널 파일을 삭제합니다.
+
+        Returns:
+            int: 이번에 반영한 행 수
+        """
+        client = client or self.client
+        written = 0
+        total = len(entry.operations)
+        for i in entry.pending_batches:
+            try:
+                written += apply_operation(client, entry.operations[i])
+            except Exception as e:
+                entry.failures += 1
+                self._append(entry.path, {"event": "failure", "batch": i, "error": str(e)})
+                raise
+            self._append(entry.path, {"event": "commit", "batch": i})
+            entry.committed.add(i)
+            if total > 1:
+                print(f"  [{entry.job}] 배치 {i + 1}/{total} 반영")
+        self._remove(entry)
+        return written
+
+    def _remove(self, entry):
+        try:
+            os.remove(entry.path)
+        except FileNotFoundError:
+            pass
+
+    def _load(self, path):
+        """저널 파일을 읽습니다. 중간에 끊긴 마지막 줄은 무시합니다."""
+        header = None
+        committed = set()
+        failures = 0
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if record.get("event") == "plan":
+                    header = record
+                elif record.get("event") == "commit":
+                    committed.add(record["batch"])
+                elif record.get("event") == "failure":
+                    failures += 1
+        if header is None:
+            return None
+        return JournalEntry(path, header["job"], header["id"], header["operations"],
+                            committed=committed, created_at=header.get("created_at"), failures=failures)
+
+    def _quarantine(self, entry):
+        """반영에 계속 실패하는 작업을 복구 대상에서 제외합니다 (파일은 확인용으로 보존)."""
+        target = entry.path[:-len(".jsonl")] + ".quarantine"
+        os.replace(entry.path, target)
+        print(f"저널 격리: {entry.job} ({entry.created_at}) 반영 실패 {entry.failures}회 → {target}")
+
+    def pending(self, job=None):
+        """끝나지 않은 작업 목록 (계획 순서). job을 지정하면 해당 이름의 작업만."""
+        if not os.path.isdir(self.directory):
+            return []
+        entries = []
+        for name in sorted(os.listdir(self.directory)):
+            if not name.endswith(".jsonl"):
+                continue
+            entry = self._load(os.path.join(self.directory, name))
+            # 다른 작업의 파일은 그 작업을 실행 중인 프로세스가 쓰고 있을 수 있으므로 건드리지 않음
+            if entry is None or (job is not None and entry.job != job):
+                continue
+            if entry.finished:
+                self._remove(entry)
+                continue
+            if entry.failures >= self.max_failures:
+                self._quarantine(entry)
+                continue
+            entries.append(entry)
+        return entries
+
+    def recover(self, job=None, client=None):
+        """
+        끝나지 않은 작업을 마지막 완료 배치 다음부터 이어서 반영합니다.
+
+        Returns:
+            int: 복구하며 반영한 행 수
+        """
+        with self._lock:
+            written = 0
+            for entry in self.pending(job):
+                remaining = len(entry.pending_batches)
+                print(f"저널 복구: {entry.job} ({entry.created_at}) 남은 배치 {remaining}/{len(entry.operations)}개 반영")
+                written += self._replay(entry, client)
+            return written
+
+    def _replay(self, entry, client):
+        """복구 중 실패는 기록만 하고 넘어갑니다 (실패가 쌓이면 다음 pending()에서 격리)."""
+        try:
+            return self.run(entry, client=client)
+        except Exception as e:
+            print(f"저널 복구 실패: {entry.job} ({entry.created_at}) {entry.failures}/{self.max_failures}회: {str(e)}")
+            return 0
+
+    def execute(self, job, operations, client=None):
+        """같은 이름의 끝나지 않은 작업을 먼저 복구한 뒤 새 작업을 계획하고 반영합니다."""
+        with self._lock:
+            for entry in self.pending(job):
+                print(f"저널 복구: {entry.job} ({entry.created_at}) 남은 배치 {len(entry.pending_batches)}개 반영")
+                self._replay(entry, client)
+            if not operations:
+                return 0
+            entry = self.plan(job, operations)
+            return self.run(entry, client=client)
+
+
+# 앱 전체에서 공유하는 쓰기 저널
+write_journal = WriteJournal()
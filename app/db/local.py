@@ -0,0 +1,567 @@
+"""
+Supabase 테이블 API와 같은 체인 방식으로 동작하는 내장 SQL(SQLite/DuckDB) 클라이언트
+
+    client = LocalClient("stockmaru_local.db")
+    client.table("stock_recommendations").select("*").eq("종목", "애플").order("날짜", desc=True).limit(1).execute()
+
+오프라인 실행과 부하 테스트를 위해 HTTP 왕복 없이 프로세스 안에서 같은 쿼리를 실행합니다.
+테이블과 컬럼은 처음 기록할 때 만들어지며, 주요 테이블의 기본 키와 불리언/날짜 컬럼은 TABLE_SCHEMAS를 따릅니다.
+"""
+import json
+import math
+import sqlite3
+import threading
+from datetime import date, datetime
+
+import numpy as np
+
+# 주요 테이블 스키마 (기본 키, 자동 증가 id, 타입을 지정해야 하는 컬럼, 기본값)
+# 나머지 숫자 컬럼은 처음 기록될 때 값의 타입에 맞춰 추가됩니다.
+TABLE_SCHEMAS = {
+    "economic_and_stock_data": {
+        "primary_key": ("날짜",),
+        "columns": {"날짜": "DATE"},
+    },
+    "economic_series_last_value": {
+        "primary_key": ("column_name",),
+        "columns": {"column_name": "TEXT", "last_valid_date": "DATE", "last_value": "REAL",
+                    "last_observed_date": "DATE", "updated_at": "TIMESTAMP"},
+    },
+    "indicator_history": {
+        "primary_key": ("날짜", "종목"),
+        "columns": {"날짜": "DATE", "종목": "TEXT", "SMA20": "REAL", "SMA50": "REAL", "골든_크로스": "BOOLEAN",
+                    "RSI": "REAL", "MACD": "REAL", "Signal": "REAL", "MACD_매수_신호": "BOOLEAN",
+                    "추천_여부": "BOOLEAN"},
+    },
+    "indicator_state": {
+        "primary_key": ("종목",),
+        "columns": {"종목": "TEXT", "날짜": "DATE", "state": "TEXT", "updated_at": "TIMESTAMP"},
+    },
+    "predicted_stocks": {
+        "primary_key": ("id",),
+        "identity": "id",
+        "columns": {"날짜": "DATE"},
+    },
+    "stock_analysis_results": {
+        "primary_key": ("id",),
+        "identity": "id",
+        "columns": {"Stock": "TEXT", "Predicted Rise": "BOOLEAN", "Recommendation": "TEXT",
+                    "Analysis": "TEXT", "created_at": "TIMESTAMP"},
+        "defaults": {"created_at": "now"},
+    },
+    "buy_decisions": {
+        "primary_key": ("run_id", "rank"),
+        "columns": {"run_id": "TEXT", "rank": "INTEGER", "ticker": "TEXT", "stock_name": "TEXT",
+                    "composite_score": "REAL", "buy_reason": "TEXT", "decision": "TEXT", "generated_at": "TIMESTAMP"},
+    },
+    "snapshot_pointers": {
+        "primary_key": ("table_name",),
+        "columns": {"table_name": "TEXT", "run_id": "TEXT", "previous_run_id": "TEXT", "row_count": "INTEGER",
+                    "published_at": "TIMESTAMP"},
+    },
+    "stock_daily_ohlcv": {
+        "primary_key": ("날짜", "종목"),
+        "columns": {"날짜": "DATE", "종목": "TEXT", "Open": "REAL", "High": "REAL", "Low": "REAL", "Close": "REAL",
+                    "Volume": "INTEGER"},
+    },
+    "stock_daily_volume": {
+        "primary_key": ("날짜",),
+        "columns": {"날짜": "DATE"},
+    },
+    "stock_recommendations": {
+        "primary_key": ("run_id", "날짜", "종목"),
+        "columns": {"run_id": "TEXT", "날짜": "DATE", "종목": "TEXT", "골든_크로스": "BOOLEAN",
+                    "MACD_매수_신호": "BOOLEAN", "추천_여부": "BOOLEAN"},
+    },
+    "ticker_sentiment_analysis": {
+        "primary_key": ("id",),
+        "identity": "id",
+        "columns": {"run_id": "TEXT", "ticker": "TEXT", "average_sentiment_score": "REAL", "article_count": "INTEGER",
+                    "calculation_date": "TIMESTAMP", "created_at": "TIMESTAMP"},
+        "defaults": {"created_at": "now"},
+    },
+    "access_tokens": {
+        "primary_key": ("id",),
+        "identity": "id",
+        "columns": {"access_token": "TEXT", "created_at": "TIMESTAMP", "expiration_time": "TIMESTAMP",
+                    "is_active": "BOOLEAN"},
+        "defaults": {"created_at": "now", "is_active": True},
+    },
+}
+
+
+class LocalQueryError(Exception):
+    """내장 SQL 클라이언트 쿼리 오류"""
+
+
+class LocalResponse:
+    """supabase 응답 객체와 같은 data/count 속성을 제공하는 응답"""
+
+    def __init__(self, data, count=None):
+        self.data = data
+        self.count = count
+
+    def __repr__(self):
+        return f"LocalResponse(rows={len(self.data)}, count={self.count})"
+
+
+def quote_identifier(name):
+    return '"' + str(name).replace('"', '""') + '"'
+
+
+def to_db_value(value):
+    """SQL 파라미터로 바인딩할 수 있는 값으로 변환합니다 (numpy 스칼라, NaN/inf, 날짜, JSON)."""
+    if value is None:
+        return None
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float):
+        return value if math.isfinite(value) else None
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, ensure_ascii=False)
+    return value
+
+
+def _infer_type(value):
+    # 값이 없으면 숫자 컬럼으로 간주 (대부분의 테이블이 숫자 지표 컬럼)
+    if value is None:
+        return "REAL"
+    if isinstance(value, (bool, np.bool_)):
+        return "BOOLEAN"
+    if isinstance(value, (int, float, np.integer, np.floating)):
+        return "REAL"
+    return "TEXT"
+
+
+class _Dialect:
+    """SQLite/DuckDB 사이의 차이 (연결, 타입 이름, 자동 증가 id)"""
+
+    def __init__(self, engine, path):
+        self.engine = engine
+        if engine == "sqlite":
+            self.connection = sqlite3.connect(path, check_same_thread=False)
+            self.connection.execute("PRAGMA journal_mode=WAL")
+            self.connection.execute("PRAGMA synchronous=NORMAL")
+        elif engine == "duckdb":
+            try:
+                import duckdb
+            except ImportError as e:
+                raise ImportError("DB_BACKEND=duckdb를 사용하려면 duckdb 패키지를 설치해야 합니다: pip install duckdb") from e
+            self.connection = duckdb.connect(path)
+        else:
+            raise ValueError(f"지원하지 않는 내장 DB 엔진: {engine}")
+
+    def sql_type(self, declared):
+        if declared in ("DATE", "TIMESTAMP", "TEXT"):
+            return "TEXT"
+        if declared == "REAL":
+            return "REAL" if self.engine == "sqlite" else "DOUBLE"
+        if declared == "INTEGER":
+            return "INTEGER" if self.engine == "sqlite" else "BIGINT"
+        return "BOOLEAN"
+
+    def identity_column(self, table, column):
+        """자동 증가 id 컬럼 정의와 사전 준비 SQL을 반환합니다."""
+        if self.engine == "sqlite":
+            return f"{quote_identifier(column)} INTEGER PRIMARY KEY AUTOINCREMENT", []
+        sequence = quote_identifier(f"{table}_{column}_seq")
+        return (f"{quote_identifier(column)} BIGINT PRIMARY KEY DEFAULT nextval('{sequence}')",
+                [f"CREATE SEQUENCE IF NOT EXISTS {sequence}"])
+
+    def table_columns(self, table):
+        """테이블의 (컬럼명 → 선언 타입). 테이블이 없으면 None."""
+        if self.engine == "sqlite":
+            rows = self.connection.execute(f"PRAGMA table_info({quote_identifier(table)})").fetchall()
+            return {row[1]: (row[2] or "").upper() for row in rows} or None
+        rows = self.connection.execute(
+            "SELECT column_name, data_type FROM information_schema.columns WHERE table_name = ? ORDER BY ordinal_position",
+            [table],
+        ).fetchall()
+        return {row[0]: row[1].upper() for row in rows} or None
+
+
+class LocalClient:
+    """supabase.Client 대신 사용할 수 있는 내장 SQL 클라이언트"""
+
+    def __init__(self, path="stockmaru_local.db", engine="sqlite"):
+        self.path = path
+        self.engine = engine
+        self._dialect = _Dialect(engine, path)
+        self._lock = threading.RLock()
+        self._columns_cache = {}
+
+    def table(self, name):
+        return LocalQuery(self, name)
+
+    # supabase-py 호환 별칭
+    from_ = table
+
+    # ---- 스키마 ----
+
+    def columns(self, table):
+        """(컬럼명 → 선언 타입) 딕셔너리. 테이블이 없으면 None."""
+        if table not in self._columns_cache:
+            self._columns_cache[table] = self._dialect.table_columns(table)
+        return self._columns_cache[table]
+
+    def ensure_columns(self, table, rows):
+        """기록할 행의 컬럼이 모두 존재하도록 테이블을 만들거나 컬럼을 추가합니다."""
+        schema = TABLE_SCHEMAS.get(table, {})
+        declared = schema.get("columns", {})
+
+        samples = {}
+        for row in rows:
+            for col, value in row.items():
+                if col not in samples or samples[col] is None:
+                    samples[col] = value
+
+        existing = self.columns(table)
+        if existing is None:
+            self._create_table(table, schema, samples)
+            existing = self.columns(table)
+
+        for col, value in samples.items():
+            if col in existing:
+                continue
+            col_type = self._dialect.sql_type(declared.get(col) or _infer_type(value))
+            self._execute(f"ALTER TABLE {quote_identifier(table)} ADD COLUMN {quote_identifier(col)} {col_type}")
+            self._columns_cache.pop(table, None)
+            existing = self.columns(table)
+
+    def _create_table(self, table, schema, samples):
+        declared = schema.get("columns", {})
+        identity = schema.get("identity")
+        primary_key = schema.get("primary_key", ())
+
+        definitions = []
+        prelude = []
+        names = list(dict.fromkeys([*primary_key, *declared, *samples]))
+        for col in names:
+            if col == identity:
+                definition, statements = self._dialect.identity_column(table, col)
+                definitions.append(definition)
+                prelude.extend(statements)
+                continue
+            col_type = self._dialect.sql_type(declared.get(col) or _infer_type(samples.get(col)))
+            definitions.append(f"{quote_identifier(col)} {col_type}")
+        if primary_key and identity not in primary_key:
+            definitions.append(f"PRIMARY KEY ({', '.join(quote_identifier(c) for c in primary_key)})")
+
+        for statement in prelude:
+            self._execute(statement)
+        self._execute(f"CREATE TABLE IF NOT EXISTS {quote_identifier(table)} ({', '.join(definitions)})")
+        self._columns_cache.pop(table, None)
+
+    # ---- 실행 ----
+
+    def _execute(self, sql, params=()):
+        with self._lock:
+            cursor = self._dialect.connection.cursor()
+            cursor.execute(sql, list(params))
+            return cursor
+
+    def _executemany(self, sql, param_rows):
+        with self._lock:
+            cursor = self._dialect.connection.cursor()
+            cursor.executemany(sql, param_rows)
+            return cursor
+
+    def commit(self):
+        with self._lock:
+            self._dialect.connection.commit()
+
+    def fetch(self, sql, params=()):
+        """SQL을 실행하고 (컬럼명 목록, 행 튜플 목록)을 반환합니다."""
+        with self._lock:
+            cursor = self._execute(sql, params)
+            names = [d[0] for d in cursor.description] if cursor.description else []
+            return names, cursor.fetchall()
+
+    def rows_to_dicts(self, table, names, rows):
+        """조회 결과를 딕셔너리 목록으로 변환합니다 (SQLite 불리언 0/1 → bool)."""
+        columns = self.columns(table) or {}
+        bool_idx = [i for i, name in enumerate(names) if columns.get(name) == "BOOLEAN"]
+        result = []
+        for row in rows:
+            record = dict(zip(names, row))
+            for i in bool_idx:
+                value = row[i]
+                if value is not None:
+                    record[names[i]] = bool(value)
+            result.append(record)
+        return result
+
+
+class LocalQuery:
+    """postgrest 요청 빌더와 같은 메서드 체인을 SQL로 변환하는 쿼리 빌더"""
+
+    _OPERATORS = {"eq": "=", "neq": "<>", "gt": ">", "gte": ">=", "lt": "<", "lte": "<=",
+                  "like": "LIKE", "ilike": "LIKE"}
+
+    def __init__(self, client, table):
+        self.client = client
+        self.table_name = table
+        self._op = "select"
+        self._columns = None
+        self._count = None
+        self._filters = []
+        self._order = []
+        self._limit = None
+        self._offset = None
+        self._payload = None
+        self._on_conflict = None
+
+    # ---- 조회 ----
+
+    def select(self, *columns, count=None):
+        names = []
+        for column in columns:
+            for part in str(column).split(","):
+                part = part.strip().strip('"')
+                if part and part != "*":
+                    names.append(part)
+        self._columns = names or None
+        self._count = count
+        return self
+
+    def order(self, column, desc=False, nullsfirst=None):
+        self._order.append((column.strip('"'), desc, nullsfirst))
+        return self
+
+    def limit(self, size):
+        self._limit = int(size)
+        return self
+
+    def offset(self, size):
+        self._offset = int(size)
+        return self
+
+    def range(self, start, end):
+        self._offset = int(start)
+        self._limit = int(end) - int(start) + 1
+        return self
+
+    # ---- 필터 ----
+
+    def _filter(self, column, op, value):
+        self._filters.append((column.strip('"'), op, value))
+        return self
+
+    def eq(self, column, value):
+        return self._filter(column, "eq", value)
+
+    def neq(self, column, value):
+        return self._filter(column, "neq", value)
+
+    def gt(self, column, value):
+        return self._filter(column, "gt", value)
+
+    def gte(self, column, value):
+        return self._filter(column, "gte", value)
+
+    def lt(self, column, value):
+        return self._filter(column, "lt", value)
+
+    def lte(self, column, value):
+        return self._filter(column, "lte", value)
+
+    def like(self, column, pattern):
+        return self._filter(column, "like", pattern)
+
+    def ilike(self, column, pattern):
+        return self._filter(column, "ilike", pattern)
+
+    def in_(self, column, values):
+        return self._filter(column, "in", list(values))
+
+    def is_(self, column, value):
+        return self._filter(column, "is", value)
+
+    # ---- 쓰기 ----
+
+    def insert(self, json, **kwargs):
+        self._op = "insert"
+        self._payload = json
+        return self
+
+    def upsert(self, json, on_conflict=None, **kwargs):
+        self._op = "upsert"
+        self._payload = json
+        self._on_conflict = on_conflict
+        return self
+
+    def update(self, json, **kwargs):
+        self._op = "update"
+        self._payload = json
+        return self
+
+    def delete(self, **kwargs):
+        self._op = "delete"
+        return self
+
+    # ---- SQL 생성 ----
+
+    def _column_sql(self, column, existing):
+        # 아직 기록된 적 없는 컬럼은 NULL로 취급 (Supabase 스키마에는 있지만 로컬 테이블에 없는 경우)
+        return quote_identifier(column) if column in existing else "NULL"
+
+    def _where_sql(self, existing):
+        clauses = []
+        params = []
+        for column, op, value in self._filters:
+            column_sql = self._column_sql(column, existing)
+            if op == "in":
+                if not value:
+                    clauses.append("1 = 0")
+                    continue
+                clauses.append(f"{column_sql} IN ({', '.join('?' for _ in value)})")
+                params.extend(to_db_value(v) for v in value)
+            elif op == "is":
+                keyword = {"null": "NULL", "true": "TRUE", "false": "FALSE"}.get(str(value).lower(), "NULL")
+                clauses.append(f"{column_sql} IS {keyword}")
+            elif op == "ilike":
+                clauses.append(f"LOWER({column_sql}) LIKE LOWER(?)")
+                params.append(str(value).replace("*", "%"))
+            else:
+                value = to_db_value(value)
+                if op in ("like",):
+                    value = str(value).replace("*", "%")
+                clauses.append(f"{column_sql} {self._OPERATORS[op]} ?")
+                params.append(value)
+        return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+    def _order_sql(self, existing):
+        if not self._order:
+            return ""
+        parts = []
+        for column, desc, nullsfirst in self._order:
+            # PostgreSQL 기본값: 오름차순은 NULLS LAST, 내림차순은 NULLS FIRST
+            nulls_first = desc if nullsfirst is None else nullsfirst
+            parts.append(f"{self._column_sql(column, existing)} {'DESC' if desc else 'ASC'} "
+                         f"NULLS {'FIRST' if nulls_first else 'LAST'}")
+        return " ORDER BY " + ", ".join(parts)
+
+    # ---- 실행 ----
+
+    def execute(self, *args, **kwargs):
+        try:
+            if self._op == "select":
+                return self._execute_select()
+            if self._op in ("insert", "upsert"):
+                return self._execute_write()
+            if self._op == "update":
+                return self._execute_update()
+            return self._execute_delete()
+        except LocalQueryError:
+            raise
+        except Exception as e:
+            raise LocalQueryError(f"{self.table_name} {self._op} 실패: {e}") from e
+
+    def _execute_select(self):
+        client = self.client
+        existing = client.columns(self.table_name)
+        if existing is None:
+            return LocalResponse([], 0 if self._count else None)
+
+        names = self._columns or list(existing)
+        select_sql = ", ".join(f"{self._column_sql(c, existing)} AS {quote_identifier(c)}" for c in names)
+        where_sql, params = self._where_sql(existing)
+        sql = f"SELECT {select_sql} FROM {quote_identifier(self.table_name)}{where_sql}{self._order_sql(existing)}"
+        if self._limit is not None:
+            sql += f" LIMIT {self._limit}"
+        if self._offset:
+            # SQLite는 LIMIT 없이 OFFSET만 쓸 수 없음
+            if self._limit is None and client.engine == "sqlite":
+                sql += " LIMIT -1"
+            sql += f" OFFSET {self._offset}"
+
+        count = None
+        if self._count:
+            _, count_rows = client.fetch(f"SELECT COUNT(*) FROM {quote_identifier(self.table_name)}{where_sql}", params)
+            count = count_rows[0][0]
+
+        result_names, rows = client.fetch(sql, params)
+        return LocalResponse(client.rows_to_dicts(self.table_name, result_names, rows), count)
+
+    def _prepare_rows(self):
+        rows = self._payload if isinstance(self._payload, list) else [self._payload]
+        defaults = TABLE_SCHEMAS.get(self.table_name, {}).get("defaults", {})
+        prepared = []
+        now = datetime.now().isoformat()
+        for row in rows:
+            row = dict(row)
+            for col, default in defaults.items():
+                if row.get(col) is None:
+                    row[col] = now if default == "now" else default
+            prepared.append(row)
+        return prepared
+
+    def _conflict_columns(self):
+        if self._on_conflict:
+            return [c.strip().strip('"') for c in self._on_conflict.split(",")]
+        return list(TABLE_SCHEMAS.get(self.table_name, {}).get("primary_key", ()))
+
+    def _execute_write(self):
+        client = self.client
+        rows = self._prepare_rows()
+        if not rows:
+            return LocalResponse([])
+
+        with client._lock:
+            client.ensure_columns(self.table_name, rows)
+            conflict = self._conflict_columns() if self._op == "upsert" else []
+            if conflict and self._on_conflict:
+                # 기본 키가 아닌 충돌 컬럼은 고유 인덱스가 있어야 ON CONFLICT를 사용할 수 있음
+                index_name = quote_identifier(f"uq_{self.table_name}_{'_'.join(conflict)}")
+                client._execute(f"CREATE UNIQUE INDEX IF NOT EXISTS {index_name} ON {quote_identifier(self.table_name)} "
+                                f"({', '.join(quote_identifier(c) for c in conflict)})")
+
+            # 컬럼 구성이 같은 행끼리 묶어 executemany로 기록
+            groups = {}
+            for row in rows:
+                groups.setdefault(tuple(row.keys()), []).append(row)
+
+            for columns, group in groups.items():
+                column_sql = ", ".join(quote_identifier(c) for c in columns)
+                placeholders = ", ".join("?" for _ in columns)
+                sql = f"INSERT INTO {quote_identifier(self.table_name)} ({column_sql}) VALUES ({placeholders})"
+                if conflict and all(c in columns for c in conflict):
+                    updates = [c for c in columns if c not in conflict]
+                    if updates:
+                        sql += (f" ON CONFLICT ({', '.join(quote_identifier(c) for c in conflict)}) DO UPDATE SET "
+                                + ", ".join(f"{quote_identifier(c)} = excluded.{quote_identifier(c)}" for c in updates))
+                    else:
+                        sql += f" ON CONFLICT ({', '.join(quote_identifier(c) for c in conflict)}) DO NOTHING"
+                client._executemany(sql, [[to_db_value(row[c]) for c in columns] for row in group])
+            client.commit()
+        return LocalResponse(rows)
+
+    def _execute_update(self):
+        client = self.client
+        payload = dict(self._payload)
+        if not payload:
+            return LocalResponse([])
+        with client._lock:
+            client.ensure_columns(self.table_name, [payload])
+            existing = client.columns(self.table_name)
+            where_sql, params = self._where_sql(existing)
+            set_sql = ", ".join(f"{quote_identifier(c)} = ?" for c in payload)
+            names, rows = client.fetch(
+                f"UPDATE {quote_identifier(self.table_name)} SET {set_sql}{where_sql} RETURNING *",
+                [to_db_value(v) for v in payload.values()] + params,
+            )
+            client.commit()
+        return LocalResponse(client.rows_to_dicts(self.table_name, names, rows))
+
+    def _execute_delete(self):
+        client = self.client
+        with client._lock:
+            existing = client.columns(self.table_name)
+            if existing is None:
+                return LocalResponse([])
+            where_sql, params = self._where_sql(existing)
+            names, rows = client.fetch(f"DELETE FROM {quote_identifier(self.table_name)}{where_sql} RETURNING *", params)
+            client.commit()
+        return LocalResponse(client.rows_to_dicts(self.table_name, names, rows))
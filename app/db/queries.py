@@ -0,0 +1,235 @@
+"""
+컬럼 투영 + 서버 측 필터 조회 빌더
+
+필요한 컬럼, 필터, 정렬, 개수 제한, "종목별 최신 행"을 선언하고 DB에서 처리하게 해
+select("*") 후 pandas에서 거르는 것보다 응답 크기와 파싱 시간을 줄입니다.
+
+    rows = TableQuery("stock_recommendations", ["종목", "RSI", "골든_크로스"]) \
+        .latest_per("종목", order_by="날짜") \
+        .where("종목", "in_", ["애플", "테슬라"]) \
+        .fetch()
+
+cached()를 붙이면 같은 조건의 조회 결과를 테이블별 TTL 동안 재사용합니다 (app/db/read_cache.py).
+"""
+import pandas as pd
+
+from app.db.local import LocalClient, quote_identifier, to_db_value
+from app.db.read_cache import read_cache
+from app.db.supabase import supabase
+
+# "종목별 최신 행" 조회에 사용할 Supabase 뷰 (DDL: stockmaru_real_main.md)
+# 뷰가 없으면 투영된 컬럼만 최신순으로 읽어 중복을 제거합니다.
+LATEST_VIEWS = {
+    ("stock_recommendations", "종목"): "stock_recommendations_latest",
+    ("indicator_history", "종목"): "indicator_history_latest",
+    ("ticker_sentiment_analysis", "ticker"): "ticker_sentiment_latest",
+}
+
+# Supabase(PostgREST) 기본 최대 조회 행 수 (뷰 없이 테이블 전체를 읽을 때 이 단위로 나눠 조회)
+PAGE_SIZE = 1000
+
+# 뷰가 없는 것으로 확인된 테이블 (매 요청마다 실패한 뷰 조회를 반복하지 않음)
+_missing_views = set()
+
+_SQL_OPERATORS = {"eq": "=", "neq": "<>", "gt": ">", "gte": ">=", "lt": "<", "lte": "<="}
+
+_PY_OPERATORS = {
+    "eq": lambda a, b: a == b,
+    "neq": lambda a, b: a != b,
+    "gt": lambda a, b: a > b,
+    "gte": lambda a, b: a >= b,
+    "lt": lambda a, b: a < b,
+    "lte": lambda a, b: a <= b,
+    "in_": lambda a, b: a in b,
+}
+
+
+def _matches(row, condition):
+    """(컬럼, 연산자, 값) 조건을 행 하나에 적용합니다. NULL은 SQL처럼 항상 불일치."""
+    column, op, value = condition
+    current = row.get(column)
+    if current is None:
+        return False
+    try:
+        return _PY_OPERATORS[op](current, value)
+    except TypeError:
+        return False
+
+
+class TableQuery:
+    """필요한 컬럼과 서버 측 필터/정렬/제한을 선언하는 조회 빌더"""
+
+    def __init__(self, table, columns, client=None):
+        """
+        Args:
+            table (str): 테이블명
+            columns (list): 조회할 컬럼 목록 (필수, "*" 대신 필요한 컬럼만 선언)
+            client (optional): DB 클라이언트 (기본값: app.db.supabase.supabase)
+        """
+        self.table = table
+        self.columns = list(columns)
+        self.client = client or supabase
+        self._filters = []
+        self._order = []
+        self._limit = None
+        self._latest = None
+        self._cache = None
+
+    def where(self, column, op, value):
+        """서버 측 필터를 추가합니다. op: eq/neq/gt/gte/lt/lte/in_"""
+        self._filters.append((column, op, value))
+        return self
+
+    def order_by(self, column, desc=False):
+        self._order.append((column, desc))
+        return self
+
+    def limit(self, size):
+        self._limit = size
+        return self
+
+    def latest_per(self, partition, order_by):
+        """partition 컬럼 값마다 order_by 기준 가장 최근 행 하나만 조회합니다 (예: 종목별 최신 지표)."""
+        self._latest = (partition, order_by)
+        return self
+
+    def cached(self, cache=None):
+        """조회 결과를 조회 캐시(기본값: read_cache)에서 재사용합니다. 테이블에 기록하면 캐시가 비워집니다."""
+        self._cache = cache or read_cache
+        return self
+
+    def cache_key(self):
+        """
+        클라이언트/컬럼/필터/정렬/제한/최신 행 조건으로 만든 캐시 키.
+        같은 테이블이라도 다른 DB 클라이언트(예: Supabase와 내장 DB)의 조회 결과는 섞이지 않습니다.
+        클라이언트 객체 자체를 키에 넣으므로(객체 동일성으로 비교) 캐시 항목이 남아 있는 동안
+        해제된 클라이언트의 id가 새 클라이언트에 재사용되어 결과가 섞이는 일이 없습니다.
+        """
+        filters = tuple((column, op, tuple(value) if isinstance(value, (list, set, tuple)) else value)
+                        for column, op, value in self._filters)
+        return (self.client, tuple(self.columns), filters, tuple(self._order), self._limit, self._latest)
+
+    # ---- 실행 ----
+
+    def fetch(self):
+        """조건에 맞는 행 딕셔너리 목록을 반환합니다."""
+        if self._cache is not None:
+            rows = self._cache.get_or_load(self.table, self.cache_key(), self._fetch)
+            # 호출한 쪽에서 행을 수정해도 캐시된 결과는 바뀌지 않도록 복사본 반환
+            return [dict(row) for row in rows]
+        return self._fetch()
+
+    def _fetch(self):
+        if self._latest is None:
+            return self._fetch_postgrest(self.table, self._order, self._limit)
+        if isinstance(self.client, LocalClient):
+            return self._fetch_latest_sql()
+        return self._fetch_latest_postgrest()
+
+    def fetch_one(self):
+        """첫 번째 행을 반환합니다. 없으면 None."""
+        if self._limit is None:
+            self._limit = 1
+        rows = self.fetch()
+        return rows[0] if rows else None
+
+    def fetch_frame(self):
+        """조회 결과를 선언한 컬럼 순서의 데이터프레임으로 반환합니다."""
+        return pd.DataFrame(self.fetch(), columns=self.columns)
+
+    def _select_columns(self):
+        columns = list(self.columns)
+        if self._latest:
+            columns += [c for c in self._latest if c not in columns]
+        return ",".join(f'"{c}"' for c in columns)
+
+    def _build_postgrest(self, table, order):
+        query = self.client.table(table).select(self._select_columns())
+        for column, op, value in self._filters:
+            query = getattr(query, op)(column, value)
+        for column, desc in order:
+            query = query.order(column, desc=desc)
+        return query
+
+    def _fetch_postgrest(self, table, order, limit):
+        query = self._build_postgrest(table, order)
+        if limit is not None:
+            query = query.limit(limit)
+        return query.execute().data or []
+
+    def _fetch_postgrest_pages(self, table, order, page_size=PAGE_SIZE):
+        """최대 조회 행 수 제한에 잘리지 않도록 page_size 단위로 나눠 전체 행을 읽습니다."""
+        rows = []
+        offset = 0
+        while True:
+            page = self._build_postgrest(table, order).range(offset, offset + page_size - 1).execute().data or []
+            rows.extend(page)
+            if len(page) < page_size:
+                return rows
+            offset += page_size
+
+    def _fetch_latest_postgrest(self):
+        partition, order_column = self._latest
+        view = LATEST_VIEWS.get((self.table, partition))
+        if view and view not in _missing_views:
+            try:
+                return self._fetch_postgrest(view, self._order, self._limit)
+            except Exception as e:
+                print(f"{view} 뷰 조회 실패, 테이블 조회로 대체합니다: {str(e)}")
+                _missing_views.add(view)
+
+        # 뷰가 없으면 필요한 컬럼만 최신순으로 전부 읽어(페이지 단위) 파티션별 첫 행만 남김
+        # (뷰와 같은 의미가 되도록 파티션 컬럼 필터만 서버에서, 나머지 필터는 최신 행을 고른 뒤 적용)
+        # 페이지 경계에서 순서가 바뀌지 않도록 파티션 컬럼을 두 번째 정렬 기준으로 사용
+        partition_filters = [f for f in self._filters if f[0] == partition]
+        other_filters = [f for f in self._filters if f[0] != partition]
+        filters, self._filters = self._filters, partition_filters
+        try:
+            rows = self._fetch_postgrest_pages(self.table, [(order_column, True), (partition, False)])
+        finally:
+            self._filters = filters
+        latest = {}
+        for row in rows:
+            latest.setdefault(row.get(partition), row)
+        result = [row for row in latest.values() if all(_matches(row, f) for f in other_filters)]
+        for column, desc in reversed(self._order):
+            result.sort(key=lambda r: (r.get(column) is None, r.get(column)), reverse=desc)
+        return result[:self._limit] if self._limit is not None else result
+
+    def _fetch_latest_sql(self):
+        """내장 백엔드: 윈도 함수로 파티션별 최신 행을 DB 안에서 고른 뒤 필터를 적용합니다."""
+        client = self.client
+        existing = client.columns(self.table)
+        if existing is None:
+            return []
+        partition, order_column = self._latest
+
+        def col(name):
+            return quote_identifier(name) if name in existing else "NULL"
+
+        params = []
+        clauses = []
+        for column, op, value in self._filters:
+            if op == "in_":
+                values = list(value)
+                if not values:
+                    return []
+                clauses.append(f"{col(column)} IN ({', '.join('?' for _ in values)})")
+                params.extend(to_db_value(v) for v in values)
+            else:
+                clauses.append(f"{col(column)} {_SQL_OPERATORS[op]} ?")
+                params.append(to_db_value(value))
+        filter_sql = "".join(f" AND {clause}" for clause in clauses)
+
+        names = list(dict.fromkeys([*self.columns, partition, order_column]))
+        select_sql = ", ".join(f"{col(c)} AS {quote_identifier(c)}" for c in names)
+        sql = (f"SELECT {select_sql} FROM ("
+               f"SELECT *, ROW_NUMBER() OVER (PARTITION BY {col(partition)} ORDER BY {col(order_column)} DESC) AS _rn "
+               f"FROM {quote_identifier(self.table)}) AS ranked WHERE _rn = 1{filter_sql}")
+        if self._order:
+            sql += " ORDER BY " + ", ".join(f"{col(c)} {'DESC' if d else 'ASC'}" for c, d in self._order)
+        if self._limit is not None:
+            sql += f" LIMIT {int(self._limit)}"
+
+        result_names, rows = client.fetch(sql, params)
+        return client.rows_to_dicts(self.table, result_names, rows)
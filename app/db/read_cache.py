@@ -0,0 +1,172 @@
+"""
+테이블별 TTL 조회 캐시 (프로세스 내 read-through)
+
+한 번의 매수 주기나 대시보드 새로고침에서 같은 조회(stock_analysis_results 추천 목록, 감성 스냅샷,
+종목별 최신 지표)가 여러 메서드에서 반복되므로 조회 결과를 테이블별 TTL 동안 메모리에 보관합니다.
+
+- 캐시 키는 DB 클라이언트, 테이블, 컬럼, 필터, 정렬, 개수 제한이므로 조건이나 클라이언트가 다른 조회는 서로 섞이지 않습니다.
+- 쓰기 저널(app/db/journal.py)로 테이블에 기록하면 그 테이블의 캐시를 바로 비웁니다.
+  다른 프로세스(predict.py 등)의 쓰기는 TTL이 지나면 반영됩니다.
+- 같은 키를 동시에 조회하면 첫 조회만 DB에 요청하고 나머지는 그 결과를 기다립니다.
+- 테이블별 적중/실패 횟수와 적중률을 stats()로 조회합니다.
+
+사용 예:
+    rows = TableQuery("stock_analysis_results", columns).where(...).cached().fetch()
+    read_cache.invalidate("stock_analysis_results")
+    read_cache.stats()
+"""
+import os
+import threading
+import time
+
+# 테이블별 TTL (초). 0이면 캐시하지 않음
+DEFAULT_TTLS = {
+    "stock_analysis_results": 600,      # predict.py가 하루 한 번 갱신
+    "stock_recommendations": 300,
+    "ticker_sentiment_analysis": 300,
+    "indicator_history": 300,
+    "snapshot_pointers": 60,
+}
+
+# 목록에 없는 테이블의 TTL (초)
+DEFAULT_TTL = int(os.getenv("READ_CACHE_TTL_SECONDS", "60"))
+
+
+class _TableStats:
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def to_dict(self, entries, ttl):
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 4) if total else None,
+            "invalidations": self.invalidations,
+            "entries": entries,
+            "ttl_seconds": ttl,
+        }
+
+
+class ReadCache:
+    """테이블별 TTL과 쓰기 무효화를 지원하는 조회 결과 캐시"""
+
+    def __init__(self, ttls=None, default_ttl=DEFAULT_TTL):
+        """
+        Args:
+            ttls (dict, optional): 테이블명 → TTL(초) (기본값: DEFAULT_TTLS)
+            default_ttl (int): 목록에 없는 테이블의 TTL(초)
+        """
+        self.ttls = dict(DEFAULT_TTLS if ttls is None else ttls)
+        self.default_ttl = default_ttl
+        self._entries = {}      # (table, key) → (만료 시각, 값)
+        self._generations = {}  # table → 무효화 횟수 (조회 중 무효화된 결과를 저장하지 않기 위해)
+        self._loading = {}      # (table, key) → 조회 중 잠금
+        self._stats = {}
+        self._listeners = []
+        self._lock = threading.Lock()
+
+    def ttl(self, table):
+        return self.ttls.get(table, self.default_ttl)
+
+    def _table_stats(self, table):
+        if table not in self._stats:
+            self._stats[table] = _TableStats()
+        return self._stats[table]
+
+    def _lookup(self, table, key, now):
+        entry = self._entries.get((table, key))
+        if entry is None:
+            return False, None
+        expires_at, value = entry
+        if expires_at <= now:
+            del self._entries[(table, key)]
+            return False, None
+        return True, value
+
+    def get_or_load(self, table, key, loader):
+        """
+        캐시된 값을 반환하고, 없거나 만료되었으면 loader()로 조회해 저장합니다.
+
+        Args:
+            table (str): 무효화와 TTL 기준 테이블명
+            key: 같은 테이블 안에서 조회를 구분하는 해시 가능한 값
+            loader (callable): 캐시에 없을 때 호출하는 조회 함수
+        """
+        ttl = self.ttl(table)
+        if ttl <= 0:
+            with self._lock:
+                self._table_stats(table).misses += 1
+            return loader()
+
+        with self._lock:
+            found, value = self._lookup(table, key, time.monotonic())
+            if found:
+                self._table_stats(table).hits += 1
+                return value
+            key_lock = self._loading.setdefault((table, key), threading.Lock())
+
+        with key_lock:
+            with self._lock:
+                # 먼저 조회한 스레드가 저장했으면 그 결과 사용
+                found, value = self._lookup(table, key, time.monotonic())
+                if found:
+                    self._table_stats(table).hits += 1
+                    return value
+                self._table_stats(table).misses += 1
+                generation = self._generations.get(table, 0)
+            try:
+                value = loader()
+            except Exception:
+                with self._lock:
+                    self._loading.pop((table, key), None)
+                raise
+            with self._lock:
+                if self._generations.get(table, 0) == generation:
+                    self._entries[(table, key)] = (time.monotonic() + ttl, value)
+                self._loading.pop((table, key), None)
+            return value
+
+    def add_listener(self, callback):
+        """테이블이 무효화될 때(기록될 때) callback(table)을 호출합니다. 전체 무효화는 table=None."""
+        with self._lock:
+            self._listeners.append(callback)
+
+    def invalidate(self, table=None):
+        """테이블의 캐시를 비웁니다 (table이 없으면 전체)."""
+        with self._lock:
+            tables = ({t for t, _ in self._entries} | set(self._generations)) if table is None else {table}
+            for name in tables:
+                self._generations[name] = self._generations.get(name, 0) + 1
+                self._table_stats(name).invalidations += 1
+            self._entries = {k: v for k, v in self._entries.items() if k[0] not in tables}
+            listeners = list(self._listeners)
+        for callback in listeners:
+            callback(table)
+
+    def stats(self):
+        """테이블별 적중/실패 횟수와 적중률"""
+        with self._lock:
+            entries = {}
+            for table, _ in self._entries:
+                entries[table] = entries.get(table, 0) + 1
+            tables = {name: stats.to_dict(entries.get(name, 0), self.ttl(name))
+                      for name, stats in sorted(self._stats.items())}
+        hits = sum(t["hits"] for t in tables.values())
+        misses = sum(t["misses"] for t in tables.values())
+        return {
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": round(hits / (hits + misses), 4) if hits + misses else None,
+            "tables": tables,
+        }
+
+    def reset_stats(self):
+        with self._lock:
+            self._stats = {}
+
+
+# 앱 전체에서 공유하는 조회 캐시
+read_cache = ReadCache()
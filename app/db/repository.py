@@ -0,0 +1,163 @@
+"""
+저장소 계층: Supabase 또는 내장 SQL(SQLite/DuckDB) 백엔드 선택과 타입이 지정된 일괄 읽기/쓰기
+
+백엔드는 DB_BACKEND 환경 변수로 선택합니다.
+    DB_BACKEND=supabase  (기본값) Supabase REST API
+    DB_BACKEND=sqlite    LOCAL_DB_PATH의 SQLite 파일 (오프라인 실행/부하 테스트)
+    DB_BACKEND=duckdb    LOCAL_DB_PATH의 DuckDB 파일 (duckdb 패키지 필요)
+
+두 백엔드 모두 table(...).select/insert/upsert/update/delete 체인을 같은 방식으로 지원하므로
+서비스 코드는 백엔드와 무관하게 동작합니다.
+"""
+import numpy as np
+import pandas as pd
+
+from app.core.config import settings
+from app.db.local import LocalClient, TABLE_SCHEMAS
+
+LOCAL_BACKENDS = ("sqlite", "duckdb")
+
+
+def create_db_client(url=None, key=None, backend=None):
+    """
+    설정된 백엔드의 DB 클라이언트를 생성합니다.
+
+    Args:
+        url (str, optional): Supabase URL (기본값: settings.SUPABASE_URL)
+        key (str, optional): Supabase 키 (기본값: settings.SUPABASE_KEY)
+        backend (str, optional): "supabase", "sqlite", "duckdb" (기본값: settings.DB_BACKEND)
+    """
+    backend = (backend or settings.DB_BACKEND).lower()
+    if backend in LOCAL_BACKENDS:
+        print(f"내장 DB 백엔드 사용: {backend} ({settings.LOCAL_DB_PATH})")
+        return LocalClient(settings.LOCAL_DB_PATH, engine=backend)
+    if backend != "supabase":
+        raise ValueError(f"지원하지 않는 DB_BACKEND: {backend}")
+
+    # supabase 패키지는 Supabase 백엔드를 사용할 때만 필요
+    from supabase import create_client
+    return create_client(url or settings.SUPABASE_URL, key or settings.SUPABASE_KEY)
+
+
+def records_from_frame(frame):
+    """
+    데이터프레임을 기록용 딕셔너리 목록으로 변환합니다.
+    NaN/inf는 None으로, numpy 스칼라는 파이썬 기본 타입으로, 날짜는 문자열로 바꿉니다 (열 단위 벡터 연산).
+    """
+    if frame is None or frame.empty:
+        return []
+    columns = {}
+    for col in frame.columns:
+        series = frame[col]
+        if pd.api.types.is_datetime64_any_dtype(series):
+            values = series.dt.strftime('%Y-%m-%d').astype(object)
+            values = values.where(series.notna(), None)
+        elif pd.api.types.is_bool_dtype(series):
+            values = series.astype(object)
+        elif pd.api.types.is_numeric_dtype(series):
+            numeric = series.to_numpy(dtype=np.float64, na_value=np.nan, copy=True)
+            if series.dtype == np.float32:
+                # float32는 문자열을 거쳐 변환해야 1.2300000190734863 같은 오차가 생기지 않음
+                numeric = series.to_numpy().astype(str).astype(np.float64)
+            missing = ~np.isfinite(numeric)
+            # 정수(Int64 포함)는 파이썬 int로 (Series.map은 None이 섞이면 float로 되돌림)
+            if pd.api.types.is_integer_dtype(series):
+                values = np.where(missing, 0, numeric).astype(np.int64).astype(object)
+            else:
+                values = numeric.astype(object)
+            values[missing] = None
+        else:
+            values = series.astype(object).where(series.notna(), None)
+        columns[col] = values.tolist()
+    names = list(columns)
+    return [dict(zip(names, row)) for row in zip(*columns.values())]
+
+
+class TableRepository:
+    """테이블 단위 일괄 읽기/쓰기 (데이터프레임 ↔ DB)"""
+
+    def __init__(self, client, page_size=1000, batch_size=500):
+        self.client = client
+        self.page_size = page_size
+        self.batch_size = batch_size
+
+    @property
+    def is_local(self):
+        return isinstance(self.client, LocalClient)
+
+    def read_frame(self, table, columns=None, filters=None, order_by=None, desc=False, limit=None,
+                   parse_dates=True):
+        """
+        테이블을 데이터프레임으로 읽습니다. Supabase는 page_size 단위로 나눠 조회합니다.
+
+        Args:
+            table (str): 테이블명
+            columns (list, optional): 조회할 컬럼 (기본값: 전체)
+            filters (list, optional): (컬럼, 연산자, 값) 목록. 연산자는 eq/neq/gt/gte/lt/lte/in_/is_
+            order_by (str, optional): 정렬 컬럼
+            desc (bool): 내림차순 여부
+            limit (int, optional): 최대 행 수
+            parse_dates (bool): TABLE_SCHEMAS의 DATE/TIMESTAMP 컬럼을 datetime으로 변환
+
+        Returns:
+            pd.DataFrame
+        """
+        select = ",".join(f'"{c}"' for c in columns) if columns else "*"
+        rows = []
+        offset = 0
+        # 내장 백엔드는 한 번에 읽고, Supabase는 최대 조회 행 수 제한 때문에 나눠 읽음
+        page_size = limit if self.is_local and limit else (None if self.is_local else self.page_size)
+        while True:
+            query = self.client.table(table).select(select)
+            for column, op, value in filters or []:
+                query = getattr(query, op)(column, value)
+            if order_by:
+                query = query.order(order_by, desc=desc)
+            if page_size is not None:
+                size = page_size if limit is None else min(page_size, limit - offset)
+                query = query.range(offset, offset + size - 1)
+            page = query.execute().data or []
+            rows.extend(page)
+            if page_size is None or len(page) < size or (limit is not None and len(rows) >= limit):
+                break
+            offset += len(page)
+
+        frame = pd.DataFrame(rows, columns=columns) if columns else pd.DataFrame(rows)
+        if parse_dates and not frame.empty:
+            declared = TABLE_SCHEMAS.get(table, {}).get("columns", {})
+            for col, col_type in declared.items():
+                if col in frame.columns and col_type in ("DATE", "TIMESTAMP"):
+                    frame[col] = pd.to_datetime(frame[col], errors='coerce', format='mixed')
+        return frame
+
+    def write_frame(self, table, frame, mode="upsert", on_conflict=None):
+        """
+        데이터프레임을 batch_size 단위로 일괄 기록합니다.
+
+        Args:
+            table (str): 테이블명
+            frame (pd.DataFrame): 기록할 데이터
+            mode (str): "upsert" 또는 "insert"
+            on_conflict (str, optional): upsert 충돌 기준 컬럼 (기본값: 기본 키)
+
+        Returns:
+            int: 기록한 행 수
+        """
+        return self.write_records(table, records_from_frame(frame), mode=mode, on_conflict=on_conflict)
+
+    def write_records(self, table, records, mode="upsert", on_conflict=None):
+        """딕셔너리 목록을 batch_size 단위로 일괄 기록합니다. 내장 백엔드는 한 번에 기록합니다."""
+        if not records:
+            return 0
+        batch_size = len(records) if self.is_local else self.batch_size
+        written = 0
+        for i in range(0, len(records), batch_size):
+            batch = records[i:i + batch_size]
+            query = self.client.table(table)
+            if mode == "upsert":
+                query = query.upsert(batch, on_conflict=on_conflict) if on_conflict else query.upsert(batch)
+            else:
+                query = query.insert(batch)
+            query.execute()
+            written += len(batch)
+        return written
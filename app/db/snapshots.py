@@ -0,0 +1,145 @@
+"""
+버전별 스냅샷 테이블
+
+매번 전체를 다시 쓰는 결과 테이블(stock_recommendations, ticker_sentiment_analysis, buy_decisions)은
+전체 삭제 후 삽입하면 쓰는 동안 읽는 쪽(매수 스케줄러, API)이 빈 테이블이나 일부만 기록된 테이블을 봅니다.
+이 모듈은 새 결과를 새 run_id 버전으로 한 번에 기록한 뒤 snapshot_pointers의 현재 버전 포인터만 바꿉니다.
+
+- 읽는 쪽은 포인터가 가리키는 run_id 행만 조회하므로 기록 중인 버전은 보이지 않습니다.
+- 직전 버전은 다음 게시까지 남겨 두어 포인터를 바꾸기 직전에 run_id를 읽은 조회도 완전한 결과를 받습니다.
+- 그보다 오래된 버전은 게시 후 백그라운드 작업자에서 삭제합니다.
+- 기록과 포인터 변경은 쓰기 저널의 배치 두 개이므로 중간에 종료되면 다음 게시 때 이어서 반영합니다.
+
+사용 예:
+    run_id = snapshot_store.publish("ticker_sentiment_analysis", rows)
+    rows = snapshot_store.query("ticker_sentiment_analysis", ["ticker", "average_sentiment_score"]).fetch()
+"""
+import uuid
+from datetime import datetime
+
+from app.db.journal import write_journal
+from app.db.queries import TableQuery
+from app.utils.background_jobs import JobWorker
+
+POINTER_TABLE = "snapshot_pointers"
+RUN_ID_COLUMN = "run_id"
+
+# 스냅샷 테이블 → (버전 안에서 행을 구분하는 upsert 충돌 컬럼, 포인터가 없을 때 최신 행 조회 기준)
+SNAPSHOT_TABLES = {
+    "stock_recommendations": {"on_conflict": "run_id,날짜,종목", "partition": "종목", "order_by": "날짜"},
+    "ticker_sentiment_analysis": {"on_conflict": "run_id,ticker", "partition": "ticker", "order_by": "created_at"},
+    "buy_decisions": {"on_conflict": "run_id,rank", "partition": "ticker", "order_by": "generated_at"},
+}
+
+
+def new_run_id():
+    """시간순으로 정렬되는 버전 ID (오래된 버전 삭제에 문자열 비교 사용)"""
+    return f"{datetime.now().strftime('%Y%m%d%H%M%S%f')}-{uuid.uuid4().hex[:6]}"
+
+
+class SnapshotStore:
+    """run_id 버전으로 기록하고 포인터 변경으로 게시하는 스냅샷 테이블"""
+
+    def __init__(self, client=None, journal=None, worker=None):
+        """
+        Args:
+            client (optional): DB 클라이언트 (기본값: app.db.supabase.supabase)
+            journal (WriteJournal, optional): 게시에 사용할 쓰기 저널 (기본값: write_journal)
+            worker (JobWorker, optional): 오래된 버전 삭제 작업자 (기본값: 전용 작업자 스레드)
+        """
+        self._client = client
+        self.journal = journal or write_journal
+        self.worker = worker or JobWorker("snapshot-prune")
+
+    @property
+    def client(self):
+        if self._client is None:
+            from app.db.supabase import supabase
+            self._client = supabase
+        return self._client
+
+    def pointer(self, table):
+        """현재 게시된 버전 정보 (run_id, previous_run_id, row_count, published_at). 없으면 None."""
+        try:
+            rows = TableQuery(POINTER_TABLE, ["run_id", "previous_run_id", "row_count", "published_at"],
+                              client=self.client) \
+                .where("table_name", "eq", table).limit(1).cached().fetch()
+        except Exception as e:
+            print(f"{POINTER_TABLE} 조회 실패 ({table}): {str(e)}")
+            return None
+        return rows[0] if rows else None
+
+    def current(self, table):
+        """현재 게시된 run_id (게시된 적이 없으면 None)"""
+        pointer = self.pointer(table)
+        return pointer.get("run_id") if pointer else None
+
+    def query(self, table, columns):
+        """
+        현재 게시된 버전의 행을 조회하는 TableQuery를 반환합니다 (조회 캐시 사용, 게시하면 무효화).
+        게시된 버전이 없으면(버전 도입 이전 데이터) 종목별 최신 행을 조회합니다.
+        """
+        run_id = self.current(table)
+        query = TableQuery(table, columns, client=self.client).cached()
+        if run_id is not None:
+            return query.where(RUN_ID_COLUMN, "eq", run_id)
+        spec = SNAPSHOT_TABLES[table]
+        return query.latest_per(spec["partition"], order_by=spec["order_by"])
+
+    def publish(self, table, rows, run_id=None):
+        """
+        행 전체를 새 버전으로 한 번에 기록하고 포인터를 새 버전으로 바꿉니다.
+
+        Args:
+            table (str): SNAPSHOT_TABLES의 테이블명
+            rows (list): 기록할 행 (run_id는 자동으로 채움)
+            run_id (str, optional): 버전 ID (기본값: new_run_id())
+
+        Returns:
+            str: 게시한 run_id
+        """
+        spec = SNAPSHOT_TABLES[table]
+        run_id = run_id or new_run_id()
+        previous = self.current(table)
+        versioned = [{**row, RUN_ID_COLUMN: run_id} for row in rows]
+        pointer = {
+            "table_name": table,
+            "run_id": run_id,
+            "previous_run_id": previous,
+            "row_count": len(versioned),
+            "published_at": datetime.now().isoformat(timespec="seconds"),
+        }
+        operations = [
+            {"op": "upsert", "table": table, "rows": versioned, "on_conflict": spec["on_conflict"]},
+            {"op": "upsert", "table": POINTER_TABLE, "rows": [pointer], "on_conflict": "table_name"},
+        ]
+        self.journal.execute(f"snapshot_{table}", operations, client=self.client)
+        print(f"{table} 스냅샷 게시: run_id={run_id} ({len(versioned)}행)")
+        self.worker.submit(self.prune)
+        return run_id
+
+    def prune(self, progress=None):
+        """
+        스냅샷 테이블마다 현재/직전 버전보다 오래된 행과 run_id가 없는 이전 행을 삭제합니다.
+
+        Returns:
+            dict: 테이블명 → 삭제한 행 수
+        """
+        removed = {}
+        for table in SNAPSHOT_TABLES:
+            pointer = self.pointer(table)
+            if not pointer:
+                continue
+            keep_from = pointer.get("previous_run_id") or pointer["run_id"]
+            if progress:
+                progress(stage="prune", message=f"{table}: {keep_from} 이전 버전 삭제")
+            deleted = self.client.table(table).delete().lt(RUN_ID_COLUMN, keep_from).execute().data or []
+            legacy = self.client.table(table).delete().is_(RUN_ID_COLUMN, "null").execute().data or []
+            removed[table] = len(deleted) + len(legacy)
+            if removed[table]:
+                print(f"{table} 이전 스냅샷 {removed[table]}행 삭제")
+        return removed
+
+
+# 앱 전체에서 공유하는 스냅샷 저장소
+snapshot_store = SnapshotStore()
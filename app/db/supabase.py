@@ -1,9 +1,10 @@
-from supabase import create_client, Client
-from app.core.config import settings
+from app.db.repository import create_db_client, TableRepository
 
-url: str = settings.SUPABASE_URL
-key: str = settings.SUPABASE_KEY
-supabase: Client = create_client(url, key)
+# DB_BACKEND 설정에 따라 Supabase 또는 내장 SQL(SQLite/DuckDB) 클라이언트
+supabase = create_db_client()
+
+# 데이터프레임 단위 일괄 읽기/쓰기
+repository = TableRepository(supabase)
 
 def get_data(table_name):
     """Supabase에서 데이터 가져오기"""
@@ -3,7 +3,7 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 import uvicorn
 from app.api.api import api_router
-from app.services.economic_service import update_economic_data_in_background
+from app.services.economic_service import submit_economic_data_update, economic_ingest_worker
 from app.utils.scheduler import (
     start_scheduler, stop_scheduler,
     start_sell_scheduler, stop_sell_scheduler,
@@ -33,6 +33,7 @@ async def lifespan(app: FastAPI):
     stop_scheduler()  # 매수 스케줄러 종료
     stop_sell_scheduler()  # 매도 스케줄러 종료
     stop_economic_data_scheduler()  # 경제 데이터 스케줄러 종료
+    economic_ingest_worker.shutdown()  # 대기 중인 수집 작업 취소
 
 app = FastAPI(
     title="주식 분석 및 추천 API",
@@ -58,10 +59,10 @@ def read_root():
 
 # APScheduler 대신 직접 실행
 async def startup():
-    # 시작 시 즉시 한 번 경제 데이터 수집 실행
-    print("서비스 시작 시 경제 데이터 수집을 즉시 실행합니다...")
-    await update_economic_data_in_background()
-    print("초기 경제 데이터 수집이 완료되었습니다.")
+    # 시작 시 경제 데이터 수집을 백그라운드 작업으로 제출하고 기다리지 않음
+    # (진행 상황과 데이터 최신 여부는 /health/ready 에서 확인)
+    job = submit_economic_data_update()
+    print(f"초기 경제 데이터 수집을 백그라운드에서 시작했습니다. (job_id={job.id})")
     
     # 경제 데이터 업데이트 스케줄러 시작 (매일 한국시간 새벽 6시 5분에 실행)
     start_economic_data_scheduler()
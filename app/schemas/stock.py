@@ -13,4 +13,5 @@ class UpdateResponse(BaseModel):
     success: bool
     message: str
     total_records: int = 0
-    updated_records: int = 0
\ No newline at end of file
+    updated_records: int = 0
+    job_id: Optional[str] = None
\ No newline at end of file
@@ -0,0 +1,481 @@
+"""
+매수/매도 규칙 백테스트
+
+economic_and_stock_data 종가, indicator_history 지표, predicted_stocks 예측, ticker_sentiment_analysis 감성 점수를
+(날짜 × 종목) 행렬로 읽어 실시간 매수/매도 규칙을 과거 구간에 그대로 적용합니다.
+
+기준값은 실시간 판단과 같은 TRADING_RULES를 사용하고, rules 인자로 일부만 바꿀 수 있습니다.
+
+- 매수 (get_combined_recommendations_with_technical_and_sentiment와 같은 규칙)
+    예측 정확도 >= 80 AND 예상 상승률 >= 3 AND
+    (감성 점수 >= 0.15 AND 기술 조건 2개 이상) OR (기술 조건 3개)
+    기술 조건: 골든 크로스, RSI < 50, MACD > Signal
+- 매도 (get_stocks_to_sell과 같은 규칙)
+    매수가 대비 +5% 이상 / -5% 이하, 기술 매도 신호 3개,
+    또는 감성 점수 < -0.15 AND 기술 매도 신호 2개 이상
+    기술 매도 신호: 데드 크로스, RSI > 70, MACD <= Signal
+
+신호는 행렬 전체에 대해 한 번에 계산하고, 보유 상태(매수가)는 날짜 방향으로만 반복하며
+종목 방향은 벡터 연산입니다. 종목은 서로 독립이므로 종목 묶음(shard)을 프로세스별로 나눠 시뮬레이션합니다.
+
+과거 시점에 알 수 없던 정보는 쓰지 않습니다.
+- 예측 정확도: 해당 날짜까지 결과가 확정된 예측(forecast_horizon 행 이전)만으로 계산한 누적 100 - MAPE
+- 감성 점수: calculation_date 기준 그 날짜까지의 최신 값
+- 주문: 신호 발생 execution_lag 거래일 뒤 종가에 체결 (기본값 1)
+
+사용법:
+    python backtest.py --start 2020-01-01 --end 2024-12-31
+    python backtest.py --start 2015-01-01 --workers 4 --fee-bps 5 --output equity.csv
+"""
+import argparse
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from app.db.snapshots import SnapshotStore, snapshot_store
+from app.services.economic_ingest import STOCK_COLUMNS
+from app.services.indicator_engine import (
+    DATE_COLUMN, IndicatorEngine, PRICE_TABLE, compute_indicator_matrices, indicator_engine
+)
+from app.services.trading_rules import TRADING_RULES, composite_score
+
+PREDICTION_TABLE = "predicted_stocks"
+SENTIMENT_TABLE = "ticker_sentiment_analysis"
+
+# predict.py의 forecast_horizon (예측값은 14거래일 뒤 가격)
+FORECAST_HORIZON = 14
+
+DEFAULT_CAPITAL = 100000.0
+# 종목당 매수 금액 비율 (자동 매수의 "종목당 계좌 잔고의 5%")
+POSITION_FRACTION = 0.05
+DEFAULT_SHARD_SIZE = 250
+TRADING_DAYS_PER_YEAR = 252
+
+# 지표 재계산 시 시작일보다 앞서 읽는 기간 (SMA50/EMA 수렴용)
+INDICATOR_MARGIN_DAYS = 180
+
+
+class BacktestData:
+    """백테스트 입력 (날짜 × 종목) 행렬 묶음"""
+
+    MATRICES = ("close", "golden_cross", "rsi", "macd_buy", "indicator_valid", "accuracy", "rise", "sentiment")
+
+    def __init__(self, dates, names, close, golden_cross, rsi, macd_buy, indicator_valid, accuracy, rise, sentiment):
+        self.dates = pd.DatetimeIndex(dates)
+        self.names = list(names)
+        self.close = close
+        self.golden_cross = golden_cross
+        self.rsi = rsi
+        self.macd_buy = macd_buy
+        self.indicator_valid = indicator_valid
+        self.accuracy = accuracy
+        self.rise = rise
+        self.sentiment = sentiment
+
+    @property
+    def shape(self):
+        return self.close.shape
+
+    def subset(self, columns):
+        """종목 위치 목록(또는 slice)에 해당하는 열만 담은 BacktestData"""
+        names = np.asarray(self.names, dtype=object)[columns].tolist()
+        return BacktestData(self.dates, names, **{key: getattr(self, key)[:, columns] for key in self.MATRICES})
+
+
+def _matrix(frame, dates, names):
+    """데이터프레임을 dates × names 순서의 float64 행렬로 맞춥니다 (없는 셀은 NaN)."""
+    if frame is None or frame.empty:
+        return np.full((len(dates), len(names)), np.nan)
+    return frame.reindex(index=dates, columns=names).to_numpy(dtype=np.float64)
+
+
+def _history_matrices(engine, names, dates, start_date, end_date):
+    history = engine.read_history(names, start_date=start_date, end_date=end_date,
+                                  columns=["골든_크로스", "RSI", "MACD_매수_신호"])
+    if history.empty:
+        return None
+    history = history.drop_duplicates([DATE_COLUMN, "종목"], keep="last")
+    pivot = {key: history.pivot(index=DATE_COLUMN, columns="종목", values=key).astype(float)
+             for key in ("골든_크로스", "RSI", "MACD_매수_신호")}
+    return {key: _matrix(frame, dates, names) for key, frame in pivot.items()}
+
+
+def _recomputed_matrices(prices, dates, names):
+    matrices = compute_indicator_matrices(prices)
+    valid = matrices["valid"]
+    return {key: _matrix(matrices[key].astype(float).where(valid), dates, names)
+            for key in ("골든_크로스", "RSI", "MACD_매수_신호")}
+
+
+def prediction_matrices(frame, dates, names, forecast_horizon=FORECAST_HORIZON):
+    """
+    predicted_stocks 행으로 날짜별 예상 상승률과 그 날짜 기준 예측 정확도를 계산합니다.
+
+    상승률 = (예측가 - 당일 실제가) / 당일 실제가 × 100  (predict.py analyze_rise_predictions)
+    정확도 = 100 - MAPE. s행 예측의 오차 |A[s+h] - P[s]| / A[s+h]는 s+h행에서 확정되므로
+             각 날짜에는 그때까지 확정된 오차의 누적 평균만 사용합니다 (predict.py evaluate_predictions).
+
+    Returns:
+        tuple: (accuracy, rise) 행렬
+    """
+    if frame is None or frame.empty:
+        empty = np.full((len(dates), len(names)), np.nan)
+        return empty, empty.copy()
+    frame = frame.set_index(DATE_COLUMN).sort_index()
+    frame = frame[~frame.index.duplicated(keep="last")]
+    predicted = frame.reindex(columns=[f"{name}_Predicted" for name in names]).to_numpy(dtype=np.float64)
+    actual = frame.reindex(columns=[f"{name}_Actual" for name in names]).to_numpy(dtype=np.float64)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rise = (predicted - actual) / actual * 100
+        future = np.full_like(actual, np.nan)
+        if len(actual) > forecast_horizon:
+            future[:-forecast_horizon] = actual[forecast_horizon:]
+        error = np.abs((future - predicted) / future)
+    # s행 오차는 s+h행에서 확정
+    known = np.full_like(error, np.nan)
+    if len(error) > forecast_horizon:
+        known[forecast_horizon:] = error[:-forecast_horizon]
+    known[~np.isfinite(known)] = np.nan
+    counts = np.cumsum(~np.isnan(known), axis=0)
+    sums = np.cumsum(np.nan_to_num(known), axis=0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        accuracy = np.where(counts > 0, 100 - sums / counts * 100, np.nan)
+
+    index = frame.index
+    accuracy = pd.DataFrame(accuracy, index=index, columns=names)
+    rise = pd.DataFrame(rise, index=index, columns=names)
+    return _matrix(accuracy, dates, names), _matrix(rise, dates, names)
+
+
+def sentiment_matrix(frame, dates, names, name_to_ticker):
+    """calculation_date 기준 날짜별 최신 감성 점수 (이후 날짜로 전진 채우기)"""
+    if frame is None or frame.empty:
+        return np.full((len(dates), len(names)), np.nan)
+    frame = frame.dropna(subset=["calculation_date"]).sort_values("calculation_date")
+    frame = frame.assign(day=pd.to_datetime(frame["calculation_date"]).dt.normalize())
+    pivot = frame.drop_duplicates(["day", "ticker"], keep="last") \
+        .pivot(index="day", columns="ticker", values="average_sentiment_score")
+    pivot = pivot.reindex(pivot.index.union(dates)).sort_index().ffill().reindex(dates)
+    by_name = pd.DataFrame({name: pivot[ticker] for name, ticker in name_to_ticker.items()
+                            if name in names and ticker in pivot.columns}, index=dates)
+    return _matrix(by_name, dates, names)
+
+
+def load_backtest_data(start_date, end_date=None, names=None, client=None, forecast_horizon=FORECAST_HORIZON,
+                       recompute_indicators=False):
+    """
+    백테스트 입력 행렬을 DB에서 읽습니다.
+
+    Args:
+        start_date (str): 시작일 (YYYY-MM-DD)
+        end_date (str, optional): 종료일 (기본값: 오늘)
+        names (list, optional): 종목명 (기본값: 티커가 있는 STOCK_COLUMNS 종목)
+        client (optional): DB 클라이언트 (기본값: app.db.supabase.supabase)
+        recompute_indicators (bool): indicator_history 대신 종가로 지표를 다시 계산
+            (이력이 비어 있으면 자동으로 다시 계산)
+
+    Returns:
+        BacktestData
+    """
+    from app.services.stock_recommendation_service import STOCK_TO_TICKER
+
+    end_date = end_date or datetime.now().strftime("%Y-%m-%d")
+    names = list(names or [name for name in STOCK_COLUMNS if name in STOCK_TO_TICKER])
+    engine = IndicatorEngine(client=client) if client is not None else indicator_engine
+    repository = engine.repository
+
+    margin_start = (pd.Timestamp(start_date) - pd.Timedelta(days=INDICATOR_MARGIN_DAYS)).strftime("%Y-%m-%d")
+    prices = repository.read_frame(PRICE_TABLE, columns=[DATE_COLUMN, *names],
+                                   filters=[(DATE_COLUMN, "gte", margin_start), (DATE_COLUMN, "lte", end_date)],
+                                   order_by=DATE_COLUMN)
+    if prices.empty:
+        raise ValueError(f"{start_date} ~ {end_date} 기간의 종가 데이터가 없습니다.")
+    prices = prices.set_index(DATE_COLUMN).apply(pd.to_numeric, errors="coerce").dropna(how="all")
+    dates = prices.index[prices.index >= pd.Timestamp(start_date)]
+    close = _matrix(prices, dates, names)
+
+    indicators = None if recompute_indicators else _history_matrices(engine, names, dates, start_date, end_date)
+    if indicators is None:
+        print("indicator_history를 사용하지 않고 종가로 지표를 다시 계산합니다.")
+        indicators = _recomputed_matrices(prices, dates, names)
+    indicator_valid = ~(np.isnan(indicators["골든_크로스"]) | np.isnan(indicators["RSI"])
+                        | np.isnan(indicators["MACD_매수_신호"]))
+
+    try:
+        # 종목 컬럼이 일부 없을 수 있으므로 전체 컬럼을 읽고 필요한 컬럼만 맞춤
+        predictions = repository.read_frame(PREDICTION_TABLE, filters=[(DATE_COLUMN, "lte", end_date)],
+                                            order_by=DATE_COLUMN)
+        predictions[DATE_COLUMN] = pd.to_datetime(predictions[DATE_COLUMN], errors="coerce")
+    except Exception as e:
+        print(f"{PREDICTION_TABLE} 조회 실패, 예측 조건 없이 진행합니다 (매수 없음): {str(e)}")
+        predictions = None
+    accuracy, rise = prediction_matrices(predictions, dates, names, forecast_horizon)
+
+    try:
+        # 스냅샷 테이블이므로 게시된 버전만 조회 (게시 중인 버전의 일부 행을 읽지 않도록)
+        store = SnapshotStore(client=client) if client is not None else snapshot_store
+        sentiment = pd.DataFrame(
+            store.query(SENTIMENT_TABLE, ["ticker", "average_sentiment_score", "calculation_date"])
+            .where("calculation_date", "lte", f"{end_date}T23:59:59").fetch())
+    except Exception as e:
+        print(f"{SENTIMENT_TABLE} 조회 실패, 감성 조건 없이 진행합니다: {str(e)}")
+        sentiment = None
+    sentiment = sentiment_matrix(sentiment, dates, names, STOCK_TO_TICKER)
+
+    return BacktestData(
+        dates, names, close,
+        golden_cross=np.nan_to_num(indicators["골든_크로스"]).astype(bool),
+        rsi=indicators["RSI"],
+        macd_buy=np.nan_to_num(indicators["MACD_매수_신호"]).astype(bool),
+        indicator_valid=indicator_valid,
+        accuracy=accuracy,
+        rise=rise,
+        sentiment=sentiment,
+    )
+
+
+def compute_signals(data, rules=None):
+    """
+    행렬 전체의 매수 신호와 기술적 매도 신호를 계산합니다.
+
+    Returns:
+        tuple: (buy, sell, score) 매수/매도 불리언 행렬과 매수 후보 종합 점수 행렬
+    """
+    rules = {**TRADING_RULES, **(rules or {})}
+    valid = data.indicator_valid
+    with np.errstate(invalid="ignore"):
+        tech_count = data.golden_cross.astype(int) + (data.rsi < rules["rsi_buy"]) + data.macd_buy.astype(int)
+        predicted = (data.accuracy >= rules["min_accuracy"]) & (data.rise >= rules["min_rise"])
+        good_sentiment = data.sentiment >= rules["buy_sentiment"]
+        buy = valid & predicted & ((good_sentiment & (tech_count >= 2)) | (tech_count >= 3))
+
+        sell_count = (~data.golden_cross).astype(int) + (data.rsi > rules["rsi_sell"]) + (~data.macd_buy).astype(int)
+        bad_sentiment = data.sentiment < rules["sell_sentiment"]
+        sell = valid & ((sell_count >= 3) | (bad_sentiment & (sell_count >= 2)))
+        score = composite_score(np.nan_to_num(data.rise), data.golden_cross, data.rsi < rules["rsi_buy"],
+                                data.macd_buy, np.nan_to_num(data.sentiment), rules)
+    return buy, sell, score
+
+
+def _lag(signal, lag):
+    if lag <= 0:
+        return signal
+    lagged = np.zeros_like(signal)
+    lagged[lag:] = signal[:-lag]
+    return lagged
+
+
+def _forward_fill(values):
+    """열별 직전 유효값으로 NaN을 채웁니다 (보유 종목 평가용)."""
+    index = np.where(~np.isnan(values), np.arange(len(values))[:, None], 0)
+    np.maximum.accumulate(index, axis=0, out=index)
+    filled = values[index, np.arange(values.shape[1])]
+    return filled
+
+
+def simulate(data, rules=None, position_size=DEFAULT_CAPITAL * POSITION_FRACTION, fee_bps=0.0, execution_lag=1,
+             max_positions=None):
+    """
+    종목 묶음 하나의 매수/매도를 시뮬레이션합니다.
+
+    Args:
+        data (BacktestData): 입력 행렬
+        rules (dict, optional): TRADING_RULES 중 바꿀 기준값
+        position_size (float): 종목당 매수 금액
+        fee_bps (float): 체결 금액 대비 수수료 (bp)
+        execution_lag (int): 신호 발생 후 체결까지의 거래일 수
+        max_positions (int, optional): 동시 보유 종목 수 상한. 빈 자리보다 매수 후보가 많으면 종합 점수 순으로 매수
+
+    Returns:
+        dict: pnl/traded (날짜 × 종목), positions (날짜별 보유 종목 수), trade_returns (청산 거래 수익률 %)
+    """
+    rules = {**TRADING_RULES, **(rules or {})}
+    buy, sell, score = compute_signals(data, rules)
+    buy, sell, score = _lag(buy, execution_lag), _lag(sell, execution_lag), _lag(score, execution_lag)
+
+    close = data.close
+    marks = _forward_fill(close)
+    tradable = ~np.isnan(close)
+    fee_rate = fee_bps / 10000.0
+    periods, width = close.shape
+
+    shares = np.zeros(width)
+    entry = np.full(width, np.nan)
+    pnl = np.zeros((periods, width))
+    traded = np.zeros((periods, width))
+    positions = np.zeros(periods, dtype=np.int64)
+    trade_returns = []
+
+    previous = marks[0] if periods else None
+    for t in range(periods):
+        mark = marks[t]
+        held = shares > 0
+        pnl[t] = np.where(held, shares * (mark - previous), 0.0)
+        previous = mark
+
+        price = close[t]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            change = (price - entry) / entry * 100
+            exit_mask = held & tradable[t] & (
+                (change >= rules["take_profit"]) | (change <= rules["stop_loss"]) | sell[t])
+        if exit_mask.any():
+            notional = shares[exit_mask] * price[exit_mask]
+            traded[t, exit_mask] += notional
+            pnl[t, exit_mask] -= notional * fee_rate
+            trade_returns.append(change[exit_mask])
+            shares[exit_mask] = 0.0
+            entry[exit_mask] = np.nan
+
+        # 같은 날 청산한 종목은 다시 매수하지 않음 (held는 청산 전 상태)
+        enter_mask = ~held & tradable[t] & buy[t]
+        if max_positions is not None and enter_mask.any():
+            slots = max_positions - int(np.count_nonzero(shares))
+            candidates = np.flatnonzero(enter_mask)
+            if len(candidates) > max(slots, 0):
+                enter_mask[:] = False
+                if slots > 0:
+                    best = np.argsort(-score[t, candidates], kind="stable")[:slots]
+                    enter_mask[candidates[best]] = True
+        if enter_mask.any():
+            shares[enter_mask] = position_size / price[enter_mask]
+            entry[enter_mask] = price[enter_mask]
+            traded[t, enter_mask] += position_size
+            pnl[t, enter_mask] -= position_size * fee_rate
+        positions[t] = int(np.count_nonzero(shares))
+
+    return {
+        "pnl": pnl,
+        "traded": traded,
+        "positions": positions,
+        "trade_returns": np.concatenate(trade_returns) if trade_returns else np.array([]),
+        "open_positions": int(np.count_nonzero(shares)),
+    }
+
+
+def _simulate_shard(args):
+    data, rules, position_size, fee_bps, execution_lag, max_positions = args
+    return simulate(data, rules, position_size=position_size, fee_bps=fee_bps, execution_lag=execution_lag,
+                    max_positions=max_positions)
+
+
+def summarize(data, shards, capital=DEFAULT_CAPITAL):
+    """
+    종목 묶음별 결과를 합쳐 손익, 최대 낙폭, 회전율 등을 계산합니다.
+
+    Returns:
+        dict: 요약 지표 + equity(pd.Series), per_ticker_pnl(dict)
+    """
+    pnl = np.hstack([shard["pnl"] for shard in shards]) if shards else np.zeros((len(data.dates), 0))
+    traded = np.hstack([shard["traded"] for shard in shards]) if shards else np.zeros_like(pnl)
+    positions = np.sum([shard["positions"] for shard in shards], axis=0) if shards else np.zeros(len(data.dates))
+    trade_returns = np.concatenate([shard["trade_returns"] for shard in shards]) if shards else np.array([])
+
+    daily = pnl.sum(axis=1)
+    equity = capital + np.cumsum(daily)
+    peak = np.maximum.accumulate(np.concatenate([[capital], equity]))[1:]
+    drawdown = (equity - peak) / peak
+    previous_equity = np.concatenate([[capital], equity[:-1]])
+    returns = daily / previous_equity
+
+    days = (data.dates[-1] - data.dates[0]).days if len(data.dates) > 1 else 0
+    years = days / 365.25
+    final = float(equity[-1]) if len(equity) else capital
+    total_traded = float(traded.sum())
+    std = float(returns.std(ddof=1)) if len(returns) > 1 else 0.0
+
+    return {
+        "start_date": data.dates[0].strftime("%Y-%m-%d") if len(data.dates) else None,
+        "end_date": data.dates[-1].strftime("%Y-%m-%d") if len(data.dates) else None,
+        "tickers": len(data.names),
+        "trading_days": len(data.dates),
+        "final_equity": round(final, 2),
+        "total_pnl": round(final - capital, 2),
+        "total_return_pct": round((final / capital - 1) * 100, 4),
+        "annualized_return_pct": round(((final / capital) ** (1 / years) - 1) * 100, 4) if years > 0 and final > 0 else None,
+        "max_drawdown_pct": round(float(drawdown.min()) * 100, 4) if len(drawdown) else 0.0,
+        "sharpe": round(float(returns.mean()) / std * math.sqrt(TRADING_DAYS_PER_YEAR), 4) if std > 0 else None,
+        "turnover": round(total_traded / capital, 4),
+        "annualized_turnover": round(total_traded / capital / years, 4) if years > 0 else None,
+        "trades": int(len(trade_returns)),
+        "open_positions": int(sum(shard["open_positions"] for shard in shards)),
+        "win_rate_pct": round(float((trade_returns > 0).mean()) * 100, 2) if len(trade_returns) else None,
+        "avg_trade_return_pct": round(float(trade_returns.mean()), 4) if len(trade_returns) else None,
+        "avg_positions": round(float(positions.mean()), 2) if len(positions) else 0.0,
+        "equity": pd.Series(equity, index=data.dates, name="equity"),
+        "per_ticker_pnl": dict(zip(data.names, pnl.sum(axis=0).round(2).tolist())),
+    }
+
+
+def run_backtest(data, rules=None, capital=DEFAULT_CAPITAL, position_size=None, fee_bps=0.0, execution_lag=1,
+                 workers=None, shard_size=DEFAULT_SHARD_SIZE, max_positions=None):
+    """
+    종목을 shard_size개씩 나눠 프로세스별로 시뮬레이션하고 결과를 합칩니다.
+    묶음이 하나이거나 프로세스가 하나면 현재 프로세스에서 실행합니다.
+    max_positions는 종목 전체에 걸친 제약이므로 지정하면 종목을 나누지 않습니다.
+
+    Args:
+        data (BacktestData): load_backtest_data 결과
+        rules (dict, optional): TRADING_RULES 중 바꿀 기준값
+        capital (float): 초기 자본
+        position_size (float, optional): 종목당 매수 금액 (기본값: capital × POSITION_FRACTION)
+        workers (int, optional): 프로세스 수 (기본값: CPU 수)
+
+    Returns:
+        dict: summarize 결과
+    """
+    position_size = position_size or capital * POSITION_FRACTION
+    width = data.shape[1]
+    if max_positions is not None:
+        shard_size = max(width, 1)
+    bounds = [(i, min(i + shard_size, width)) for i in range(0, width, shard_size)]
+    jobs = [(data.subset(slice(lo, hi)), rules, position_size, fee_bps, execution_lag, max_positions)
+            for lo, hi in bounds]
+
+    workers = min(workers or os.cpu_count() or 1, len(jobs))
+    if workers <= 1:
+        shards = [_simulate_shard(job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            shards = list(executor.map(_simulate_shard, jobs))
+    return summarize(data, shards, capital=capital)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="매수/매도 규칙 백테스트")
+    parser.add_argument("--start", required=True, help="시작일 (YYYY-MM-DD)")
+    parser.add_argument("--end", default=None, help="종료일 (기본값: 오늘)")
+    parser.add_argument("--capital", type=float, default=DEFAULT_CAPITAL, help="초기 자본")
+    parser.add_argument("--position-size", type=float, default=None, help="종목당 매수 금액 (기본값: 자본의 5%%)")
+    parser.add_argument("--fee-bps", type=float, default=0.0, help="체결 금액 대비 수수료 (bp)")
+    parser.add_argument("--lag", type=int, default=1, help="신호 후 체결까지 거래일 수")
+    parser.add_argument("--max-positions", type=int, default=None, help="동시 보유 종목 수 상한 (종합 점수 순 매수)")
+    parser.add_argument("--workers", type=int, default=None, help="프로세스 수")
+    parser.add_argument("--shard-size", type=int, default=DEFAULT_SHARD_SIZE, help="프로세스당 종목 수")
+    parser.add_argument("--recompute-indicators", action="store_true", help="indicator_history 대신 지표 재계산")
+    parser.add_argument("--output", default=None, help="자산 곡선 CSV 저장 경로")
+    args = parser.parse_args()
+
+    started = datetime.now()
+    data = load_backtest_data(args.start, args.end, recompute_indicators=args.recompute_indicators)
+    loaded = datetime.now()
+    result = run_backtest(data, capital=args.capital, position_size=args.position_size, fee_bps=args.fee_bps,
+                          execution_lag=args.lag, workers=args.workers, shard_size=args.shard_size,
+                          max_positions=args.max_positions)
+    finished = datetime.now()
+
+    equity = result.pop("equity")
+    per_ticker = result.pop("per_ticker_pnl")
+    for key, value in result.items():
+        print(f"{key}: {value}")
+    top = sorted(per_ticker.items(), key=lambda item: item[1], reverse=True)
+    print("종목별 손익 상위:", ", ".join(f"{name} {pnl:+.2f}" for name, pnl in top[:5]))
+    print("종목별 손익 하위:", ", ".join(f"{name} {pnl:+.2f}" for name, pnl in top[-5:]))
+    print(f"데이터 조회 {(loaded - started).total_seconds():.2f}초, 시뮬레이션 {(finished - loaded).total_seconds():.2f}초")
+    if args.output:
+        equity.to_csv(args.output, index_label=DATE_COLUMN)
+        print(f"자산 곡선 저장: {args.output}")
@@ -0,0 +1,160 @@
+"""
+매수 후보 결정 스냅샷
+
+매수 후보(AI 예측 + 기술적 지표 + 감성 결합, 종합 점수, 매수 근거)는 상위 테이블
+(stock_analysis_results, indicator_history, ticker_sentiment_analysis)이 바뀔 때만 달라지므로
+요청마다 다시 계산하지 않고 계산 결과를 스냅샷으로 보관합니다.
+
+- 조회(/recommended-stocks/with-technical-and-sentiment, 00:00 매수 작업)는 메모리의 스냅샷을 그대로 반환합니다.
+- 같은 프로세스에서 상위 테이블에 기록하면(쓰기 저널 → read_cache 무효화) 스냅샷을 오래된 것으로 표시하고
+  다음 조회 때 한 번만 다시 계산합니다. 파이프라인(generate-complete-analysis)은 끝에서 바로 다시 계산합니다.
+- 다른 프로세스의 기록(predict.py)은 알 수 없으므로 max_age가 지나면 다시 계산합니다.
+- 계산 결과는 buy_decisions 스냅샷 테이블(run_id 버전)에도 게시해 재시작한 프로세스가 다시 계산하지 않고 읽습니다.
+
+사용 예:
+    decision_snapshot.get()                 # {"message", "results", "snapshot": {...}}
+    decision_snapshot.materialize("pipeline")
+"""
+import json
+import threading
+from datetime import datetime, timedelta
+
+from app.db.read_cache import read_cache
+from app.db.snapshots import snapshot_store
+
+DECISION_TABLE = "buy_decisions"
+
+# 매수 후보 계산에 사용하는 테이블 (기록되면 스냅샷을 다시 계산)
+UPSTREAM_TABLES = ("stock_analysis_results", "indicator_history", "ticker_sentiment_analysis")
+
+# 다른 프로세스의 상위 테이블 기록을 반영하기 위한 최대 보관 시간
+MAX_AGE = timedelta(minutes=30)
+
+
+def _compute_buy_candidates():
+    from app.services.stock_recommendation_service import StockRecommendationService
+    return StockRecommendationService().compute_buy_candidates()
+
+
+class DecisionSnapshot:
+    """매수 후보 계산 결과를 보관하고 상위 테이블이 바뀐 경우에만 다시 계산하는 스냅샷"""
+
+    def __init__(self, compute=None, store=None, cache=None, max_age=MAX_AGE):
+        """
+        Args:
+            compute (callable, optional): {"message", "results"}를 반환하는 계산 함수
+                (기본값: StockRecommendationService.compute_buy_candidates)
+            store (SnapshotStore, optional): 게시할 스냅샷 저장소 (기본값: snapshot_store)
+            cache (ReadCache, optional): 상위 테이블 기록을 알려 주는 조회 캐시 (기본값: read_cache)
+            max_age (timedelta): 이 시간이 지나면 다시 계산
+        """
+        self.compute = compute or _compute_buy_candidates
+        self.store = store or snapshot_store
+        self.max_age = max_age
+        self._snapshot = None
+        self._stale_reason = None
+        self._lock = threading.Lock()
+        (cache or read_cache).add_listener(self._on_write)
+
+    def _on_write(self, table):
+        if table is None or table in UPSTREAM_TABLES:
+            self._stale_reason = f"{table or '전체'} 갱신"
+
+    def materialize(self, reason="요청"):
+        """매수 후보를 다시 계산해 메모리와 buy_decisions 테이블에 반영합니다."""
+        with self._lock:
+            return self._materialize(reason)
+
+    def _materialize(self, reason):
+        # 계산 중에 상위 테이블이 다시 기록되면 다음 조회에서 한 번 더 계산하도록 먼저 표시를 지움
+        self._stale_reason = None
+        started = datetime.now()
+        result = self.compute()
+        results = result.get("results", [])
+        generated_at = datetime.now().isoformat(timespec="seconds")
+        rows = [
+            {
+                "rank": rank,
+                "ticker": item.get("ticker"),
+                "stock_name": item.get("stock_name"),
+                "composite_score": item.get("composite_score"),
+                "buy_reason": item.get("buy_reason"),
+                "decision": item,
+                "generated_at": generated_at,
+            }
+            for rank, item in enumerate(results, start=1)
+        ]
+        run_id = None
+        try:
+            run_id = self.store.publish(DECISION_TABLE, rows)
+        except Exception as e:
+            # 게시에 실패해도 메모리 스냅샷은 사용 (다음 계산 때 다시 게시)
+            print(f"{DECISION_TABLE} 게시 실패: {str(e)}")
+        self._snapshot = {
+            "message": result.get("message"),
+            "results": results,
+            "run_id": run_id,
+            "generated_at": generated_at,
+            "reason": reason,
+        }
+        elapsed = (datetime.now() - started).total_seconds()
+        print(f"매수 후보 스냅샷 계산 ({reason}): {len(results)}개 후보, {elapsed:.2f}초")
+        return self._response(self._snapshot)
+
+    def _load(self):
+        """buy_decisions에 게시된 최신 스냅샷을 읽습니다. 없으면 None."""
+        pointer = self.store.pointer(DECISION_TABLE)
+        if not pointer:
+            return None
+        rows = self.store.query(DECISION_TABLE, ["rank", "decision", "generated_at"]).fetch()
+        rows.sort(key=lambda row: row["rank"])
+        results = [json.loads(row["decision"]) if isinstance(row["decision"], str) else row["decision"]
+                   for row in rows]
+        generated_at = rows[0]["generated_at"] if rows else pointer.get("published_at")
+        return {
+            "message": f"{len(results)}개의 매수 추천 주식을 찾았습니다" if results else "매수 추천 주식이 없습니다",
+            "results": results,
+            "run_id": pointer.get("run_id"),
+            "generated_at": generated_at,
+            "reason": "저장된 스냅샷",
+        }
+
+    def _expired(self, snapshot):
+        generated_at = snapshot.get("generated_at")
+        if not generated_at:
+            return True
+        return datetime.now() - datetime.fromisoformat(str(generated_at)) > self.max_age
+
+    @staticmethod
+    def _response(snapshot):
+        return {
+            "message": snapshot["message"],
+            "results": [dict(item) for item in snapshot["results"]],
+            "snapshot": {key: snapshot[key] for key in ("run_id", "generated_at", "reason")},
+        }
+
+    def get(self, refresh=False):
+        """
+        현재 매수 후보 스냅샷을 반환합니다.
+        refresh이거나, 스냅샷이 없거나, 상위 테이블이 기록되었거나, max_age가 지났을 때만 다시 계산합니다.
+        """
+        with self._lock:
+            if refresh:
+                return self._materialize("강제 갱신")
+            snapshot = self._snapshot
+            if snapshot is None:
+                try:
+                    snapshot = self._snapshot = self._load()
+                except Exception as e:
+                    print(f"{DECISION_TABLE} 조회 실패, 다시 계산합니다: {str(e)}")
+            if snapshot is None:
+                return self._materialize("스냅샷 없음")
+            if self._stale_reason:
+                return self._materialize(self._stale_reason)
+            if self._expired(snapshot):
+                return self._materialize("보관 시간 초과")
+            return self._response(snapshot)
+
+
+# 앱 전체에서 공유하는 매수 후보 스냅샷
+decision_snapshot = DecisionSnapshot()
@@ -0,0 +1,246 @@
+"""
+economic_and_stock_data 과거 데이터 병렬 백필
+
+전체 기간을 연 단위 구간으로 나눠 작업자 스레드에서 병렬로 수집하고,
+구간별로 기존 행과 비교해 배치 upsert로 기록합니다.
+
+- 재개 가능: 완료한 구간은 상태 파일에 기록되며 다시 실행하면 건너뜁니다.
+- 컬럼 범위 지정: 새 컬럼/지표를 추가했을 때 해당 컬럼만 수집해 NULL을 채울 수 있습니다.
+- 전진 채우기 여유 기간: 월/분기 지표가 구간 시작일에도 값을 갖도록 구간보다 앞선 기간부터 수집합니다.
+
+사용법:
+    python backfill.py --start 2006-01-01 --workers 4
+    python backfill.py --columns "GDP 성장률,애플" --state backfill_gdp.json
+    python backfill.py --rebuild-index
+"""
+import argparse
+import hashlib
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+import stock
+from app.db.journal import write_journal
+from app.services.economic_ingest import (
+    compute_null_fill_diff, fetch_rows_in_range, upsert_rows, update_last_value_index, rebuild_last_value_index
+)
+from app.utils.telemetry import collection_telemetry
+
+DEFAULT_START_DATE = "2006-01-01"
+DEFAULT_STATE_PATH = "backfill_state.json"
+DEFAULT_WORKERS = 4
+
+# 쓰기 저널 작업 이름 (구간 기록 중 종료되면 다음 실행 시작 시 남은 배치부터 반영)
+BACKFILL_JOB = "economic_backfill"
+
+# 분기 지표(GDP 등)의 이전 관측값이 구간 시작일에 닿도록 앞당겨 수집하는 일수
+LOOKBACK_MARGIN_DAYS = 120
+
+
+def split_yearly_chunks(start_date, end_date):
+    """
+    기간을 연 단위 (시작일, 종료일) 구간 목록으로 나눕니다.
+
+    예: 2023-06-01 ~ 2025-02-10 → [(2023-06-01, 2023-12-31), (2024-01-01, 2024-12-31), (2025-01-01, 2025-02-10)]
+    """
+    start = pd.Timestamp(start_date)
+    end = pd.Timestamp(end_date)
+    chunks = []
+    while start <= end:
+        chunk_end = min(pd.Timestamp(year=start.year, month=12, day=31), end)
+        chunks.append((start.strftime('%Y-%m-%d'), chunk_end.strftime('%Y-%m-%d')))
+        start = chunk_end + pd.Timedelta(days=1)
+    return chunks
+
+
+def _columns_signature(columns):
+    """컬럼 범위별로 상태를 구분하기 위한 짧은 서명"""
+    if columns is None:
+        return "all"
+    joined = "|".join(sorted(columns))
+    return hashlib.sha1(joined.encode("utf-8")).hexdigest()[:8]
+
+
+def _load_state(state_path):
+    if state_path and os.path.exists(state_path):
+        with open(state_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    return {"chunks": {}}
+
+
+def _save_state(state, state_path):
+    """상태 파일을 임시 파일에 쓴 뒤 교체해 중간에 중단돼도 깨지지 않게 합니다."""
+    if not state_path:
+        return
+    tmp_path = f"{state_path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(state, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, state_path)
+
+
+def collect_chunk(chunk_start, chunk_end, columns=None, lookback_days=LOOKBACK_MARGIN_DAYS, run_id=None):
+    """
+    구간 하나를 수집해 달력일 기준으로 전진 채운 데이터프레임을 반환합니다 (작업자 스레드에서 실행).
+
+    구간 시작일보다 lookback_days만큼 앞선 기간부터 수집해, 구간 첫날에도 이전 관측값이 채워지게 합니다.
+    run_id를 지정하면 요청 텔레메트리를 그 수집 실행에 기록합니다 (작업자 스레드는 호출자의 현재 실행을 모름).
+
+    Returns:
+        pd.DataFrame | None: chunk_start ~ chunk_end 달력일 인덱스의 데이터프레임
+    """
+    margin_start = (pd.Timestamp(chunk_start) - pd.Timedelta(days=lookback_days)).strftime('%Y-%m-%d')
+    with collection_telemetry.bind(run_id):
+        frame = stock.collect_series_frame(margin_start, chunk_end, columns=columns)
+    if frame is None or frame.empty:
+        return None
+    calendar = pd.date_range(margin_start, chunk_end)
+    return frame.reindex(calendar).ffill().loc[chunk_start:chunk_end]
+
+
+def write_chunk(frame, chunk_start, chunk_end):
+    """
+    구간 데이터를 기존 행과 비교해 새 행과 NULL 채움만 배치 upsert 합니다.
+
+    Returns:
+        dict: 삽입/갱신/기록 행 수와 변경 셀 수
+    """
+    existing_rows = fetch_rows_in_range(chunk_start, chunk_end)
+    diff = compute_null_fill_diff(frame, pd.date_range(chunk_start, chunk_end), {}, existing_rows)
+    written = upsert_rows(diff["rows"], job=BACKFILL_JOB)
+    update_last_value_index(diff["last_values"])
+    return {
+        "inserted": diff["inserted"],
+        "updated": diff["updated"],
+        "written": written,
+        "changed_cells": len(diff["changed_cells"]),
+    }
+
+
+def run_backfill(start_date=DEFAULT_START_DATE, end_date=None, columns=None, workers=DEFAULT_WORKERS,
+                 state_path=DEFAULT_STATE_PATH, lookback_days=LOOKBACK_MARGIN_DAYS, force=False, progress=None):
+    """
+    기간 전체를 연 단위로 병렬 수집하고 구간별로 기록합니다.
+
+    Args:
+        start_date (str): 시작일 (YYYY-MM-DD)
+        end_date (str, optional): 종료일. 기본값은 어제 (오늘 데이터는 저장하지 않음)
+        columns (list, optional): 수집할 컬럼명(한글 이름). 생략하면 전체 지표
+        workers (int): 동시에 수집할 구간 수 (요청 속도는 제공자별 속도 제한기가 공유해서 조절)
+        state_path (str, optional): 재개용 상태 파일 경로. None이면 상태를 기록하지 않음
+        lookback_days (int): 전진 채우기 여유 기간(일)
+        force (bool): 완료 기록이 있는 구간도 다시 수집
+        progress (callable, optional): 구간 처리마다 호출하는 진행 상황 콜백 progress(stage, message, done, total)
+
+    Returns:
+        dict: 백필 결과 요약
+    """
+    if end_date is None:
+        end_date = (datetime.now() - timedelta(days=1)).strftime('%Y-%m-%d')
+    if columns is not None:
+        columns = list(columns)
+
+    write_journal.recover(BACKFILL_JOB)
+
+    signature = _columns_signature(columns)
+    state = _load_state(state_path)
+    chunks = split_yearly_chunks(start_date, end_date)
+
+    pending = []
+    for chunk_start, chunk_end in chunks:
+        key = f"{chunk_start}~{chunk_end}#{signature}"
+        if not force and state["chunks"].get(key, {}).get("status") == "done":
+            print(f"백필 구간 {chunk_start} ~ {chunk_end}: 이미 완료됨, 건너뜀")
+            continue
+        pending.append((key, chunk_start, chunk_end))
+
+    scope = "전체 컬럼" if columns is None else f"{len(columns)}개 컬럼"
+    print(f"백필 시작: {start_date} ~ {end_date}, {scope}, 구간 {len(chunks)}개 중 {len(pending)}개 처리 (작업자 {workers}개)")
+
+    if progress:
+        progress(stage="백필", message=f"{start_date} ~ {end_date}", done=0, total=len(pending))
+
+    run_id = collection_telemetry.start_run("backfill")
+    results = {}
+    failed = []
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        futures = {
+            executor.submit(collect_chunk, chunk_start, chunk_end, columns, lookback_days, run_id):
+                (key, chunk_start, chunk_end)
+            for key, chunk_start, chunk_end in pending
+        }
+        # 수집이 끝난 구간부터 기록 (구간마다 여유 기간을 포함해 수집하므로 기록 순서와 무관)
+        for future in as_completed(futures):
+            key, chunk_start, chunk_end = futures[future]
+            try:
+                frame = future.result()
+                if frame is None:
+                    print(f"백필 구간 {chunk_start} ~ {chunk_end}: 수집된 데이터 없음")
+                    result = {"inserted": 0, "updated": 0, "written": 0, "changed_cells": 0}
+                else:
+                    result = write_chunk(frame, chunk_start, chunk_end)
+                    print(f"백필 구간 {chunk_start} ~ {chunk_end}: 신규 {result['inserted']}개, "
+                          f"NULL 채움 {result['updated']}개, 변경 셀 {result['changed_cells']}개")
+            except Exception as e:
+                print(f"백필 구간 {chunk_start} ~ {chunk_end} 처리 중 오류: {str(e)}")
+                failed.append(f"{chunk_start} ~ {chunk_end}")
+                state["chunks"][key] = {"status": "failed", "error": str(e),
+                                        "updated_at": datetime.now().isoformat(timespec="seconds")}
+                _save_state(state, state_path)
+            else:
+                results[key] = result
+                state["chunks"][key] = {"status": "done", **result,
+                                        "updated_at": datetime.now().isoformat(timespec="seconds")}
+                _save_state(state, state_path)
+
+            if progress:
+                progress(message=f"구간 {chunk_start} ~ {chunk_end} 처리", done=len(results) + len(failed))
+
+    stock._print_telemetry_summary(collection_telemetry.finish_run(run_id))
+
+    written = sum(r["written"] for r in results.values())
+    print(f"백필 완료: {len(results)}개 구간, {written}개 행 기록, 실패 {len(failed)}개 구간")
+    return {
+        "success": not failed,
+        "message": "백필 완료" if not failed else f"백필 일부 실패: {', '.join(failed)}",
+        "total_records": len(pd.date_range(start_date, end_date)),
+        "updated_records": written,
+        "chunks": len(chunks),
+        "skipped_chunks": len(chunks) - len(pending),
+        "failed_chunks": failed,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="economic_and_stock_data 과거 데이터 병렬 백필")
+    parser.add_argument("--start", default=DEFAULT_START_DATE, help="시작일 (YYYY-MM-DD)")
+    parser.add_argument("--end", default=None, help="종료일 (YYYY-MM-DD, 기본값: 어제)")
+    parser.add_argument("--columns", default=None, help="쉼표로 구분한 컬럼명 (예: \"GDP 성장률,애플\")")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="동시에 수집할 구간 수")
+    parser.add_argument("--state", default=DEFAULT_STATE_PATH, help="재개용 상태 파일 경로")
+    parser.add_argument("--lookback-days", type=int, default=LOOKBACK_MARGIN_DAYS, help="전진 채우기 여유 기간(일)")
+    parser.add_argument("--force", action="store_true", help="완료된 구간도 다시 수집")
+    parser.add_argument("--rebuild-index", action="store_true",
+                        help="수집하지 않고 컬럼별 마지막 유효값 인덱스만 다시 만듦")
+    args = parser.parse_args()
+
+    if args.rebuild_index:
+        rebuild_last_value_index()
+        return
+
+    columns = [c.strip() for c in args.columns.split(",") if c.strip()] if args.columns else None
+    run_backfill(
+        start_date=args.start,
+        end_date=args.end,
+        columns=columns,
+        workers=args.workers,
+        state_path=args.state,
+        lookback_days=args.lookback_days,
+        force=args.force,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,417 @@
+"""
+economic_and_stock_data 테이블 일괄 적재 유틸리티
+
+날짜마다 조회/삽입/수정을 반복하지 않고,
+기간 전체의 기존 행을 한 번에 읽어 메모리에서 삽입 행과 NULL 채움 행을 계산한 뒤
+배치 단위 upsert로 기록합니다. 배치는 로컬 쓰기 저널(app.db.journal)에 먼저 기록한 뒤 반영하므로
+중간에 종료돼도 다음 실행에서 남은 배치부터 이어서 반영됩니다.
+
+컬럼별 마지막 유효값 인덱스(economic_series_last_value)를 함께 유지해
+전진 채우기 시작값과 시리즈별 최신 여부를 이력 전체를 읽지 않고 한 번의 조회로 얻습니다.
+"""
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+from app.db.supabase import supabase
+from app.db.journal import write_journal
+
+TABLE_NAME = "economic_and_stock_data"
+DATE_COLUMN = "날짜"
+
+# 컬럼별 마지막 유효값 인덱스 테이블 (column_name, last_valid_date, last_value, last_observed_date)
+LAST_VALUE_TABLE = "economic_series_last_value"
+
+# Supabase(PostgREST) 기본 최대 조회 행 수
+PAGE_SIZE = 1000
+# upsert 요청 하나에 담을 행 수
+UPSERT_BATCH_SIZE = 500
+
+# 쓰기 저널 작업 이름
+INGEST_JOB = "economic_ingest"
+
+# 주가 관련 컬럼 목록 (DDL 순서)
+STOCK_COLUMNS = [
+    "나스닥 종합지수", "S&P 500 지수", "금 가격", "달러 인덱스", "나스닥 100", 
+    "S&P 500 ETF", "QQQ ETF", "러셀 2000 ETF", "다우 존스 ETF", "VIX 지수", 
+    "닛케이 225", "상해종합", "항셍", "영국 FTSE", "독일 DAX", "프랑스 CAC 40", 
+    "미국 전체 채권시장 ETF", "TIPS ETF", "투자등급 회사채 ETF", "달러/엔", "달러/위안",
+    "미국 리츠 ETF", "애플", "마이크로소프트", "아마존", "구글 A", "구글 C", "메타", 
+    "테슬라", "엔비디아", "코스트코", "넷플릭스", "페이팔", "인텔", "시스코", "컴캐스트", 
+    "펩시코", "암젠", "허니웰 인터내셔널", "스타벅스", "몬델리즈", "마이크론", "브로드컴", 
+    "어도비", "텍사스 인스트루먼트", "AMD", "어플라이드 머티리얼즈"
+]
+
+# 경제 지표 컬럼 목록 (DDL 순서)
+ECONOMIC_COLUMNS = [
+    "10년 기대 인플레이션율", "장단기 금리차", "기준금리", "미시간대 소비자 심리지수", 
+    "실업률", "2년 만기 미국 국채 수익률", "10년 만기 미국 국채 수익률", "금융스트레스지수", 
+    "개인 소비 지출", "소비자 물가지수", "5년 변동금리 모기지", "미국 달러 환율", 
+    "통화 공급량 M2", "가계 부채 비율", "GDP 성장률"
+]
+
+# 테이블의 데이터 컬럼 전체 (날짜 제외, DDL 순서)
+DATA_COLUMNS = ECONOMIC_COLUMNS + STOCK_COLUMNS
+
+
+def fetch_rows_in_range(start_date, end_date, columns="*"):
+    """
+    기간 내 기존 행을 한 번의 범위 조회로 가져옵니다 (PAGE_SIZE 단위 페이지 조회).
+
+    Args:
+        start_date (str): 시작일 (YYYY-MM-DD)
+        end_date (str): 종료일 (YYYY-MM-DD)
+        columns (str): 조회할 컬럼 (기본값: 전체)
+
+    Returns:
+        dict: 날짜 문자열 → 행 딕셔너리
+    """
+    rows = {}
+    offset = 0
+    while True:
+        response = supabase.table(TABLE_NAME).select(columns) \
+            .gte(DATE_COLUMN, start_date).lte(DATE_COLUMN, end_date) \
+            .order(DATE_COLUMN).range(offset, offset + PAGE_SIZE - 1).execute()
+        page = response.data or []
+        for row in page:
+            rows[str(row[DATE_COLUMN])[:10]] = row
+        if len(page) < PAGE_SIZE:
+            break
+        offset += PAGE_SIZE
+    return rows
+
+
+def fetch_row_before(date_str):
+    """date_str 이전의 가장 최근 행을 반환합니다. 없으면 빈 딕셔너리."""
+    response = supabase.table(TABLE_NAME).select("*") \
+        .lt(DATE_COLUMN, date_str).order(DATE_COLUMN, desc=True).limit(1).execute()
+    return response.data[0] if response.data else {}
+
+
+def fetch_previous_values(date_str):
+    """
+    date_str 이전의 컬럼별 마지막 유효값을 반환합니다 (전진 채우기 시작값).
+
+    마지막 유효값 인덱스에서 한 번에 조회하고, 인덱스가 비어 있거나 date_str 이후 값이 들어 있는 컬럼이 있거나
+    (과거 구간 재수집 등) 인덱스의 최신 날짜가 직전 날짜가 아니면(기록 후 인덱스 갱신 전 종료 등)
+    직전 행 조회로 대체합니다.
+
+    Returns:
+        dict: 컬럼명 → 값
+    """
+    index = fetch_last_values()
+    if index:
+        latest = max(entry["last_valid_date"] for entry in index.values())
+        day_before = (pd.Timestamp(date_str) - pd.Timedelta(days=1)).strftime('%Y-%m-%d')
+        if latest == day_before:
+            return {column: entry["last_value"] for column, entry in index.items()}
+    return fetch_row_before(date_str)
+
+
+def fetch_last_values():
+    """
+    마지막 유효값 인덱스 전체를 조회합니다. 테이블이 없으면 빈 딕셔너리.
+
+    Returns:
+        dict: 컬럼명 → {"last_valid_date", "last_value", "last_observed_date"}
+    """
+    try:
+        response = supabase.table(LAST_VALUE_TABLE) \
+            .select("column_name,last_valid_date,last_value,last_observed_date").execute()
+    except Exception as e:
+        print(f"{LAST_VALUE_TABLE} 조회 실패: {str(e)}")
+        return {}
+    index = {}
+    for row in response.data or []:
+        if row.get("last_valid_date") is None:
+            continue
+        index[row["column_name"]] = {
+            "last_valid_date": str(row["last_valid_date"])[:10],
+            "last_value": row.get("last_value"),
+            "last_observed_date": str(row["last_observed_date"])[:10] if row.get("last_observed_date") else None,
+        }
+    return index
+
+
+def _last_valid_entries(matrix, date_strs, columns, observed=None):
+    """
+    날짜 × 컬럼 행렬에서 컬럼별 마지막 유효값의 (날짜, 값)을 찾습니다.
+
+    Args:
+        matrix (np.ndarray): 저장된 값 행렬 (NaN = 값 없음)
+        date_strs: 행 순서의 날짜 문자열
+        columns (list): 컬럼 순서
+        observed (np.ndarray, optional): 실제로 수집된(전진 채우기 전) 셀 마스크
+
+    Returns:
+        dict: 컬럼명 → {"last_valid_date", "last_value", "last_observed_date"}
+    """
+    entries = {}
+    if len(matrix) == 0:
+        return entries
+    valid = ~np.isnan(matrix)
+    # 뒤집은 행렬의 첫 유효 위치 = 마지막 유효 행
+    last_rows = len(matrix) - 1 - np.argmax(valid[::-1], axis=0)
+    has_value = valid.any(axis=0)
+    if observed is not None:
+        last_observed_rows = len(observed) - 1 - np.argmax(observed[::-1], axis=0)
+        has_observed = observed.any(axis=0)
+    for c in np.flatnonzero(has_value).tolist():
+        r = int(last_rows[c])
+        entries[columns[c]] = {
+            "last_valid_date": date_strs[r],
+            "last_value": float(matrix[r, c]),
+            "last_observed_date": date_strs[int(last_observed_rows[c])] if observed is not None and has_observed[c] else None,
+        }
+    return entries
+
+
+def update_last_value_index(entries, replace=False):
+    """
+    컬럼별 마지막 유효값 인덱스를 갱신합니다.
+    기존 항목보다 날짜가 같거나 최신인 값만 반영하므로 과거 구간을 기록해도 인덱스가 뒤로 가지 않습니다.
+
+    Args:
+        entries (dict): 컬럼명 → {"last_valid_date", "last_value", "last_observed_date"}
+        replace (bool): 기존 항목과 비교하지 않고 그대로 덮어씀 (인덱스 재구축용)
+
+    Returns:
+        int: 갱신한 컬럼 수
+    """
+    if not entries:
+        return 0
+    current = {} if replace else fetch_last_values()
+    now = datetime.now().isoformat(timespec="seconds")
+    rows = []
+    for column, entry in entries.items():
+        existing = current.get(column)
+        observed = [d for d in (entry.get("last_observed_date"), (existing or {}).get("last_observed_date")) if d]
+        if existing and existing["last_valid_date"] > entry["last_valid_date"]:
+            # 값은 기존 항목 유지, 관측일만 더 최신이면 반영
+            if not observed or max(observed) == existing.get("last_observed_date"):
+                continue
+            entry = existing
+        rows.append({
+            "column_name": column,
+            "last_valid_date": entry["last_valid_date"],
+            "last_value": entry["last_value"],
+            "last_observed_date": max(observed) if observed else None,
+            "updated_at": now,
+        })
+    if rows:
+        supabase.table(LAST_VALUE_TABLE).upsert(rows, on_conflict="column_name").execute()
+    return len(rows)
+
+
+def rebuild_last_value_index():
+    """
+    economic_and_stock_data 전체를 한 번 읽어 마지막 유효값 인덱스를 다시 만듭니다.
+    (인덱스 도입 전 데이터나 수동 수정 후 사용, 실제 관측일은 알 수 없으므로 기존 기록을 유지)
+
+    Returns:
+        int: 인덱스에 기록한 컬럼 수
+    """
+    rows = fetch_rows_in_range("0001-01-01", "9999-12-31")
+    if not rows:
+        return 0
+    date_strs = sorted(rows)
+    columns = sorted({col for row in rows.values() for col in row if col != DATE_COLUMN})
+    matrix = _rows_to_matrix([rows[d] for d in date_strs], columns)
+    entries = _last_valid_entries(matrix, date_strs, columns)
+    previous = fetch_last_values()
+    for column, entry in entries.items():
+        entry["last_observed_date"] = (previous.get(column) or {}).get("last_observed_date")
+    written = update_last_value_index(entries, replace=True)
+    print(f"{LAST_VALUE_TABLE} 재구축: {len(date_strs)}개 행에서 {written}개 컬럼 기록")
+    return written
+
+
+def _to_float64(values):
+    """
+    수집 행렬을 float64로 변환합니다.
+    float32는 문자열을 거쳐 변환해 1.2300000190734863 같은 오차가 DB에 기록되지 않게 합니다.
+    """
+    values = np.asarray(values)
+    if values.dtype == np.float32:
+        return values.astype(str).astype(np.float64)
+    return values.astype(np.float64)
+
+
+def _rows_to_matrix(rows, columns):
+    """행 딕셔너리 목록을 columns 순서의 float64 행렬로 변환합니다 (None/숫자 아님 → NaN)."""
+    if not rows:
+        return np.empty((0, len(columns)), dtype=np.float64)
+    frame = pd.DataFrame.from_records(rows, columns=columns)
+    return frame.apply(pd.to_numeric, errors='coerce').to_numpy(dtype=np.float64)
+
+
+def compute_null_fill_diff(new_data, dates, previous_data, existing_rows):
+    """
+    수집 데이터와 기존 행을 배열로 정렬해 기록할 셀을 벡터 연산으로 계산합니다.
+
+    - 수집 값은 기간 시작 전 마지막 행(previous_data)부터 한 번의 전진 채우기로 이어 붙입니다.
+      (휴장일 등 수집 값이 없는 날짜는 이전 날짜 값으로 채워짐)
+    - 기존 행이 없는 날짜: 채워진 값 전체를 새 행으로 삽입
+    - 기존 행이 있는 날짜: 기존 값이 NULL이고 새 값이 있는 셀만 갱신 (NULL 채움 마스크)
+
+    Args:
+        new_data (pd.DataFrame): 날짜 인덱스의 수집 데이터
+        dates (pd.DatetimeIndex): 처리할 날짜
+        previous_data (dict): 기간 시작 전 마지막 행
+        existing_rows (dict): 날짜 문자열 → 기존 행
+
+    Returns:
+        dict:
+            rows: upsert할 행 목록 (갱신 행은 기존 값과 합친 전체 행)
+            inserted / updated: 삽입/갱신 행 수
+            changed_cells: 변경된 셀 (날짜, 컬럼, 값) 목록
+            last_values: 기록 후 기간 내 컬럼별 마지막 유효값 (update_last_value_index 입력)
+    """
+    dates = pd.DatetimeIndex(dates)
+    date_strs = dates.strftime('%Y-%m-%d')
+
+    columns = list(new_data.columns)
+    known = set(columns)
+    columns += [col for col in previous_data if col != DATE_COLUMN and col not in known]
+
+    # (1 + 날짜 수) × 컬럼 행렬: 0행은 이전 데이터, 나머지는 날짜별 수집 값
+    stacked = np.full((len(dates) + 1, len(columns)), np.nan, dtype=np.float64)
+    stacked[0] = _rows_to_matrix([previous_data], columns)[0] if previous_data else np.nan
+    new_values = _to_float64(new_data.reindex(index=dates).to_numpy())
+    stacked[1:, :new_values.shape[1]] = new_values
+    stacked[~np.isfinite(stacked)] = np.nan
+
+    # 전진 채우기: 각 셀에서 마지막 유효값의 행 위치를 누적 최대값으로 찾음
+    positions = np.where(np.isnan(stacked), 0, np.arange(len(stacked))[:, None])
+    np.maximum.accumulate(positions, axis=0, out=positions)
+    filled = np.take_along_axis(stacked, positions, axis=0)[1:]
+    has_value = ~np.isnan(filled)
+
+    # 기존 행 정렬 및 NULL 채움 마스크
+    exists = np.array([date_str in existing_rows for date_str in date_strs], dtype=bool)
+    existing_matrix = np.full_like(filled, np.nan)
+    if exists.any():
+        existing_matrix[exists] = _rows_to_matrix([existing_rows[d] for d in date_strs[exists]], columns)
+    update_mask = has_value & np.isnan(existing_matrix) & exists[:, None]
+    insert_mask = has_value & ~exists[:, None]
+    changed_mask = update_mask | insert_mask
+
+    # 기록 후 저장될 값: 기존 값이 있으면 기존 값, 없으면 기록하는 값
+    stored = np.where(np.isnan(existing_matrix), np.where(changed_mask, filled, np.nan), existing_matrix)
+    last_values = _last_valid_entries(stored, date_strs, columns, observed=~np.isnan(stacked[1:]))
+
+    update_rows = np.flatnonzero(update_mask.any(axis=1))
+    insert_rows = np.flatnonzero(~exists)
+
+    # 변경 셀 목록 (행 우선 순서)
+    row_idx, col_idx = np.nonzero(changed_mask)
+    values = filled[row_idx, col_idx].tolist()
+    changed_cells = [(date_strs[r], columns[c], v) for r, c, v in zip(row_idx.tolist(), col_idx.tolist(), values)]
+
+    # 날짜별 변경 셀을 행 딕셔너리로 조립
+    cells_by_row = {}
+    for r, c, v in zip(row_idx.tolist(), col_idx.tolist(), values):
+        cells_by_row.setdefault(r, {})[columns[c]] = v
+
+    rows = []
+    for r in sorted(set(update_rows.tolist()) | set(insert_rows.tolist())):
+        date_str = date_strs[r]
+        row = dict(existing_rows[date_str]) if exists[r] else {}
+        row[DATE_COLUMN] = date_str
+        row.update(cells_by_row.get(r, {}))
+        rows.append(row)
+
+    return {
+        "rows": rows,
+        "inserted": len(insert_rows),
+        "updated": len(update_rows),
+        "changed_cells": changed_cells,
+        "last_values": last_values,
+    }
+
+
+def frame_to_rows(frame, columns=None):
+    """
+    날짜 인덱스(또는 날짜 컬럼)의 수집 데이터프레임을 upsert할 행 목록으로 변환합니다.
+    셀 단위 검사 없이 전체를 float64 행렬로 바꾼 뒤 NaN/inf 마스크로 한 번에 None 처리합니다.
+
+    Args:
+        frame (pd.DataFrame): 날짜 인덱스 또는 DATE_COLUMN/date 컬럼을 가진 데이터프레임
+        columns (list, optional): 기록할 컬럼 (없는 컬럼은 None). 기본값: 프레임의 모든 컬럼
+
+    Returns:
+        list: 행 딕셔너리 목록
+    """
+    if frame is None or frame.empty:
+        return []
+    for date_col in (DATE_COLUMN, "date"):
+        if date_col in frame.columns:
+            frame = frame.set_index(date_col)
+            break
+    dates = pd.to_datetime(frame.index).strftime('%Y-%m-%d')
+    columns = list(frame.columns) if columns is None else list(columns)
+    numeric = frame.reindex(columns=columns).apply(pd.to_numeric, errors='coerce')
+    # float32 컬럼은 다른 컬럼과 합쳐 float64로 바뀌기 전에 문자열을 거쳐 변환 (_to_float64와 같은 이유)
+    float32_columns = numeric.columns[(numeric.dtypes == np.float32).to_numpy()]
+    if len(float32_columns):
+        numeric[float32_columns] = numeric[float32_columns].astype(str).astype(np.float64)
+    values = numeric.to_numpy(dtype=np.float64)
+    cells = values.astype(object)
+    cells[~np.isfinite(values)] = None
+    return [{DATE_COLUMN: date_str, **dict(zip(columns, row))} for date_str, row in zip(dates, cells.tolist())]
+
+
+def upsert_frame(frame, columns=None, batch_size=UPSERT_BATCH_SIZE, job=INGEST_JOB):
+    """
+    데이터프레임 전체를 날짜 기준으로 배치 upsert 하고 마지막 유효값 인덱스를 갱신합니다.
+    (기존 값과 비교하지 않고 덮어쓰는 경로, NULL 채움은 compute_null_fill_diff 사용)
+
+    Returns:
+        int: 기록한 행 수
+    """
+    rows = frame_to_rows(frame, columns)
+    written = upsert_rows(rows, batch_size=batch_size, job=job)
+    if rows:
+        row_columns = [col for col in rows[0] if col != DATE_COLUMN]
+        matrix = _rows_to_matrix(rows, row_columns)
+        update_last_value_index(_last_valid_entries(matrix, [row[DATE_COLUMN] for row in rows], row_columns))
+    return written
+
+
+def upsert_rows(rows, batch_size=UPSERT_BATCH_SIZE, job=INGEST_JOB):
+    """
+    행 목록을 날짜 기준으로 배치 upsert 합니다.
+
+    PostgREST의 일괄 upsert는 모든 행이 같은 컬럼을 가져야 하므로
+    전체 컬럼 합집합으로 맞추고 없는 값은 None으로 채웁니다.
+    배치 목록은 쓰기 저널에 먼저 기록하고, 배치를 반영할 때마다 완료를 기록합니다.
+
+    Args:
+        rows (list): 기록할 행 목록
+        batch_size (int): upsert 요청 하나에 담을 행 수
+        job (str): 쓰기 저널 작업 이름
+
+    Returns:
+        int: 기록한 행 수
+    """
+    if not rows:
+        return 0
+
+    columns = []
+    seen = set()
+    for row in rows:
+        for col_name in row:
+            if col_name not in seen:
+                seen.add(col_name)
+                columns.append(col_name)
+
+    operations = [
+        {
+            "op": "upsert",
+            "table": TABLE_NAME,
+            "on_conflict": DATE_COLUMN,
+            "rows": [{col_name: row.get(col_name) for col_name in columns} for row in rows[i:i + batch_size]],
+        }
+        for i in range(0, len(rows), batch_size)
+    ]
+    return write_journal.execute(job, operations)
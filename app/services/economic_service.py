@@ -3,6 +3,14 @@ from app.db.supabase import supabase
 # stock.py는 아직 모듈로 옮기지 않았으므로 기존 임포트 유지
 from stock import collect_economic_data
 import stock
+from app.services.economic_ingest import (
+    TABLE_NAME, DATE_COLUMN, INGEST_JOB, STOCK_COLUMNS, fetch_previous_values, fetch_rows_in_range, fetch_last_values,
+    compute_null_fill_diff, upsert_rows, update_last_value_index
+)
+from app.db.queries import TableQuery
+from app.db.journal import write_journal
+from app.services.economic_backfill import run_backfill
+from app.utils.background_jobs import JobWorker
 import numpy as np
 from datetime import datetime, timedelta
 import pytz
@@ -33,6 +41,39 @@ def get_last_updated_date():
         # 오류 발생 시 기본 시작 날짜 반환
         return "2006-01-01"
 
+def get_data_freshness():
+    """
+    economic_and_stock_data의 최신 날짜를 기대 날짜(어제, 오늘 데이터는 저장하지 않음)와 비교합니다.
+
+    시리즈별 최신 여부는 마지막 유효값 인덱스에서 조회합니다 (이력 전체를 읽지 않음).
+
+    Returns:
+        dict: last_date, expected_date, lag_days(지연 일수), fresh(최신 여부),
+              series(컬럼별 마지막 유효일/실제 관측일/관측 지연 일수)
+    """
+    row = TableQuery(TABLE_NAME, [DATE_COLUMN]).order_by(DATE_COLUMN, desc=True).fetch_one()
+    last_date = str(row[DATE_COLUMN])[:10] if row and row.get(DATE_COLUMN) else None
+    expected_date = (datetime.now() - timedelta(days=1)).strftime('%Y-%m-%d')
+    lag_days = None
+    if last_date:
+        lag_days = (datetime.strptime(expected_date, '%Y-%m-%d') - datetime.strptime(last_date, '%Y-%m-%d')).days
+    expected = datetime.strptime(expected_date, '%Y-%m-%d')
+    series = {}
+    for column, entry in fetch_last_values().items():
+        observed = entry["last_observed_date"]
+        series[column] = {
+            "last_valid_date": entry["last_valid_date"],
+            "last_observed_date": observed,
+            "observed_lag_days": (expected - datetime.strptime(observed, '%Y-%m-%d')).days if observed else None,
+        }
+    return {
+        "last_date": last_date,
+        "expected_date": expected_date,
+        "lag_days": lag_days,
+        "fresh": lag_days is not None and lag_days <= 0,
+        "series": series,
+    }
+
 def get_existing_data_with_nulls():
     """
     NULL 값이 있는 기존 데이터를 조회합니다.
@@ -54,33 +95,37 @@ def get_existing_data_with_nulls():
         print(f"NULL 값 데이터 조회 중 오류 발생: {str(e)}")
         return pd.DataFrame()
 
-# 주가 관련 컬럼 목록 정의
-stock_columns = [
-    "나스닥 종합지수", "S&P 500 지수", "금 가격", "달러 인덱스", "나스닥 100", 
-    "S&P 500 ETF", "QQQ ETF", "러셀 2000 ETF", "다우 존스 ETF", "VIX 지수", 
-    "닛케이 225", "상해종합", "항셍", "영국 FTSE", "독일 DAX", "프랑스 CAC 40", 
-    "미국 전체 채권시장 ETF", "TIPS ETF", "투자등급 회사채 ETF", "달러/엔", "달러/위안",
-    "미국 리츠 ETF", "애플", "마이크로소프트", "아마존", "구글 A", "구글 C", "메타", 
-    "테슬라", "엔비디아", "코스트코", "넷플릭스", "페이팔", "인텔", "시스코", "컴캐스트", 
-    "펩시코", "암젠", "허니웰 인터내셔널", "스타벅스", "몬델리즈", "마이크론", "브로드컴", 
-    "어도비", "텍사스 인스트루먼트", "AMD", "어플라이드 머티리얼즈"
-]
+# 이 일수보다 긴 수집 기간은 연 단위 병렬 백필로 처리
+BACKFILL_THRESHOLD_DAYS = 365
+
+# 경제 데이터 수집 전용 작업자 스레드 (수집이 이벤트 루프와 API 요청을 막지 않도록 분리)
+economic_ingest_worker = JobWorker("economic-ingest")
 
-# 경제 지표 컬럼 목록 정의
-economic_columns = [
-    "10년 기대 인플레이션율", "장단기 금리차", "기준금리", "미시간대 소비자 심리지수", 
-    "실업률", "2년 만기 미국 국채 수익률", "10년 만기 미국 국채 수익률", "금융스트레스지수", 
-    "개인 소비 지출", "소비자 물가지수", "5년 변동금리 모기지", "미국 달러 환율", 
-    "통화 공급량 M2", "가계 부채 비율", "GDP 성장률"
-]
+def _no_progress(stage=None, message=None, done=None, total=None):
+    pass
 
-async def update_economic_data_in_background():
+def submit_economic_data_update():
     """
-    백그라운드에서 경제 지표 데이터를 업데이트
+    경제 데이터 업데이트를 작업자 스레드에 제출하고 작업 핸들을 반환합니다.
+    이미 실행 중이면 실행 중인 작업의 핸들을 반환합니다.
     """
+    return economic_ingest_worker.submit(run_economic_data_update)
+
+def run_economic_data_update(progress=None):
+    """
+    경제 지표 및 주가 데이터 업데이트 (블로킹, 작업자 스레드에서 실행)
+
+    Args:
+        progress (callable, optional): 진행 상황 콜백 progress(stage, message, done, total)
+    """
+    progress = progress or _no_progress
     try:
         print("경제 지표 및 주가 데이터 업데이트 작업 시작...")
         
+        # 이전 실행이 기록 중 종료됐다면 남은 배치부터 반영 (마지막 수집 날짜 조회 전에 복구)
+        progress(stage="복구", message="쓰기 저널 확인")
+        write_journal.recover(INGEST_JOB)
+        
         # 주석처리 시작: 즉시 수집하는 경우
         # # 미국 장 마감 여부 확인 (서머타임 여부와 관계없이 22:30~06:00는 미국 장 시간으로 처리)
         # now = datetime.now()
@@ -105,6 +150,7 @@ async def update_economic_data_in_background():
         # 주석처리 종료: 즉시 수집하는 경우
 
         # 마지막 수집 날짜 조회
+        progress(stage="조회", message="마지막 수집 날짜 조회")
         start_date = get_last_updated_date()
         
         # 현재 날짜 계산
@@ -118,100 +164,50 @@ async def update_economic_data_in_background():
         # 수집 시작일이 종료일보다 크면 종료
         if start_date > storage_end_date:
             print(f"수집 시작일({start_date})이 저장 종료일({storage_end_date})보다 큽니다. 수집할 데이터가 없습니다.")
-            return {"success": True, "total_records": 0, "updated_records": 0}
+            return {"success": True, "message": "수집할 데이터가 없습니다", "total_records": 0, "updated_records": 0}
+        
+        # 1년 이상 비어 있는 경우(빈 테이블 포함) 연 단위 병렬 백필로 처리
+        if (datetime.strptime(storage_end_date, '%Y-%m-%d') - datetime.strptime(start_date, '%Y-%m-%d')).days > BACKFILL_THRESHOLD_DAYS:
+            print(f"수집 기간이 {BACKFILL_THRESHOLD_DAYS}일을 넘어 병렬 백필로 처리합니다.")
+            return run_backfill(start_date=start_date, end_date=storage_end_date, progress=progress)
         
-        # 이전 데이터 가져오기 (마지막 수집 날짜의 데이터)
-        previous_date = (datetime.strptime(start_date, '%Y-%m-%d') - timedelta(days=1)).strftime('%Y-%m-%d')
-        prev_data_response = supabase.table("economic_and_stock_data").select("*").eq("날짜", previous_date).execute()
-        previous_data = prev_data_response.data[0] if prev_data_response.data else {}
+        # 전진 채우기 시작값 (컬럼별 마지막 유효값 인덱스에서 한 번에 조회)
+        previous_data = fetch_previous_values(start_date)
         
         # 데이터 수집 (오늘까지 수집)
+        progress(stage="수집", message=f"{start_date} ~ {collection_end_date} 데이터 수집")
         new_data = collect_economic_data(start_date=start_date, end_date=collection_end_date)
         
-        # 디버깅: 수집된 데이터 확인
-        print("\n=== 수집된 데이터 확인 ===")
-        for date_idx in new_data.index:
-            date_str = date_idx.strftime('%Y-%m-%d') if isinstance(date_idx, pd.Timestamp) else date_idx
-            print(f"날짜: {date_str}")
-            for stock in stock_columns[:5]:  # 몇 개의 주가만 출력
-                if stock in new_data.columns:
-                    print(f"  {stock}: {new_data.loc[date_idx, stock]}")
-        
         if new_data is None or new_data.empty:
             print("수집할 새 데이터가 없습니다.")
-            return {"success": True, "total_records": 0, "updated_records": 0}
+            return {"success": True, "message": "수집할 새 데이터가 없습니다", "total_records": 0, "updated_records": 0}
+        
+        # 디버깅: 수집된 데이터 확인 (마지막 5개 날짜의 주요 주가만 출력)
+        print("\n=== 수집된 데이터 확인 ===")
+        print(new_data[[col for col in STOCK_COLUMNS[:5] if col in new_data.columns]].tail())
         
         # 날짜 범위 생성 (시작일부터 어제까지만)
         all_dates = pd.date_range(start=start_date, end=storage_end_date)
-        saved_count = 0
         
-        # 어제까지 날짜에 대해서만 처리
-        for date in all_dates:
-            date_str = date.strftime('%Y-%m-%d')
-            
-            # 해당 날짜의 데이터가 수집되었는지 확인
-            if date in new_data.index:
-                row = new_data.loc[date]
-                print(f"\n== {date_str} 데이터가 있음 (저장 대상) ==")
-                # 주요 주가 데이터 몇 개 출력
-                for stock in stock_columns[:5]:
-                    if stock in row.index:
-                        print(f"  원본 {stock}: {row[stock]}")
-            else:
-                print(f"\n== {date_str} 데이터가 없음, 이전 데이터 사용 (저장 대상) ==")
-                row = pd.Series(dtype='object')
-            
-            # 기존 데이터 확인
-            check = supabase.table("economic_and_stock_data").select("*").eq("날짜", date_str).execute()
-            
-            # 데이터 딕셔너리 생성
-            data_dict = {}
-            for col_name, value in row.items():
-                if not pd.isna(value):  # null이 아닌 값만 포함
-                    data_dict[col_name] = value
-            
-            # 이전 데이터로 null 값 채우기 (모든 컬럼 대상)
-            for col_name, value in previous_data.items():
-                if col_name != "날짜" and col_name not in data_dict and value is not None:
-                    data_dict[col_name] = value
-            
-            # 중복 방지를 위해 기존 데이터가 있으면 업데이트, 없으면 삽입
-            if check.data and len(check.data) > 0:
-                # 기존 레코드가 있는 경우, null 값만 업데이트
-                existing_data = check.data[0]
-                update_dict = {}
-                
-                for col_name, value in data_dict.items():
-                    # 기존 값이 null이거나 누락된 경우에만 업데이트
-                    if col_name not in existing_data or existing_data[col_name] is None:
-                        update_dict[col_name] = value
-                
-                if update_dict:  # 업데이트할 값이 있는 경우에만
-                    supabase.table("economic_and_stock_data").update(update_dict).eq("날짜", date_str).execute()
-            else:
-                # 새 레코드 추가
-                insert_dict = {"날짜": date_str}
-                insert_dict.update(data_dict)
-                supabase.table("economic_and_stock_data").insert(insert_dict).execute()
-            
-            # 현재 데이터를 다음 날짜 처리를 위한 이전 데이터로 설정
-            if data_dict:  # 데이터가 있는 경우에만
-                previous_data = {"날짜": date_str}
-                previous_data.update(data_dict)
-            
-            # 주요 주가 데이터 출력
-            for stock in stock_columns[:5]:
-                if stock in data_dict:
-                    print(f"  저장 전 {stock}: {data_dict[stock]}")
-            
-            saved_count += 1
+        # 기간 전체의 기존 데이터를 한 번에 조회하고, 삽입/NULL 채움 셀을 배열 연산으로 계산
+        progress(stage="비교", message="기존 행 조회 및 변경 셀 계산")
+        existing_rows = fetch_rows_in_range(start_date, storage_end_date)
+        diff = compute_null_fill_diff(new_data, all_dates, previous_data, existing_rows)
+        print(f"기존 행 {len(existing_rows)}개 조회, 신규 {diff['inserted']}개 / NULL 채움 {diff['updated']}개 "
+              f"(변경 셀 {len(diff['changed_cells'])}개) 기록 예정")
+        
+        # 날짜별 요청 대신 배치 단위 upsert
+        progress(stage="기록", message=f"{len(diff['rows'])}개 행 기록", done=0, total=len(diff["rows"]))
+        saved_count = upsert_rows(diff["rows"])
+        update_last_value_index(diff["last_values"])
+        progress(done=saved_count)
         
         # 오늘 날짜 데이터는 수집했지만 저장하지 않는다고 표시
         if datetime.now().date() in new_data.index:
             print(f"\n== {today} 데이터는 수집했지만 저장하지 않습니다 ==")
             
         total_records = len(all_dates)
-        print(f"총 {total_records}개 날짜 중 {saved_count}개가 처리되었습니다.")
+        print(f"총 {total_records}개 날짜 중 {saved_count}개가 기록되었습니다.")
         
         # ===== 추가: 데이터 업데이트 완료 후 기술적 지표 생성 및 뉴스 감정 분석 실행 =====
         # try:
@@ -0,0 +1,504 @@
+"""
+증분(스트리밍) 기술적 지표 엔진
+
+종목별로 SMA20/SMA50 윈도, RSI 상승/하락 윈도, MACD용 EMA 누적값을 상태로 저장하고
+새 종가 하나가 들어올 때마다 O(1)로 갱신합니다. 증분 계산은 indicator_kernels 커널의 update()를
+종목 하나(폭 1) 상태로 호출하므로 행렬 계산(compute_indicator_matrices)과 같은 식을 공유합니다. 상태는 indicator_state 테이블에 저장되므로
+다음 실행에서는 마지막 반영 날짜 이후의 행만 읽어 반영하면 되고, 갱신 비용은 조회 기간과 무관합니다.
+
+- update(date, close): 확정 종가 반영 (수집된 일별 데이터)
+- peek(close): 상태를 바꾸지 않고 임시 가격(장중 현재가)을 반영했을 때의 지표 계산
+- compute_indicator_matrices(prices): (날짜 × 종목) 종가 행렬 전체를 한 번에 계산 (상태가 없는 종목 초기화)
+
+갱신하며 계산한 날짜별 지표는 indicator_history 테이블((날짜, 종목) 키)에 upsert 하므로
+과거 RSI/MACD 조회와 백테스트는 다시 계산하지 않고 저장된 값을 읽습니다 (read_history).
+종목별 최신 행은 indicator_history_latest 뷰로 조회합니다 (TableQuery.latest_per).
+
+계산 방식은 StockRecommendationService.calculate_* (pandas rolling/ewm)와 같습니다.
+    SMA: 단순 이동평균, RSI: 14일 상승/하락폭 단순 평균, MACD: ewm(span, adjust=False)
+"""
+import copy
+import json
+import math
+import threading
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+from app.db.journal import write_journal
+from app.db.queries import TableQuery
+from app.db.repository import TableRepository
+from app.db.supabase import supabase
+from app.services.indicator_kernels import RollingWindow, compute_kernels, update_kernels
+from app.services.trading_rules import TRADING_RULES
+
+SMA_SHORT = 20
+SMA_LONG = 50
+RSI_PERIOD = 14
+
+# 상태가 없는 종목을 처음 계산할 때 읽는 기간 (EMA가 수렴하도록 SMA_LONG보다 충분히 길게)
+BOOTSTRAP_DAYS = 180
+
+STATE_TABLE = "indicator_state"
+HISTORY_TABLE = "indicator_history"
+HISTORY_JOB = "indicator_history"
+HISTORY_BATCH_SIZE = 500
+
+# compute_indicator_matrices와 StreamingIndicators가 사용하는 지표 커널 (app/services/indicator_kernels.py)
+MATRIX_KERNELS = (f"sma{SMA_SHORT}", f"sma{SMA_LONG}", "rsi", "macd")
+PRICE_TABLE = "economic_and_stock_data"
+DATE_COLUMN = "날짜"
+
+
+# technical_row / indicator_history에 저장하는 지표 컬럼
+INDICATOR_COLUMNS = ["SMA20", "SMA50", "골든_크로스", "RSI", "MACD", "Signal", "MACD_매수_신호", "추천_여부"]
+
+
+def technical_row(name, date_str, values, rsi_buy=None):
+    """
+    지표 값으로 stock_recommendations 행을 만듭니다. 지표가 아직 계산되지 않았으면 None.
+
+    매수 조건: 골든 크로스, RSI < rsi_buy, MACD > Signal 중 2개 이상
+    (rsi_buy 기본값: TRADING_RULES["rsi_buy"])
+    """
+    if rsi_buy is None:
+        rsi_buy = TRADING_RULES["rsi_buy"]
+    if values is None or any(values.get(key) is None for key in ("SMA20", "SMA50", "RSI", "MACD", "Signal")):
+        return None
+    golden_cross = values["SMA20"] > values["SMA50"]
+    macd_buy_signal = values["MACD"] > values["Signal"]
+    buy_conditions = int(golden_cross) + int(values["RSI"] < rsi_buy) + int(macd_buy_signal)
+    return {
+        "날짜": date_str,
+        "종목": name,
+        "SMA20": float(values["SMA20"]),
+        "SMA50": float(values["SMA50"]),
+        "골든_크로스": bool(golden_cross),
+        "RSI": float(values["RSI"]),
+        "MACD": float(values["MACD"]),
+        "Signal": float(values["Signal"]),
+        "MACD_매수_신호": bool(macd_buy_signal),
+        "추천_여부": buy_conditions >= 2,
+    }
+
+
+def compute_indicator_matrices(prices, rsi_buy=None):
+    """
+    (날짜 × 종목) 종가 행렬 전체의 지표를 종목별 반복 없이 한 번에 계산합니다.
+    지표는 indicator_kernels 레지스트리의 MATRIX_KERNELS 커널로 계산하며,
+    값은 StockRecommendationService.calculate_* 를 종목마다 적용한 결과와 같습니다.
+
+    Args:
+        prices (pd.DataFrame): 날짜 인덱스, 종목 컬럼의 종가
+        rsi_buy (float, optional): 추천_여부의 RSI 매수 기준 (기본값: TRADING_RULES["rsi_buy"])
+
+    Returns:
+        dict: 지표명 → (날짜 × 종목) 데이터프레임
+            SMA20, SMA50, RSI, MACD, Signal, 골든_크로스, MACD_매수_신호, 추천_여부,
+            valid(모든 지표가 계산된 셀), gain/loss, ema_short/ema_long (상태 초기화용)
+    """
+    if rsi_buy is None:
+        rsi_buy = TRADING_RULES["rsi_buy"]
+    outputs, _ = compute_kernels({"close": prices.to_numpy(dtype=np.float64)}, MATRIX_KERNELS)
+    sma_short = outputs[f"SMA{SMA_SHORT}"]
+    sma_long = outputs[f"SMA{SMA_LONG}"]
+    rsi, macd, signal = outputs["RSI"], outputs["MACD"], outputs["Signal"]
+
+    golden_cross = sma_short > sma_long
+    macd_buy_signal = macd > signal
+    buy_conditions = golden_cross.astype(int) + (rsi < rsi_buy).astype(int) + macd_buy_signal.astype(int)
+    valid = ~(np.isnan(sma_short) | np.isnan(sma_long) | np.isnan(rsi) | np.isnan(macd) | np.isnan(signal))
+
+    def frame(matrix):
+        return pd.DataFrame(matrix, index=prices.index, columns=prices.columns)
+
+    return {
+        "SMA20": frame(sma_short),
+        "SMA50": frame(sma_long),
+        "RSI": frame(rsi),
+        "MACD": frame(macd),
+        "Signal": frame(signal),
+        "골든_크로스": frame(golden_cross),
+        "MACD_매수_신호": frame(macd_buy_signal),
+        "추천_여부": frame(buy_conditions >= 2),
+        "valid": frame(valid),
+        "gain": frame(outputs["gain"]),
+        "loss": frame(outputs["loss"]),
+        "ema_short": frame(outputs["ema_short"]),
+        "ema_long": frame(outputs["ema_long"]),
+    }
+
+
+def technical_rows_from_matrices(matrices, start=0):
+    """
+    지표 행렬에서 모든 지표가 계산된 (날짜, 종목) 셀마다 stock_recommendations 형식의 행을 만듭니다.
+
+    Args:
+        matrices (dict): compute_indicator_matrices 결과
+        start (int): 이 위치의 날짜 행부터 변환 (-1이면 마지막 날짜만)
+
+    Returns:
+        list: 행 딕셔너리 목록 (날짜, 종목 순)
+    """
+    valid = matrices["valid"]
+    if valid.empty:
+        return []
+    mask = valid.to_numpy()[start:]
+    row_idx, col_idx = np.nonzero(mask)
+    dates = pd.to_datetime(valid.index[start:]).strftime("%Y-%m-%d")[row_idx]
+    names = valid.columns[col_idx]
+    columns = {key: matrices[key].to_numpy()[start:][row_idx, col_idx].tolist() for key in INDICATOR_COLUMNS}
+    return [
+        {"날짜": date_str, "종목": name, **{key: values[i] for key, values in columns.items()}}
+        for i, (date_str, name) in enumerate(zip(dates, names))
+    ]
+
+
+def latest_technical_rows(matrices):
+    """지표 행렬의 마지막 날짜에서 모든 지표가 계산된 종목의 stock_recommendations 행을 만듭니다."""
+    return technical_rows_from_matrices(matrices, start=-1)
+
+
+def _optional(value):
+    value = float(value)
+    return None if math.isnan(value) else value
+
+
+def _ewm_state(value):
+    # adjust=False EMA는 값이 한 번이라도 반영된 뒤에는 이전 가중치가 항상 1
+    return np.array([np.nan if value is None else float(value)]), np.ones(1)
+
+
+class StreamingIndicators:
+    """종목 하나의 지표 상태. 증분 계산은 MATRIX_KERNELS 커널의 update()에 위임합니다 (폭 1 상태)."""
+
+    def __init__(self, kernel_states=None):
+        self.last_date = None
+        self.count = 0
+        if kernel_states is None:
+            _, kernel_states = compute_kernels({"close": np.empty((0, 1))}, MATRIX_KERNELS)
+        self.kernel_states = kernel_states
+        self.values = None
+
+    @staticmethod
+    def _values(close, outputs):
+        return {
+            "close": close,
+            **{key: _optional(outputs[key][0]) for key in (f"SMA{SMA_SHORT}", f"SMA{SMA_LONG}", "RSI", "MACD", "Signal")},
+        }
+
+    def update(self, date_str, close):
+        """확정 종가 하나를 반영하고 지표 값을 반환합니다."""
+        close = float(close)
+        outputs = update_kernels(self.kernel_states, {"close": np.array([close])})
+        self.count += 1
+        self.last_date = date_str
+        self.values = self._values(close, outputs)
+        return self.values
+
+    def peek(self, close):
+        """상태를 바꾸지 않고 임시 가격(장중 현재가)을 반영한 지표 값을 반환합니다."""
+        close = float(close)
+        states = copy.deepcopy(self.kernel_states)
+        return self._values(close, update_kernels(states, {"close": np.array([close])}))
+
+    def to_dict(self):
+        """커널 상태를 indicator_state에 저장하는 JSON 형식으로 변환합니다."""
+        rsi = self.kernel_states["rsi"]
+        macd = self.kernel_states["macd"]
+        return {
+            "last_date": self.last_date,
+            "count": self.count,
+            "closes": self.kernel_states[f"sma{SMA_LONG}"].tail()[:, 0].tolist(),
+            "gains": rsi["gain"].tail()[:, 0].tolist(),
+            "losses": rsi["loss"].tail()[:, 0].tolist(),
+            "prev_close": _optional(rsi["prev"][0]) if rsi["started"] else None,
+            "ema_short": _optional(macd["short"][0][0]),
+            "ema_long": _optional(macd["long"][0][0]),
+            "signal": _optional(macd["signal"][0][0]),
+            "values": self.values,
+        }
+
+    @classmethod
+    def from_matrices(cls, name, closes, matrices):
+        """
+        compute_indicator_matrices 결과의 마지막 부분으로 상태를 만듭니다 (종목별 반복 갱신 없이 초기화).
+
+        Args:
+            name (str): 종목명
+            closes (pd.Series): 해당 종목의 종가 (날짜 인덱스)
+            matrices (dict): compute_indicator_matrices 결과
+        """
+        observed = closes.notna().to_numpy()
+        if not observed.any():
+            return cls()
+        rows = np.flatnonzero(observed)
+        last = rows[-1]
+        observed_closes = closes.to_numpy(dtype=np.float64)[rows]
+
+        def cell(key):
+            value = matrices[key][name].iloc[last]
+            return None if pd.isna(value) else float(value)
+
+        return cls.from_dict({
+            "last_date": pd.Timestamp(closes.index[last]).strftime("%Y-%m-%d"),
+            "count": int(len(rows)),
+            "closes": observed_closes[-SMA_LONG:].tolist(),
+            "gains": matrices["gain"][name].to_numpy()[rows[-RSI_PERIOD:]].tolist(),
+            "losses": matrices["loss"][name].to_numpy()[rows[-RSI_PERIOD:]].tolist(),
+            "prev_close": float(observed_closes[-1]),
+            "ema_short": cell("ema_short"),
+            "ema_long": cell("ema_long"),
+            "signal": cell("Signal"),
+            "values": {"close": float(observed_closes[-1]), "SMA20": cell("SMA20"), "SMA50": cell("SMA50"),
+                       "RSI": cell("RSI"), "MACD": cell("MACD"), "Signal": cell("Signal")},
+        })
+
+    @classmethod
+    def from_dict(cls, data):
+        """indicator_state에 저장된 JSON 형식에서 커널 상태를 복원합니다."""
+        count = int(data.get("count", 0))
+
+        def window(values, period):
+            return RollingWindow.from_tail(np.asarray(values, dtype=np.float64).reshape(-1, 1), period, rows=count)
+
+        closes = data.get("closes", [])
+        prev_close = data.get("prev_close")
+        state = cls({
+            f"sma{SMA_SHORT}": window(closes, SMA_SHORT),
+            f"sma{SMA_LONG}": window(closes, SMA_LONG),
+            "rsi": {
+                "prev": np.array([np.nan if prev_close is None else float(prev_close)]),
+                "started": prev_close is not None,
+                "gain": window(data.get("gains", []), RSI_PERIOD),
+                "loss": window(data.get("losses", []), RSI_PERIOD),
+            },
+            "macd": {
+                "short": _ewm_state(data.get("ema_short")),
+                "long": _ewm_state(data.get("ema_long")),
+                "signal": _ewm_state(data.get("signal")),
+            },
+        })
+        state.last_date = data.get("last_date")
+        state.count = count
+        state.values = data.get("values")
+        return state
+
+
+class IndicatorEngine:
+    """종목별 지표 상태를 불러오고, 새 행만 반영하고, 저장하는 관리자"""
+
+    def __init__(self, client=None, bootstrap_days=BOOTSTRAP_DAYS):
+        self.client = client or supabase
+        self.repository = TableRepository(self.client)
+        self.bootstrap_days = bootstrap_days
+        self.states = {}
+        # 조회했지만 저장된 상태가 없던 종목 (반복 조회하지 않음)
+        self._missing = set()
+        self._lock = threading.Lock()
+
+    def load(self, names, force=False):
+        """
+        indicator_state에서 종목별 상태를 한 번에 불러옵니다.
+        이미 불러왔거나 상태가 없는 것으로 확인된 종목은 force=True일 때만 다시 읽습니다.
+        """
+        if not force:
+            names = [name for name in names if name not in self.states and name not in self._missing]
+        if not names:
+            return
+        try:
+            rows = TableQuery(STATE_TABLE, ["종목", "state"], client=self.client).where("종목", "in_", names).fetch()
+        except Exception as e:
+            print(f"{STATE_TABLE} 조회 실패, 상태 없이 계산합니다: {str(e)}")
+            rows = []
+        for row in rows:
+            data = row.get("state")
+            if isinstance(data, str):
+                data = json.loads(data)
+            if data:
+                self.states[row["종목"]] = StreamingIndicators.from_dict(data)
+        self._missing.update(name for name in names if name not in self.states)
+
+    def save(self, names):
+        """상태를 indicator_state에 upsert 합니다."""
+        now = datetime.now().isoformat(timespec="seconds")
+        rows = [
+            {"종목": name, "날짜": self.states[name].last_date, "state": self.states[name].to_dict(), "updated_at": now}
+            for name in names if name in self.states
+        ]
+        if rows:
+            self.client.table(STATE_TABLE).upsert(rows, on_conflict="종목").execute()
+        return len(rows)
+
+    def write_history(self, rows):
+        """
+        날짜별 지표 행을 indicator_history에 (날짜, 종목) 기준으로 upsert 합니다.
+        쓰기 저널을 거치므로 중간에 종료되어도 다음 실행에서 남은 배치부터 이어서 반영됩니다.
+        """
+        if not rows:
+            return 0
+        operations = [
+            {"op": "upsert", "table": HISTORY_TABLE, "rows": rows[i:i + HISTORY_BATCH_SIZE], "on_conflict": "날짜,종목"}
+            for i in range(0, len(rows), HISTORY_BATCH_SIZE)
+        ]
+        return write_journal.execute(HISTORY_JOB, operations, client=self.client)
+
+    def read_history(self, names=None, start_date=None, end_date=None, columns=None):
+        """
+        저장된 날짜별 지표를 읽습니다 (다시 계산하지 않음).
+
+        Args:
+            names (list, optional): 종목명 목록 (기본값: 전체)
+            start_date (str, optional): 시작일 (YYYY-MM-DD, 포함)
+            end_date (str, optional): 종료일 (YYYY-MM-DD, 포함)
+            columns (list, optional): 지표 컬럼 (기본값: INDICATOR_COLUMNS)
+
+        Returns:
+            pd.DataFrame: 날짜, 종목, 지표 컬럼 (날짜 오름차순)
+        """
+        filters = []
+        if names is not None:
+            filters.append(("종목", "in_", list(names)))
+        if start_date:
+            filters.append((DATE_COLUMN, "gte", start_date))
+        if end_date:
+            filters.append((DATE_COLUMN, "lte", end_date))
+        return self.repository.read_frame(
+            HISTORY_TABLE,
+            columns=[DATE_COLUMN, "종목", *(columns or INDICATOR_COLUMNS)],
+            filters=filters,
+            order_by=DATE_COLUMN,
+        )
+
+    def _read_prices(self, names, start_date):
+        frame = self.repository.read_frame(
+            PRICE_TABLE,
+            columns=[DATE_COLUMN, *names],
+            filters=[(DATE_COLUMN, "gte", start_date)],
+            order_by=DATE_COLUMN,
+        )
+        if frame.empty:
+            return frame
+        frame = frame.set_index(DATE_COLUMN)
+        return frame.apply(pd.to_numeric, errors="coerce")
+
+    def refresh(self, names, reset=False):
+        """
+        각 종목 상태에 마지막 반영 날짜 이후의 종가만 반영하고 저장합니다.
+        상태가 없는 종목은 bootstrap_days 기간으로 처음 계산합니다.
+        새로 계산한 날짜별 지표와 종목별 최신 지표는 indicator_history에 upsert 합니다.
+
+        Args:
+            names (list): 종목명(economic_and_stock_data 컬럼명) 목록
+            reset (bool): 저장된 상태를 버리고 bootstrap_days 기간으로 다시 계산 (과거 데이터 수정 후 사용)
+
+        Returns:
+            dict: 종목명 → (마지막 반영 날짜, 지표 값)
+        """
+        with self._lock:
+            return self._refresh(list(names), reset)
+
+    def _refresh(self, names, reset):
+        if reset:
+            for name in names:
+                self.states.pop(name, None)
+        else:
+            self.load(names)
+
+        bootstrap_start = (datetime.now() - timedelta(days=self.bootstrap_days)).strftime("%Y-%m-%d")
+        starts = []
+        for name in names:
+            state = self.states.get(name)
+            if state is None or state.last_date is None:
+                starts.append(bootstrap_start)
+            else:
+                starts.append((pd.Timestamp(state.last_date) + pd.Timedelta(days=1)).strftime("%Y-%m-%d"))
+        prices = self._read_prices(names, min(starts)) if names else pd.DataFrame()
+
+        changed = []
+        history = []
+        if not prices.empty:
+            dates = pd.to_datetime(prices.index).strftime("%Y-%m-%d")
+
+            # 상태가 없는 종목은 종가 행렬 전체를 한 번에 계산해 초기화
+            new_names = [name for name in names if name in prices.columns and name not in self.states]
+            if new_names:
+                window = prices.loc[dates >= bootstrap_start, new_names]
+                matrices = compute_indicator_matrices(window)
+                history.extend(technical_rows_from_matrices(matrices))
+                for name in new_names:
+                    state = StreamingIndicators.from_matrices(name, window[name], matrices)
+                    if state.count:
+                        self.states[name] = state
+                        changed.append(name)
+
+            # 상태가 있는 종목은 마지막 반영 이후의 종가만 O(1)씩 반영
+            for name, start in zip(names, starts):
+                if name not in prices.columns or name in new_names or name not in self.states:
+                    continue
+                state = self.states[name]
+                closes = prices[name].to_numpy(dtype=np.float64)
+                mask = (dates >= start) & ~np.isnan(closes)
+                if not mask.any():
+                    continue
+                for date_str, close in zip(dates[mask], closes[mask].tolist()):
+                    row = technical_row(name, date_str, state.update(date_str, close))
+                    if row is not None:
+                        history.append(row)
+                changed.append(name)
+
+        # 새 종가가 없던 종목도 최신 행이 이력에 있도록 현재 값을 함께 기록 (같은 키는 덮어씀)
+        keys = {(row["날짜"], row["종목"]) for row in history}
+        for name in names:
+            state = self.states.get(name)
+            row = technical_row(name, state.last_date, state.values) if state is not None else None
+            if row is not None and (row["날짜"], name) not in keys:
+                history.append(row)
+
+        # 이력을 먼저 기록하고 상태를 저장 (상태 저장 전에 종료되면 다음 실행이 같은 행을 다시 upsert)
+        self.write_history(history)
+        if changed:
+            self.save(changed)
+        print(f"지표 상태 갱신: {len(changed)}개 종목에 새 종가 반영 (조회 시작일 {min(starts) if starts else '-'})")
+        return {
+            name: (self.states[name].last_date, self.states[name].values)
+            for name in names if name in self.states
+        }
+
+    def peek(self, name, price):
+        """저장된 상태에 임시 가격을 반영한 지표 값 (상태가 없으면 None)"""
+        with self._lock:
+            self.load([name])
+            state = self.states.get(name)
+        return state.peek(price) if state is not None and state.count else None
+
+    def warm(self, names, force=False):
+        """종목 상태를 메모리에 올립니다 (이후 peek_loaded는 DB를 조회하지 않음)."""
+        with self._lock:
+            self.load(list(names), force=force)
+
+    def peek_loaded(self, name, price, as_of):
+        """
+        메모리에 있는 상태에만 임시 가격을 반영합니다 (DB 조회 없음).
+        상태가 as_of 날짜 종가까지 이미 반영했으면 임시 봉 없이 확정 지표를 반환합니다.
+
+        Args:
+            name (str): 종목명
+            price (float): 현재가
+            as_of (str): 현재가의 거래일 (YYYY-MM-DD)
+
+        Returns:
+            tuple: (지표 날짜, 지표 값, 임시 봉 여부). 상태가 없으면 None
+        """
+        with self._lock:
+            state = self.states.get(name)
+            if state is None or not state.count:
+                return None
+            if state.last_date is not None and state.last_date >= as_of:
+                return state.last_date, state.values, False
+            return as_of, state.peek(price), True
+
+
+# 앱 전체에서 공유하는 지표 엔진
+indicator_engine = IndicatorEngine()
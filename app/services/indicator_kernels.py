@@ -0,0 +1,418 @@
+"""
+기술적 지표 커널 레지스트리
+
+지표 하나는 (날짜 × 종목) 가격 행렬을 받는 순수 NumPy 함수(IndicatorKernel)이며,
+필요한 입력(close/high/low), 출력 이름, 워밍업 길이(값이 의미를 갖기 시작하는 행 수)와
+새 행 하나만 반영하는 증분 갱신(update)을 함께 선언합니다.
+새 지표는 서비스 코드를 고치지 않고 커널을 만들어 register_kernel()로 등록하면 됩니다.
+
+    outputs, states = compute_kernels({"close": closes}, ["sma20", "rsi", "bollinger"])
+    row = get_kernel("rsi").update(states["rsi"], {"close": today})   # 다음 날 한 행만 반영
+
+- compute(data): 전체 행렬 계산 → (출력명 → 행렬, 증분 갱신용 상태)
+- update(state, row): 종목별 새 값 한 행을 반영 → 출력명 → 종목별 값 (state는 제자리 갱신)
+
+값은 pandas rolling/ewm(adjust=False) 계산과 같습니다 (benchmark_indicators.py에서 비교).
+"""
+import numpy as np
+
+# 이름 → 커널
+KERNELS = {}
+
+
+def ewm_alpha(span):
+    return 2.0 / (span + 1.0)
+
+
+def ewm_step(weighted, old_weight, current, alpha):
+    """
+    pandas ewm(adjust=False) 한 행 갱신 (종목 방향 벡터 연산). 결측 구간의 가중치 감쇠도 pandas와 같습니다.
+
+    Returns:
+        tuple: (새 가중 평균, 새 이전 가중치)
+    """
+    observed = ~np.isnan(current)
+    started = ~np.isnan(weighted)
+    old_weight = np.where(started, old_weight * (1.0 - alpha), old_weight)
+    update = started & observed
+    weighted = np.where(update, (old_weight * weighted + alpha * current) / (old_weight + alpha), weighted)
+    old_weight = np.where(update, 1.0, old_weight)
+    weighted = np.where(~started & observed, current, weighted)
+    return weighted, old_weight
+
+
+def ewm(values, alpha, state=None):
+    """
+    열별 지수 이동평균. 날짜 방향 재귀만 반복하고 종목 방향은 벡터 연산입니다.
+
+    Returns:
+        tuple: (행렬, 마지막 (가중 평균, 이전 가중치) 상태)
+    """
+    if state is None:
+        state = (np.full(values.shape[1], np.nan), np.ones(values.shape[1]))
+    weighted, old_weight = state
+    out = np.empty_like(values)
+    for i in range(len(values)):
+        weighted, old_weight = ewm_step(weighted, old_weight, values[i], alpha)
+        out[i] = weighted
+    return out, (weighted, old_weight)
+
+
+def rolling_mean(values, window):
+    """열별 단순 이동평균 (누적합 차분). 윈도 안에 NaN이 있거나 행이 부족하면 NaN (pandas rolling과 동일)."""
+    out = np.full_like(values, np.nan)
+    if len(values) < window:
+        return out
+    missing = np.isnan(values)
+    sums = np.cumsum(np.where(missing, 0.0, values), axis=0)
+    counts = np.cumsum(missing, axis=0)
+    sums = np.vstack([np.zeros((1, values.shape[1])), sums])
+    counts = np.vstack([np.zeros((1, values.shape[1]), dtype=counts.dtype), counts])
+    window_sums = sums[window:] - sums[:-window]
+    window_missing = counts[window:] - counts[:-window]
+    out[window - 1:] = np.where(window_missing == 0, window_sums / window, np.nan)
+    return out
+
+
+def rolling_std(values, window, ddof=1):
+    """열별 이동 표준편차 (pandas rolling(window).std()와 같은 표본 표준편차)."""
+    out = np.full_like(values, np.nan)
+    if len(values) < window:
+        return out
+    windows = np.lib.stride_tricks.sliding_window_view(values, window, axis=0)
+    out[window - 1:] = windows.std(axis=-1, ddof=ddof)
+    return out
+
+
+def price_change(values, previous=None):
+    """
+    전일 대비 변화폭. pandas diff 후 where(...)처럼 첫 행과 결측으로 생긴 NaN은 0으로 처리합니다.
+
+    Args:
+        previous (np.ndarray, optional): values 직전 행 (증분 갱신용)
+    """
+    delta = np.empty_like(values)
+    delta[0] = np.nan if previous is None else values[0] - previous
+    delta[1:] = values[1:] - values[:-1]
+    return np.nan_to_num(delta, nan=0.0)
+
+
+class RollingWindow:
+    """종목별 최근 period개 값의 링 버퍼 (증분 갱신용 이동 윈도)"""
+
+    def __init__(self, period, width):
+        self.period = period
+        self.buffer = np.full((period, width), np.nan)
+        self.pos = 0
+        self.rows = 0
+
+    @classmethod
+    def from_tail(cls, values, period, rows=None):
+        """
+        행렬의 마지막 period개 행으로 윈도를 만듭니다.
+
+        Args:
+            rows (int, optional): 지금까지 넣은 전체 행 수 (기본값: len(values), 저장된 윈도 복원용)
+        """
+        window = cls(period, values.shape[1])
+        tail = values[-period:]
+        window.buffer[:len(tail)] = tail
+        window.pos = len(tail) % period
+        window.rows = len(values) if rows is None else rows
+        return window
+
+    def tail(self):
+        """윈도에 남아 있는 행을 오래된 순서로 반환합니다."""
+        n = min(self.rows, self.period)
+        return np.roll(self.buffer, -self.pos, axis=0)[self.period - n:]
+
+    def push(self, row):
+        self.buffer[self.pos] = row
+        self.pos = (self.pos + 1) % self.period
+        self.rows += 1
+
+    def mean(self):
+        if self.rows < self.period:
+            return np.full(self.buffer.shape[1], np.nan)
+        return self.buffer.mean(axis=0)
+
+    def std(self, ddof=1):
+        if self.rows < self.period:
+            return np.full(self.buffer.shape[1], np.nan)
+        return self.buffer.std(axis=0, ddof=ddof)
+
+
+def _last_row(values):
+    return values[-1].copy() if len(values) else np.full(values.shape[1], np.nan)
+
+
+def _rsi(avg_gain, avg_loss):
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return 100 - (100 / (1 + avg_gain / avg_loss))
+
+
+class IndicatorKernel:
+    """
+    지표 커널 기본 클래스
+
+    Attributes:
+        name (str): 레지스트리 이름
+        inputs (tuple): 필요한 가격 행렬 (close/high/low)
+        outputs (tuple): 출력 이름
+        warmup (int): 값이 의미를 갖기 시작하는 최소 행 수 (EMA 계열은 수렴에 필요한 권장 행 수)
+    """
+    name = None
+    inputs = ("close",)
+    outputs = ()
+    warmup = 0
+
+    def compute(self, data):
+        """
+        Args:
+            data (dict): 입력명 → (날짜 × 종목) float64 행렬
+
+        Returns:
+            tuple: (출력명 → 행렬, 증분 갱신용 상태)
+        """
+        raise NotImplementedError
+
+    def update(self, state, row):
+        """
+        Args:
+            state: compute 또는 이전 update가 반환/갱신한 상태 (제자리 갱신)
+            row (dict): 입력명 → 종목별 새 값
+
+        Returns:
+            dict: 출력명 → 종목별 값
+        """
+        raise NotImplementedError
+
+    def __repr__(self):
+        return f"{type(self).__name__}(name={self.name!r}, warmup={self.warmup})"
+
+
+class SMAKernel(IndicatorKernel):
+    """단순 이동평균"""
+
+    def __init__(self, period, name=None):
+        self.period = period
+        self.name = name or f"sma{period}"
+        self.outputs = (f"SMA{period}",)
+        self.warmup = period
+
+    def compute(self, data):
+        close = data["close"]
+        return {self.outputs[0]: rolling_mean(close, self.period)}, RollingWindow.from_tail(close, self.period)
+
+    def update(self, state, row):
+        state.push(row["close"])
+        return {self.outputs[0]: state.mean()}
+
+
+class RSIKernel(IndicatorKernel):
+    """상승/하락폭 단순 평균 RSI (기존 StockRecommendationService.calculate_rsi와 같은 식)"""
+
+    def __init__(self, period=14, name="rsi"):
+        self.period = period
+        self.name = name
+        self.outputs = ("RSI", "gain", "loss")
+        self.warmup = period
+
+    def compute(self, data):
+        close = data["close"]
+        delta = price_change(close) if len(close) else close
+        gain, loss = np.maximum(delta, 0.0), np.maximum(-delta, 0.0)
+        rsi = _rsi(rolling_mean(gain, self.period), rolling_mean(loss, self.period))
+        state = {
+            "prev": _last_row(close),
+            "started": len(close) > 0,
+            "gain": RollingWindow.from_tail(gain, self.period),
+            "loss": RollingWindow.from_tail(loss, self.period),
+        }
+        return {"RSI": rsi, "gain": gain, "loss": loss}, state
+
+    def update(self, state, row):
+        close = row["close"]
+        delta = price_change(close[None, :], state["prev"] if state["started"] else None)[0]
+        gain, loss = np.maximum(delta, 0.0), np.maximum(-delta, 0.0)
+        state["gain"].push(gain)
+        state["loss"].push(loss)
+        state["prev"] = close.copy()
+        state["started"] = True
+        return {"RSI": _rsi(state["gain"].mean(), state["loss"].mean()), "gain": gain, "loss": loss}
+
+
+class WilderRSIKernel(IndicatorKernel):
+    """Wilder 평활(ewm alpha=1/period) RSI"""
+
+    def __init__(self, period=14, name="rsi_wilder"):
+        self.period = period
+        self.name = name
+        self.outputs = ("RSI_Wilder",)
+        self.warmup = period
+
+    def compute(self, data):
+        close = data["close"]
+        delta = price_change(close) if len(close) else close
+        avg_gain, gain_state = ewm(np.maximum(delta, 0.0), 1.0 / self.period)
+        avg_loss, loss_state = ewm(np.maximum(-delta, 0.0), 1.0 / self.period)
+        state = {"prev": _last_row(close), "started": len(close) > 0, "gain": gain_state, "loss": loss_state}
+        return {"RSI_Wilder": _rsi(avg_gain, avg_loss)}, state
+
+    def update(self, state, row):
+        close = row["close"]
+        delta = price_change(close[None, :], state["prev"] if state["started"] else None)[0]
+        alpha = 1.0 / self.period
+        state["gain"] = ewm_step(*state["gain"], np.maximum(delta, 0.0), alpha)
+        state["loss"] = ewm_step(*state["loss"], np.maximum(-delta, 0.0), alpha)
+        state["prev"] = close.copy()
+        state["started"] = True
+        return {"RSI_Wilder": _rsi(state["gain"][0], state["loss"][0])}
+
+
+class MACDKernel(IndicatorKernel):
+    """MACD (ewm adjust=False)와 시그널선"""
+
+    def __init__(self, short_period=12, long_period=26, signal_period=9, name="macd"):
+        self.short_period = short_period
+        self.long_period = long_period
+        self.signal_period = signal_period
+        self.name = name
+        self.outputs = ("MACD", "Signal", "ema_short", "ema_long")
+        self.warmup = long_period + signal_period
+
+    def compute(self, data):
+        close = data["close"]
+        ema_short, short_state = ewm(close, ewm_alpha(self.short_period))
+        ema_long, long_state = ewm(close, ewm_alpha(self.long_period))
+        macd = ema_short - ema_long
+        signal, signal_state = ewm(macd, ewm_alpha(self.signal_period))
+        state = {"short": short_state, "long": long_state, "signal": signal_state}
+        return {"MACD": macd, "Signal": signal, "ema_short": ema_short, "ema_long": ema_long}, state
+
+    def update(self, state, row):
+        close = row["close"]
+        state["short"] = ewm_step(*state["short"], close, ewm_alpha(self.short_period))
+        state["long"] = ewm_step(*state["long"], close, ewm_alpha(self.long_period))
+        macd = state["short"][0] - state["long"][0]
+        state["signal"] = ewm_step(*state["signal"], macd, ewm_alpha(self.signal_period))
+        return {"MACD": macd, "Signal": state["signal"][0], "ema_short": state["short"][0],
+                "ema_long": state["long"][0]}
+
+
+class BollingerKernel(IndicatorKernel):
+    """볼린저 밴드 (이동평균 ± k × 이동 표본 표준편차)"""
+
+    def __init__(self, period=20, num_std=2.0, name="bollinger"):
+        self.period = period
+        self.num_std = num_std
+        self.name = name
+        self.outputs = ("BB_middle", "BB_upper", "BB_lower")
+        self.warmup = period
+
+    def _bands(self, middle, std):
+        return {"BB_middle": middle, "BB_upper": middle + self.num_std * std, "BB_lower": middle - self.num_std * std}
+
+    def compute(self, data):
+        close = data["close"]
+        bands = self._bands(rolling_mean(close, self.period), rolling_std(close, self.period))
+        return bands, RollingWindow.from_tail(close, self.period)
+
+    def update(self, state, row):
+        state.push(row["close"])
+        return self._bands(state.mean(), state.std())
+
+
+class ATRKernel(IndicatorKernel):
+    """Wilder 평활 ATR (True Range = max(고가-저가, |고가-전일 종가|, |저가-전일 종가|))"""
+
+    inputs = ("high", "low", "close")
+
+    def __init__(self, period=14, name="atr"):
+        self.period = period
+        self.name = name
+        self.outputs = ("ATR",)
+        self.warmup = period
+
+    @staticmethod
+    def _true_range(high, low, prev_close):
+        # pandas max(axis=1)처럼 NaN인 항목은 건너뜀
+        return np.fmax(high - low, np.fmax(np.abs(high - prev_close), np.abs(low - prev_close)))
+
+    def compute(self, data):
+        high, low, close = data["high"], data["low"], data["close"]
+        prev_close = np.full_like(close, np.nan)
+        prev_close[1:] = close[:-1]
+        atr, ewm_state = ewm(self._true_range(high, low, prev_close), 1.0 / self.period)
+        return {"ATR": atr}, {"prev_close": _last_row(close), "ewm": ewm_state}
+
+    def update(self, state, row):
+        true_range = self._true_range(row["high"], row["low"], state["prev_close"])
+        state["ewm"] = ewm_step(*state["ewm"], true_range, 1.0 / self.period)
+        state["prev_close"] = row["close"].copy()
+        return {"ATR": state["ewm"][0]}
+
+
+def register_kernel(kernel, replace=False):
+    """커널을 레지스트리에 등록합니다. 같은 이름이 있으면 replace=True일 때만 교체합니다."""
+    if kernel.name in KERNELS and not replace:
+        raise ValueError(f"이미 등록된 지표 커널입니다: {kernel.name}")
+    KERNELS[kernel.name] = kernel
+    return kernel
+
+
+def get_kernel(name):
+    if name not in KERNELS:
+        raise KeyError(f"등록되지 않은 지표 커널입니다: {name} (사용 가능: {', '.join(sorted(KERNELS))})")
+    return KERNELS[name]
+
+
+def _as_matrix(values):
+    return np.asarray(values, dtype=np.float64)
+
+
+def compute_kernels(data, names):
+    """
+    여러 커널을 같은 입력 행렬로 계산합니다.
+
+    Args:
+        data (dict): 입력명 → (날짜 × 종목) 행렬
+        names (list): 커널 이름 목록
+
+    Returns:
+        tuple: (출력명 → 행렬, 커널 이름 → 상태)
+    """
+    data = {key: _as_matrix(values) for key, values in data.items()}
+    outputs = {}
+    states = {}
+    for name in names:
+        kernel = get_kernel(name)
+        missing = [key for key in kernel.inputs if key not in data]
+        if missing:
+            raise ValueError(f"{name} 커널에 필요한 입력이 없습니다: {', '.join(missing)}")
+        result, states[name] = kernel.compute({key: data[key] for key in kernel.inputs})
+        outputs.update(result)
+    return outputs, states
+
+
+def update_kernels(states, row):
+    """
+    compute_kernels의 상태에 종목별 새 값 한 행을 반영합니다 (전체 재계산 없음).
+
+    Args:
+        states (dict): 커널 이름 → 상태 (제자리 갱신)
+        row (dict): 입력명 → 종목별 값
+
+    Returns:
+        dict: 출력명 → 종목별 값
+    """
+    row = {key: _as_matrix(values) for key, values in row.items()}
+    outputs = {}
+    for name, state in states.items():
+        outputs.update(get_kernel(name).update(state, row))
+    return outputs
+
+
+for _kernel in (SMAKernel(20), SMAKernel(50), RSIKernel(), WilderRSIKernel(), MACDKernel(), BollingerKernel(),
+                ATRKernel()):
+    register_kernel(_kernel)
@@ -0,0 +1,95 @@
+"""
+장중 지표 갱신 (메모리 전용)
+
+일별 지표는 전일 종가까지만 반영하므로 장중 1분마다 현재가를 조회하는 매도 판단에서는
+RSI/MACD/골든 크로스가 최대 하루 늦습니다. 이 계층은 조회한 현재가를 오늘의 임시 봉으로
+메모리의 지표 상태(indicator_engine)에 적용해 현재 시점의 지표를 계산합니다.
+
+- 임시 봉은 확정 상태를 바꾸지 않으므로 같은 날 다시 조회하면 임시 봉만 교체됩니다.
+- 지표 상태는 처음 사용할 때와 state_ttl이 지난 뒤에만 DB에서 읽고, 현재가 반영은 DB 조회나 전체 재계산이 없습니다.
+- 확정 상태가 이미 오늘 종가까지 반영했으면 확정 지표를 그대로 사용합니다.
+
+사용 예:
+    intraday_indicators.prepare(["애플", "테슬라"])
+    row = intraday_indicators.apply_quote("애플", 231.5)   # technical_row 형식 + 현재가/임시_봉
+"""
+import threading
+from datetime import datetime, timedelta
+
+import pytz
+
+from app.services.indicator_engine import indicator_engine, technical_row
+
+MARKET_TIMEZONE = pytz.timezone("America/New_York")
+
+# 메모리의 지표 상태를 DB에서 다시 읽는 주기 (다른 프로세스에서 일별 갱신이 실행된 경우 반영)
+STATE_TTL = timedelta(hours=6)
+
+
+def market_date(now=None):
+    """현재가가 속한 미국 거래일 (YYYY-MM-DD)"""
+    return (now or datetime.now(MARKET_TIMEZONE)).astimezone(MARKET_TIMEZONE).strftime("%Y-%m-%d")
+
+
+class IntradayIndicators:
+    """현재가를 임시 봉으로 반영한 종목별 최신 지표"""
+
+    def __init__(self, engine=None, state_ttl=STATE_TTL):
+        self.engine = engine or indicator_engine
+        self.state_ttl = state_ttl
+        self.latest = {}
+        self._loaded_at = {}
+        self._lock = threading.Lock()
+
+    def prepare(self, names):
+        """
+        종목 상태를 메모리에 올립니다. 처음 사용하거나 state_ttl이 지난 종목만 DB에서 한 번에 읽습니다.
+        """
+        now = datetime.now()
+        with self._lock:
+            stale = [name for name in names
+                     if name not in self._loaded_at or now - self._loaded_at[name] > self.state_ttl]
+            if not stale:
+                return
+            self.engine.warm(stale, force=True)
+            for name in stale:
+                self._loaded_at[name] = now
+
+    def apply_quote(self, name, price, trading_date=None):
+        """
+        현재가를 임시 봉으로 반영한 지표 행을 계산합니다.
+
+        Args:
+            name (str): 종목명
+            price (float): 현재가
+            trading_date (str, optional): 현재가의 거래일 (기본값: 뉴욕 기준 오늘)
+
+        Returns:
+            dict: technical_row 형식 + 현재가, 임시_봉, 갱신_시각. 상태가 없거나 지표가 아직 계산되지 않았으면 None
+        """
+        result = self.engine.peek_loaded(name, price, trading_date or market_date())
+        if result is None:
+            return None
+        date_str, values, provisional = result
+        row = technical_row(name, date_str, values)
+        if row is None:
+            return None
+        row.update({
+            "현재가": float(price),
+            "임시_봉": provisional,
+            "갱신_시각": datetime.now().isoformat(timespec="seconds"),
+        })
+        with self._lock:
+            self.latest[name] = row
+        return row
+
+    def snapshot(self, names=None):
+        """마지막으로 계산한 장중 지표 목록 (names를 지정하면 해당 종목만)"""
+        with self._lock:
+            if names is None:
+                return list(self.latest.values())
+            return [self.latest[name] for name in names if name in self.latest]
+
+
+# 앱 전체에서 공유하는 장중 지표
+intraday_indicators = IntradayIndicators()
@@ -0,0 +1,164 @@
+"""
+종목별 일간 OHLCV 저장소
+
+Yahoo Finance Chart API 한 번의 요청으로 받은 시가/고가/저가/종가/거래량을 DB에 기록하고 다시 읽습니다.
+
+- stock_daily_ohlcv: 날짜 × 종목 세로 형식으로 OHLCV 전체를 보관 (거래량/범위 지표의 원본)
+- stock_daily_volume: 기존 날짜별 가로 형식 거래량 테이블 (VOLUME_COLUMNS 종목만)
+
+경제 데이터 수집(collect_economic_data)이 매일 받은 OHLCV를 여기에 기록하므로,
+거래량 수집(collect-volume)은 같은 기간을 다시 내려받지 않고 이 테이블에서 읽고
+기록이 비어 있는 종목만 새로 요청합니다 (stock.collect_ohlcv).
+"""
+from datetime import timedelta
+
+import numpy as np
+import pandas as pd
+
+from app.db.journal import write_journal
+from app.db.repository import records_from_frame
+from app.db.supabase import supabase
+
+OHLCV_TABLE = "stock_daily_ohlcv"
+VOLUME_TABLE = "stock_daily_volume"
+DATE_COLUMN = "날짜"
+NAME_COLUMN = "종목"
+
+OHLCV_FIELDS = ("Open", "High", "Low", "Close", "Volume")
+
+# stock_daily_volume 테이블의 종목 컬럼 (DDL 순서)
+VOLUME_COLUMNS = [
+    "애플", "마이크로소프트", "아마존", "구글 A", "구글 C", "메타",
+    "테슬라", "엔비디아", "코스트코", "넷플릭스", "페이팔", "인텔",
+    "시스코", "컴캐스트", "펩시코", "암젠", "허니웰 인터내셔널", "스타벅스",
+    "몬델리즈", "마이크론", "브로드컴", "어도비", "텍사스 인스트루먼트",
+    "AMD", "어플라이드 머티리얼즈", "S&P 500 ETF", "QQQ ETF"
+]
+
+# 연속된 두 거래일 사이의 최대 달력일 간격 (주말 + 공휴일). 이보다 벌어지면 기록이 빠진 것으로 봄
+MAX_GAP_DAYS = 5
+
+# Supabase(PostgREST) 기본 최대 조회 행 수
+PAGE_SIZE = 1000
+# upsert 요청 하나에 담을 행 수
+UPSERT_BATCH_SIZE = 500
+
+# 쓰기 저널 작업 이름
+OHLCV_JOB = "stock_daily_ohlcv"
+
+
+def _batches(rows, batch_size):
+    return [rows[i:i + batch_size] for i in range(0, len(rows), batch_size)]
+
+
+def _non_null_groups(rows, keys):
+    """
+    행에서 값이 없는 셀을 빼고, 남은 컬럼 조합별로 묶습니다.
+    PostgREST 일괄 upsert는 모든 행의 컬럼이 같아야 하고 보낸 컬럼만 갱신하므로,
+    없는 셀을 NULL로 채워 이미 저장된 값을 덮어쓰지 않게 합니다. 키 외에 값이 없는 행은 버립니다.
+    """
+    groups = {}
+    for row in rows:
+        row = {key: value for key, value in row.items() if value is not None}
+        if len(row) > len(keys):
+            groups.setdefault(tuple(row), []).append(row)
+    return list(groups.values())
+
+
+def store_ohlcv(frames, batch_size=UPSERT_BATCH_SIZE, job=OHLCV_JOB):
+    """
+    종목별 OHLCV 데이터프레임을 stock_daily_ohlcv와 stock_daily_volume에 배치 upsert 합니다.
+
+    값이 있는 셀만 기록합니다. 빈 데이터프레임(기간 안에 거래가 없던 종목)이나 거래량이 없는 날짜는
+    NULL로 기록하지 않으므로 이미 저장된 값을 덮어쓰지 않습니다.
+
+    Args:
+        frames (dict): 컬럼명(한글 이름) → OHLCV 데이터프레임 (날짜 인덱스)
+        batch_size (int): upsert 요청 하나에 담을 행 수
+        job (str): 쓰기 저널 작업 이름
+
+    Returns:
+        int: stock_daily_ohlcv에 기록한 행 수
+    """
+    frames = {name: df for name, df in frames.items() if df is not None and not df.empty}
+    if not frames:
+        return 0
+
+    # 세로 형식 OHLCV (날짜, 종목, 필드)
+    long = pd.concat(
+        [df[list(OHLCV_FIELDS)].rename_axis(DATE_COLUMN).reset_index().assign(**{NAME_COLUMN: name})
+         for name, df in frames.items()],
+        ignore_index=True,
+    )
+    long["Volume"] = long["Volume"].round().astype("Int64")
+    ohlcv_groups = _non_null_groups(records_from_frame(long[[DATE_COLUMN, NAME_COLUMN, *OHLCV_FIELDS]]),
+                                    (DATE_COLUMN, NAME_COLUMN))
+
+    # 가로 형식 거래량 (날짜, 종목별 거래량 컬럼)
+    volume_groups = []
+    volumes = {name: df["Volume"] for name, df in frames.items() if name in VOLUME_COLUMNS}
+    if volumes:
+        wide = pd.concat(volumes, axis=1).sort_index().round().astype("Int64")
+        volume_groups = _non_null_groups(records_from_frame(wide.rename_axis(DATE_COLUMN).reset_index()),
+                                         (DATE_COLUMN,))
+
+    operations = [
+        {"op": "upsert", "table": OHLCV_TABLE, "on_conflict": f"{DATE_COLUMN},{NAME_COLUMN}", "rows": rows}
+        for group in ohlcv_groups for rows in _batches(group, batch_size)
+    ] + [
+        {"op": "upsert", "table": VOLUME_TABLE, "on_conflict": DATE_COLUMN, "rows": rows}
+        for group in volume_groups for rows in _batches(group, batch_size)
+    ]
+    if not operations:
+        return 0
+    write_journal.execute(job, operations)
+    ohlcv_rows = sum(len(group) for group in ohlcv_groups)
+    volume_days = sum(len(group) for group in volume_groups)
+    print(f"OHLCV {ohlcv_rows}행 기록 ({len(frames)}개 종목, 거래량 {volume_days}일)")
+    return ohlcv_rows
+
+
+def load_ohlcv(names, start_date, end_date):
+    """
+    stock_daily_ohlcv에서 기간 내 종목별 OHLCV를 읽습니다 (PAGE_SIZE 단위 페이지 조회).
+
+    Returns:
+        dict: 컬럼명 → OHLCV 데이터프레임 (기록이 없는 종목은 제외)
+    """
+    names = list(names)
+    rows = []
+    offset = 0
+    while True:
+        page = supabase.table(OHLCV_TABLE) \
+            .select(",".join(f'"{c}"' for c in (DATE_COLUMN, NAME_COLUMN, *OHLCV_FIELDS))) \
+            .in_(NAME_COLUMN, names).gte(DATE_COLUMN, start_date).lte(DATE_COLUMN, end_date) \
+            .order(DATE_COLUMN).order(NAME_COLUMN).range(offset, offset + PAGE_SIZE - 1).execute().data or []
+        rows.extend(page)
+        if len(page) < PAGE_SIZE:
+            break
+        offset += PAGE_SIZE
+    if not rows:
+        return {}
+
+    table = pd.DataFrame(rows)
+    table[DATE_COLUMN] = pd.to_datetime(table[DATE_COLUMN].astype(str).str[:10])
+    frames = {}
+    for name, group in table.groupby(NAME_COLUMN, sort=False):
+        frame = group.set_index(DATE_COLUMN)[list(OHLCV_FIELDS)].astype('float64')
+        frame.index.name = None
+        frames[name] = frame.sort_index()
+    return frames
+
+
+def covers(df, start_date, end_date, max_gap_days=MAX_GAP_DAYS):
+    """
+    저장된 OHLCV가 기간 전체를 빠짐없이 담고 있는지 확인합니다.
+    첫/마지막 거래일이 기간 양 끝에서 max_gap_days 이내이고, 중간에 그보다 긴 공백이 없어야 합니다.
+    """
+    if df is None or df.empty:
+        return False
+    gap = timedelta(days=max_gap_days)
+    index = pd.DatetimeIndex(df.index)
+    if index[0] - pd.Timestamp(start_date) > gap or pd.Timestamp(end_date) - index[-1] > gap:
+        return False
+    return len(index) < 2 or np.diff(index.values).max() <= np.timedelta64(max_gap_days, 'D')
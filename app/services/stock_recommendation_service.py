@@ -2,10 +2,17 @@ import pandas as pd
 import requests
 import time
 from datetime import datetime, timedelta
-from app.db.supabase import supabase
+from app.db.queries import TableQuery
+from app.db.snapshots import snapshot_store
 import numpy as np
 from app.core.config import settings
 from app.services.balance_service import get_overseas_balance, get_current_price
+from app.utils.telemetry import collection_telemetry
+from app.utils.rate_limiter import CircuitOpenError, get_rate_limiter
+from app.services.indicator_engine import HISTORY_TABLE, indicator_engine, technical_row
+from app.services.intraday_indicators import intraday_indicators
+from app.services.trading_rules import TRADING_RULES, buy_reason, composite_score
+from app.services.decision_snapshot import decision_snapshot
 
 # 한국어 주식명과 티커 심볼 매핑
 STOCK_TO_TICKER = {
@@ -39,6 +46,28 @@ STOCK_TO_TICKER = {
     "string": "STRING"
 }
 
+# 매수/매도 판단에 사용하는 지표 컬럼 (indicator_history, stock_recommendations 공통)
+TECHNICAL_COLUMNS = [
+    "날짜", "종목", "SMA20", "SMA50", "골든_크로스", "RSI", "MACD", "Signal", "MACD_매수_신호", "추천_여부"
+]
+
+# 추천 결과에 포함하는 stock_analysis_results 컬럼
+ANALYSIS_RESULT_COLUMNS = [
+    'Stock', 'Accuracy (%)', 'Rise Probability (%)', 'Last Actual Price',
+    'Predicted Future Price', 'Recommendation', 'Analysis'
+]
+
+# 추천 결과에 포함하는 ticker_sentiment_analysis 컬럼
+SENTIMENT_COLUMNS = ["ticker", "average_sentiment_score", "article_count", "calculation_date"]
+
+def _is_alpha_vantage_throttled(response):
+    """Alpha Vantage는 호출 한도 초과 시에도 200 응답에 Note/Information 메시지만 담아 반환합니다."""
+    try:
+        body = response.json()
+    except ValueError:
+        return False
+    return isinstance(body, dict) and "feed" not in body and ("Note" in body or "Information" in body)
+
 class StockRecommendationService:
     def __init__(self):
         # ETF 제외한 컬럼명 리스트
@@ -70,75 +99,34 @@ class StockRecommendationService:
         signal = self.calculate_ema(macd, signal_period)
         return macd, signal
 
-    def generate_technical_recommendations(self):
-        """기술적 지표를 기반으로 추천 데이터를 생성하고 Supabase에 저장"""
-        # 최근 6개월 데이터만 가져오기
-        end_date = datetime.now()
-        start_date = end_date - timedelta(days=self.lookback_days)
-        start_date_str = start_date.strftime("%Y-%m-%d")
-
-        # Supabase 쿼리에서 컬럼명에 큰따옴표 추가
-        quoted_columns = [f'"{col}"' for col in self.stock_columns]
-        quoted_columns.append('"날짜"')  # 날짜 컬럼 추가
+    def generate_technical_recommendations(self, reset=False):
+        """
+        기술적 지표를 기반으로 추천 데이터를 생성하고 Supabase에 저장
 
-        response = supabase.table("economic_and_stock_data") \
-            .select(*quoted_columns) \
-            .gte("날짜", start_date_str) \
-            .order("날짜") \
-            .execute()
+        지표는 종목별로 저장된 증분 상태(indicator_engine)에 마지막 반영 이후의 종가만 더해 계산하므로
+        매번 6개월 데이터를 다시 읽어 전체를 재계산하지 않습니다.
 
-        if not response.data:
-            return {"message": "데이터가 없습니다", "data": []}
-
-        # 데이터프레임 생성 (컬럼명은 큰따옴표 제외)
-        df = pd.DataFrame(response.data)
-        df["날짜"] = pd.to_datetime(df["날짜"])
-        df.set_index("날짜", inplace=True)
-        df = df.astype(float)
+        Args:
+            reset (bool): 저장된 지표 상태를 버리고 lookback_days 기간으로 다시 계산
+        """
+        indicator_engine.bootstrap_days = self.lookback_days
+        latest = indicator_engine.refresh(self.stock_columns, reset=reset)
 
         recommendations = []
         for stock in self.stock_columns:
-            prices = df[stock]
-
-            # 지표 계산
-            sma20 = self.calculate_sma(prices, 20)
-            sma50 = self.calculate_sma(prices, 50)
-            golden_cross = sma20 > sma50
-            rsi = self.calculate_rsi(prices)
-            macd, signal = self.calculate_macd(prices)
-            macd_buy_signal = macd > signal
-
-            # 매수 조건: 3가지 중 2개 이상 만족
-            buy_conditions = golden_cross.astype(int) + (rsi < 50).astype(int) + macd_buy_signal.astype(int)
-            recommended = buy_conditions >= 2
-
-            # 가장 최근 날짜의 결과만 저장
-            latest_date = df.index[-1]
-            if all(pd.notna([sma20[latest_date], sma50[latest_date], rsi[latest_date], macd[latest_date], signal[latest_date]])):
-                recommendations.append({
-                    "날짜": latest_date.strftime("%Y-%m-%d"),
-                    "종목": stock,
-                    "SMA20": float(sma20[latest_date]),
-                    "SMA50": float(sma50[latest_date]),
-                    "골든_크로스": bool(golden_cross[latest_date]),
-                    "RSI": float(rsi[latest_date]),
-                    "MACD": float(macd[latest_date]),
-                    "Signal": float(signal[latest_date]),
-                    "MACD_매수_신호": bool(macd_buy_signal[latest_date]),
-                    "추천_여부": bool(recommended[latest_date])
-                })
+            if stock not in latest:
+                continue
+            last_date, values = latest[stock]
+            row = technical_row(stock, last_date, values)
+            if row is not None:
+                recommendations.append(row)
 
-        # 기존 데이터 삭제 후 새 데이터 저장
+        if not recommendations:
+            return {"message": "데이터가 없습니다", "data": []}
+
+        # 새 버전으로 한 번에 기록한 뒤 포인터만 교체 (읽는 쪽은 기록 중인 버전을 보지 않음)
         try:
-            # 전체 데이터 삭제 (항상 TRUE인 조건 사용)
-            supabase.table("stock_recommendations").delete().eq("날짜", "1900-01-01").gte("날짜", "1900-01-01").execute()
-            
-            # 또는 이런 방식도 가능합니다 (모든 레코드와 매치되는 조건)
-            supabase.table("stock_recommendations").delete().gte("날짜", "1900-01-01").execute()
-            
-            # 새 데이터 삽입
-            supabase.table("stock_recommendations").insert(recommendations).execute()
-        
+            snapshot_store.publish("stock_recommendations", recommendations)
         except Exception as e:
             print(f"오류 발생: {str(e)}")
             import traceback
@@ -152,24 +140,21 @@ class StockRecommendationService:
         Accuracy가 80% 이상이고 상승 확률이 3% 이상인 추천 주식 목록을 반환합니다.
         상승 확률 기준으로 내림차순 정렬됩니다.
         """
-        response = supabase.table("stock_analysis_results").select("*").order("created_at", desc=True).execute()
-        if not response.data:
+        # 필요한 컬럼만, 기준 필터와 정렬은 DB에서 처리 (한 주기 안의 반복 호출은 조회 캐시 사용)
+        df = TableQuery("stock_analysis_results", ANALYSIS_RESULT_COLUMNS) \
+            .where("Accuracy (%)", "gte", TRADING_RULES["min_accuracy"]) \
+            .where("Rise Probability (%)", "gte", TRADING_RULES["min_rise"]) \
+            .order_by("Rise Probability (%)", desc=True) \
+            .cached() \
+            .fetch_frame()
+        if df.empty:
             return {"message": "분석 결과를 찾을 수 없습니다", "recommendations": []}
 
-        df = pd.DataFrame(response.data)
         numeric_columns = ['Accuracy (%)', 'Rise Probability (%)']
         for col in numeric_columns:
             df[col] = pd.to_numeric(df[col], errors='coerce')
 
-        filtered_df = df[(df['Accuracy (%)'] >= 80) & (df['Rise Probability (%)'] >= 3)]
-        filtered_df = filtered_df.sort_values(by='Rise Probability (%)', ascending=False)
-        result_columns = [
-            'Stock', 'Accuracy (%)', 'Rise Probability (%)', 'Last Actual Price',
-            'Predicted Future Price', 'Recommendation', 'Analysis'
-        ]
-        result_df = filtered_df[result_columns]
-
-        recommendations = result_df.to_dict(orient='records')
+        recommendations = df.to_dict(orient='records')
         return {
             "message": f"{len(recommendations)}개의 추천 주식을 찾았습니다",
             "recommendations": recommendations
@@ -186,8 +171,10 @@ class StockRecommendationService:
         if not recommendations:
             return {"message": "추천 주식이 없습니다", "results": []}
 
-        sentiment_response = supabase.table("ticker_sentiment_analysis").select("*").gte("average_sentiment_score", 0.15).execute()
-        if not sentiment_response.data:
+        sentiment_rows = snapshot_store.query("ticker_sentiment_analysis", SENTIMENT_COLUMNS) \
+            .where("average_sentiment_score", "gte", TRADING_RULES["buy_sentiment"]) \
+            .fetch()
+        if not sentiment_rows:
             return {"message": "감정 분석 데이터가 없습니다", "results": []}
 
         ticker_to_recommendation = {
@@ -195,7 +182,7 @@ class StockRecommendationService:
             for rec in recommendations 
             if rec["Stock"] in STOCK_TO_TICKER
         }
-        sentiment_data = {item["ticker"]: item for item in sentiment_response.data}
+        sentiment_data = {item["ticker"]: item for item in sentiment_rows}
 
         results = []
         for ticker, sentiment in sentiment_data.items():
@@ -256,10 +243,9 @@ class StockRecommendationService:
 
         api_key = settings.ALPHA_VANTAGE_API_KEY
         relevance_threshold = 0.2
-        sleep_interval = 5
         yesterday = (datetime.now() - timedelta(days=3)).strftime("%Y%m%dT0000")
 
-        base_url = "https://www.alphavantage.co/query"
+        base_url = f"{settings.ALPHA_VANTAGE_BASE_URL.rstrip('/')}/query"
         params = {
             "function": "NEWS_SENTIMENT",
             "time_from": yesterday,
@@ -275,18 +261,57 @@ class StockRecommendationService:
         # 보유 주식 정보를 ticker로 매핑
         holdings_by_ticker = {item.get("ovrs_pdno"): item for item in holdings if item.get("ovrs_pdno")}
 
-        # 기존 감정 분석 데이터 삭제
-        print("기존 감정 분석 데이터 삭제 중...")
-        supabase.table("ticker_sentiment_analysis").delete().gte("ticker", "").execute()
-        print("기존 감정 분석 데이터 삭제 완료")
-
-        results = []
+        # 고정 5초 대기 대신 Alpha Vantage 전용 적응형 속도 제한기로 요청 간격 조절
+        limiter = get_rate_limiter("alpha_vantage")
+        run_id = collection_telemetry.start_run("fetch_and_store_sentiment")
+
+        def request_sentiment(ticker):
+            """티커 하나의 뉴스 감정 API 응답과 본문을 반환합니다 (회로 차단기가 열려 있으면 CircuitOpenError)."""
+            with collection_telemetry.track("alpha_vantage", ticker, run_id=run_id) as call:
+                response = call.response(limiter.call(
+                    lambda: requests.get(base_url, params={**params, "tickers": ticker}),
+                    is_throttled=_is_alpha_vantage_throttled,
+                    tracker=call
+                ))
+                api_data = response.json() if response.status_code == 200 else {}
+                call.rows = len(api_data.get('feed', []))
+            if response.status_code != 200 or _is_alpha_vantage_throttled(response):
+                if limiter.circuit_open:
+                    # 이 요청의 실패로 회로가 열린 경우도 쿨다운 후 재시도 대상
+                    raise CircuitOpenError(f"alpha_vantage 회로 차단기 열림 (응답 {response.status_code})")
+            return response, api_data
+
+        # 회로 차단기가 열려 실패한 티커는 쿨다운이 끝난 뒤 한 번 더 요청하고 나서 스냅샷을 게시
+        # (stock.py _collect_series의 재시도 패스와 같은 방식)
+        responses = {}
+        deferred = []
         for ticker in all_tickers:
             print(f"{ticker} 처리 중...")
-            params["tickers"] = ticker
+            try:
+                responses[ticker] = request_sentiment(ticker)
+            except CircuitOpenError as e:
+                print(f"{ticker} 감정 분석 API 호출 보류: {str(e)} → 재시도 대기열에 추가")
+                deferred.append(ticker)
+            except Exception as e:
+                # 네트워크 오류: 해당 티커만 실패로 기록하고 계속 진행
+                print(f"{ticker} 감정 분석 API 호출 오류: {str(e)}")
+
+        if deferred:
+            print(f"alpha_vantage: 회로 차단기로 실패한 {len(deferred)}개 티커 재시도 중...")
+            limiter.wait_until_closed()
+            for ticker in deferred:
+                try:
+                    responses[ticker] = request_sentiment(ticker)
+                except Exception as e:
+                    print(f"{ticker} 감정 분석 API 재시도 오류: {str(e)}")
+
+        collection_telemetry.finish_run(run_id)
 
-            response = requests.get(base_url, params=params)
-            if response.status_code != 200:
+        results = []
+        sentiment_rows = []  # 모든 티커를 처리한 뒤 새 스냅샷 버전으로 한 번에 기록
+        for ticker in all_tickers:
+            response, api_data = responses.get(ticker, (None, {}))
+            if response is None or response.status_code != 200:
                 results.append({
                     "ticker": ticker,
                     "stock_name": ticker_to_stock.get(ticker, ticker),  # 티커명이 없으면 티커 자체를 표시
@@ -296,10 +321,8 @@ class StockRecommendationService:
                     "recommendation_info": recommendations_by_ticker.get(ticker, {}),
                     "holding_info": holdings_by_ticker.get(ticker, {})
                 })
-                time.sleep(sleep_interval)
                 continue
 
-            api_data = response.json()
             feed = api_data.get('feed', [])
 
             articles = [
@@ -319,7 +342,6 @@ class StockRecommendationService:
                     "recommendation_info": recommendations_by_ticker.get(ticker, {}),
                     "holding_info": holdings_by_ticker.get(ticker, {})
                 })
-                time.sleep(sleep_interval)
                 continue
 
             average_sentiment = sum(articles) / len(articles)
@@ -334,7 +356,7 @@ class StockRecommendationService:
                 "article_count": article_count,
                 "calculation_date": calculation_date
             }
-            supabase.table("ticker_sentiment_analysis").insert(supabase_data).execute()
+            sentiment_rows.append(supabase_data)
 
             results.append({
                 "ticker": ticker,
@@ -346,29 +368,51 @@ class StockRecommendationService:
                 "recommendation_info": recommendations_by_ticker.get(ticker, {}),
                 "holding_info": holdings_by_ticker.get(ticker, {})
             })
-            time.sleep(sleep_interval)
 
+        # 결과가 하나도 없으면(API 장애 등) 이전 스냅샷을 그대로 유지
+        if sentiment_rows:
+            snapshot_store.publish("ticker_sentiment_analysis", sentiment_rows)
+        else:
+            print("저장할 감정 분석 결과가 없어 이전 스냅샷을 유지합니다.")
         return {
             "message": f"{len(results)}개의 티커(추천 주식: {len(recommended_tickers)}개, 보유 주식: {len(holding_tickers)}개)를 분석했습니다",
             "results": results
         }
 
-    def get_combined_recommendations_with_technical_and_sentiment(self):
+    def get_combined_recommendations_with_technical_and_sentiment(self, refresh=False):
         """
-        추천 주식 목록을 기술적 지표(stock_recommendations 테이블)와 감정 분석(ticker_sentiment_analysis 테이블)을
-        결합하여 반환합니다.
-        - stock_recommendations에서 골든_크로스=true, MACD_매수_신호=true, RSI<50 중 하나 이상 만족하는 종목 필터링
+        매수 후보 결정 스냅샷(compute_buy_candidates 결과)을 반환합니다.
+        상위 테이블이 바뀌었거나 스냅샷이 오래된 경우에만 다시 계산하고, 그 외에는 저장된 결과를 그대로 반환합니다.
+
+        Args:
+            refresh (bool): 스냅샷을 무시하고 지금 다시 계산
+        """
+        return decision_snapshot.get(refresh=refresh)
+
+    def compute_buy_candidates(self):
+        """
+        추천 주식 목록을 기술적 지표(indicator_history 종목별 최신 행)와 감정 분석(ticker_sentiment_analysis 테이블)을
+        결합하여 매수 후보와 종합 점수, 매수 근거를 계산합니다 (decision_snapshot이 상위 테이블이 바뀔 때 호출).
+        - 최신 지표에서 골든_크로스=true, MACD_매수_신호=true, RSI<50 중 하나 이상 만족하는 종목 필터링
         - ticker_sentiment_analysis에서 average_sentiment_score >= 0.15인 데이터와 결합
         - get_stock_recommendations의 결과와 통합하여 반환
         - 추가 조건: sentiment_score와 기술적 지표를 기반으로 매수 추천 필터링
         """
         try:
-            # 1. 기술적 지표 데이터 조회
-            tech_response = supabase.table("stock_recommendations").select("*").order("날짜", desc=True).execute()
-            if not tech_response.data:
-                return {"message": "기술적 지표 데이터가 없습니다", "results": []}
+            # 1. 주가 예측 데이터 조회
+            stock_recs = self.get_stock_recommendations()
+            recommendations = stock_recs.get("recommendations", [])
+            if not recommendations:
+                return {"message": "추천 주식이 없습니다", "results": []}
             
-            tech_df = pd.DataFrame(tech_response.data)
+            # 2. 추천 종목의 종목별 최신 기술적 지표만 조회 (지표 이력의 최신 행)
+            tech_df = TableQuery(HISTORY_TABLE, TECHNICAL_COLUMNS) \
+                .latest_per("종목", order_by="날짜") \
+                .where("종목", "in_", [rec["Stock"] for rec in recommendations]) \
+                .cached() \
+                .fetch_frame()
+            if tech_df.empty:
+                return {"message": "기술적 지표 데이터가 없습니다", "results": []}
             
             # 데이터 타입 변환
             tech_df["골든_크로스"] = tech_df["골든_크로스"].astype(bool)
@@ -379,25 +423,21 @@ class StockRecommendationService:
             tech_df["조건_충족_개수"] = (
                 tech_df["골든_크로스"].astype(int) +
                 tech_df["MACD_매수_신호"].astype(int) +
-                (tech_df["RSI"] < 50).astype(int)
+                (tech_df["RSI"] < TRADING_RULES["rsi_buy"]).astype(int)
             )
             filtered_tech_df = tech_df[tech_df["조건_충족_개수"] >= 2]
             
             if filtered_tech_df.empty:
                 return {"message": "조건을 만족하는 기술적 지표가 없습니다", "results": []}
             
-            # 2. 주가 예측 데이터 조회
-            stock_recs = self.get_stock_recommendations()
-            recommendations = stock_recs.get("recommendations", [])
-            if not recommendations:
-                return {"message": "추천 주식이 없습니다", "results": []}
-            
-            # 3. 감정 분석 데이터 조회
-            sentiment_response = supabase.table("ticker_sentiment_analysis").select("*").gte("average_sentiment_score", 0.15).execute()
+            # 3. 감정 분석 데이터 조회 (종목별 최신, 점수 필터는 DB에서 처리)
+            sentiment_rows = snapshot_store.query("ticker_sentiment_analysis", SENTIMENT_COLUMNS) \
+                .where("average_sentiment_score", "gte", TRADING_RULES["buy_sentiment"]) \
+                .fetch()
             
             # 4. 데이터 매핑 준비
-            tech_map = {row["종목"]: row.to_dict() for _, row in filtered_tech_df.iterrows()}
-            sentiment_map = {item["ticker"]: item for item in sentiment_response.data} if sentiment_response.data else {}
+            tech_map = {row["종목"]: row for row in filtered_tech_df.to_dict(orient="records")}
+            sentiment_map = {item["ticker"]: item for item in sentiment_rows}
             
             # 5. 결과 통합
             results = []
@@ -439,45 +479,27 @@ class StockRecommendationService:
                 results.append(combined_data)
             
             # 6. 매수 추천 조건에 따른 추가 필터링 후 순위 계산
-            # 새로운 조건:
             # - 1번 통과 (AI 예측: Accuracy >= 80%, Rise Probability >= 3%) 이미 results에 포함됨
-            # - 2번: 기술적 지표 (Golden Cross, RSI < 50, MACD 매수 신호)
-            # - 3번: 뉴스 감정 점수 >= 0.15
-            #
-            # 매수 조건:
-            # (1번 통과 AND 3번 만족 AND 2번 중 2개 이상) OR (1번 통과 AND 2번 중 3개 이상)
+            # - 매수 조건 (trading_rules.buy_reason):
+            #   (1번 통과 AND 감정 점수 >= 0.15 AND 기술지표 2개 이상) OR (1번 통과 AND 기술지표 3개)
             final_results = []
             for item in results:
-                # 기술적 지표 조건 (2번)
-                tech_conditions = [item["golden_cross"], item["rsi"] < 50, item["macd_buy_signal"]]
-                tech_count = sum(tech_conditions)
-
-                # 뉴스 감정 조건 (3번)
-                has_good_sentiment = item["sentiment_score"] is not None and item["sentiment_score"] >= 0.15
-
-                # 매수 조건 판단
-                # 조건 A: 1번 통과 + 3번 만족 + 2번 중 2개 이상
-                condition_a = has_good_sentiment and tech_count >= 2
-
-                # 조건 B: 1번 통과 + 2번 중 3개 이상
-                condition_b = tech_count >= 3
-
-                if condition_a or condition_b:
-                    final_results.append(item)
+                rsi_ok = item["rsi"] < TRADING_RULES["rsi_buy"]
+                reason = buy_reason(item["golden_cross"], rsi_ok, item["macd_buy_signal"], item["sentiment_score"])
+                if reason is None:
+                    continue
 
-            # 7. 종합 점수 계산 및 정렬
-            for item in final_results:
+                # 7. 종합 점수: 0.3 × 상승률 + 0.4 × (1.5 × 골든 크로스 + RSI 조건 + MACD 조건) + 0.3 × 감성 점수 (가중치: TRADING_RULES)
                 sentiment_score = item["sentiment_score"] if item["sentiment_score"] is not None else 0.0
-                tech_conditions_count = (
-                    1.5 * item["golden_cross"] +
-                    1.0 * (item["rsi"] < 50) +
-                    1.0 * item["macd_buy_signal"]
-                )
-                item["composite_score"] = (
-                    0.3 * item["rise_probability"] +
-                    0.4 * tech_conditions_count +
-                    0.3 * sentiment_score
+                item["composite_score"] = composite_score(
+                    item["rise_probability"],
+                    item["golden_cross"],
+                    rsi_ok,
+                    item["macd_buy_signal"],
+                    sentiment_score,
                 )
+                item["buy_reason"] = reason
+                final_results.append(item)
 
             final_results.sort(key=lambda x: x["composite_score"], reverse=True)
 
@@ -502,6 +524,8 @@ class StockRecommendationService:
         2. 감성 점수 < -0.15이고 기술적 지표 중 2개 이상 매도 신호인 종목
         3. 기술적 지표 중 3개 이상 매도 신호인 종목
 
+        기술적 지표는 조회한 현재가를 오늘의 임시 봉으로 반영한 장중 값(intraday_indicators)을 사용합니다.
+
         반환값:
         - sell_candidates: 매도 대상 종목 목록
         - technical_data: 종목별 기술적 지표 데이터
@@ -536,23 +560,15 @@ class StockRecommendationService:
                     ticker_to_korean[ticker] = name
                     korean_to_ticker[name] = ticker
             
-            # 3. 기술적 지표 데이터 가져오기
-            tech_response = supabase.table("stock_recommendations").select("*").order("날짜", desc=True).execute()
-            tech_data = pd.DataFrame(tech_response.data) if tech_response.data else pd.DataFrame()
-            
-            if not tech_data.empty:
-                # 데이터 타입 변환
-                tech_data["골든_크로스"] = tech_data["골든_크로스"].astype(bool)
-                tech_data["MACD_매수_신호"] = tech_data["MACD_매수_신호"].astype(bool)
-                tech_data["RSI"] = pd.to_numeric(tech_data["RSI"])
-                
-                # 최신 데이터만 필터링 (종목별 가장 최근 날짜의 데이터)
-                tech_data = tech_data.sort_values("날짜", ascending=False)
-                tech_data = tech_data.drop_duplicates(subset=["종목"], keep="first")
+            # 3. 보유 종목의 지표 상태를 메모리에 준비 (처음 또는 갱신 주기가 지난 경우에만 DB 조회)
+            #    지표는 종목별 현재가를 조회한 뒤 임시 봉으로 반영해 계산
+            intraday_indicators.prepare(list(korean_to_ticker))
             
-            # 4. 감성 분석 데이터 가져오기
-            sentiment_response = supabase.table("ticker_sentiment_analysis").select("*").execute()
-            sentiment_data = {item["ticker"]: item for item in sentiment_response.data} if sentiment_response.data else {}
+            # 4. 보유 종목의 감성 분석 데이터 가져오기
+            sentiment_rows = snapshot_store.query("ticker_sentiment_analysis", ["ticker", "average_sentiment_score"]) \
+                .where("ticker", "in_", list(ticker_to_korean)) \
+                .fetch()
+            sentiment_data = {item["ticker"]: item for item in sentiment_rows}
             
             # 5. 매도 대상 종목 식별
             sell_candidates = []
@@ -608,17 +624,13 @@ class StockRecommendationService:
                 technical_sell_signals = 0
                 
                 # 조건 1: 가격 기반 매도 (익절/손절)
-                if price_change_percent >= 5:
+                if price_change_percent >= TRADING_RULES["take_profit"]:
                     sell_reasons.append(f"익절 조건 충족: 구매가 대비 {price_change_percent:.2f}% 상승")
-                elif price_change_percent <= -5:
+                elif price_change_percent <= TRADING_RULES["stop_loss"]:
                     sell_reasons.append(f"손절 조건 충족: 구매가 대비 {price_change_percent:.2f}% 하락")
                 
-                # 기술적 지표 확인
-                tech_record = None
-                if not tech_data.empty:
-                    tech_filtered = tech_data[tech_data["종목"] == stock_name]
-                    if not tech_filtered.empty:
-                        tech_record = tech_filtered.iloc[0].to_dict()
+                # 기술적 지표 확인 (현재가를 오늘의 임시 봉으로 반영한 장중 지표)
+                tech_record = intraday_indicators.apply_quote(stock_name, current_price)
                 
                 tech_sell_signals_details = []
                 if tech_record:
@@ -627,7 +639,7 @@ class StockRecommendationService:
                         technical_sell_signals += 1
                         tech_sell_signals_details.append("데드 크로스")
                     
-                    if tech_record["RSI"] > 70:  # RSI 70 이상은 과매수 구간(매도 신호)
+                    if tech_record["RSI"] > TRADING_RULES["rsi_sell"]:  # RSI 70 이상은 과매수 구간(매도 신호)
                         technical_sell_signals += 1
                         tech_sell_signals_details.append(f"RSI 과매수({tech_record['RSI']:.2f})")
                     
@@ -644,7 +656,7 @@ class StockRecommendationService:
                 if technical_sell_signals >= 3:
                     sell_reasons.append(f"모든 기술적 지표가 매도 신호: {', '.join(tech_sell_signals_details)}")
                 # 조건 2: 감성 점수 < -0.15이고 기술적 지표 중 2개 이상 매도 신호
-                elif sentiment_score is not None and sentiment_score < -0.15 and technical_sell_signals >= 2:
+                elif sentiment_score is not None and sentiment_score < TRADING_RULES["sell_sentiment"] and technical_sell_signals >= 2:
                     sell_reasons.append(f"부정적 감성({sentiment_score:.2f})과 기술적 매도 신호({technical_sell_signals}개): {', '.join(tech_sell_signals_details)}")
                 
                 # 매도 대상 판단
@@ -0,0 +1,198 @@
+"""
+매수/매도 임계값 탐색
+
+백테스트 입력 행렬(종가, 지표, 예측, 감성)을 한 번만 읽어 공유 메모리에 올리고,
+임계값 조합 격자를 프로세스 풀에서 평가해 지정한 지표 순으로 정렬합니다.
+작업자 프로세스는 공유 메모리를 복사 없이 참조하므로 조합마다 DB 조회나 지표 재계산이 없습니다.
+
+격자 키는 TRADING_RULES 키입니다 (rsi_buy, rsi_sell, take_profit, stop_loss, buy_sentiment, sell_sentiment,
+min_accuracy, min_rise, weight_*). 종합 점수 가중치(weight_*)는 동시 보유 종목 수 상한(--max-positions)이
+있을 때만 매수 순서에 영향을 줍니다.
+
+사용법:
+    python sweep_thresholds.py --start 2020-01-01
+    python sweep_thresholds.py --start 2020-01-01 --grid rsi_buy=40,45,50 take_profit=3,5,8 stop_loss=-3,-5,-8
+    python sweep_thresholds.py --start 2020-01-01 --grid-file grid.json --rank-by calmar --top 20 --output sweep.csv
+"""
+import argparse
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from itertools import product
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+from app.services.backtest import (
+    DEFAULT_CAPITAL, POSITION_FRACTION, BacktestData, load_backtest_data, simulate, summarize
+)
+from app.services.trading_rules import TRADING_RULES
+
+DEFAULT_GRID = {
+    "rsi_buy": [40.0, 45.0, 50.0, 55.0],
+    "rsi_sell": [65.0, 70.0, 75.0],
+    "take_profit": [3.0, 5.0, 8.0],
+    "stop_loss": [-3.0, -5.0, -8.0],
+    "buy_sentiment": [0.05, 0.15, 0.25],
+    "sell_sentiment": [-0.25, -0.15, -0.05],
+}
+
+# 정렬 기준 (모두 클수록 좋음. 최대 낙폭은 음수이므로 0에 가까울수록 위)
+RANK_METRICS = ("sharpe", "total_return_pct", "annualized_return_pct", "calmar", "max_drawdown_pct", "win_rate_pct")
+
+# 결과 표에 포함하는 백테스트 요약 지표
+RESULT_METRICS = ("total_return_pct", "annualized_return_pct", "max_drawdown_pct", "calmar", "sharpe", "turnover",
+                  "trades", "win_rate_pct", "avg_trade_return_pct", "avg_positions")
+
+# 작업자 프로세스 전역 상태 (initializer에서 공유 메모리에 연결)
+_worker = {}
+
+
+def build_grid(grid):
+    """{키: 값 목록} 격자를 조합 목록으로 펼칩니다."""
+    unknown = [key for key in grid if key not in TRADING_RULES]
+    if unknown:
+        raise ValueError(f"TRADING_RULES에 없는 기준값입니다: {', '.join(unknown)}")
+    keys = list(grid)
+    return [dict(zip(keys, values)) for values in product(*(grid[key] for key in keys))]
+
+
+def parse_grid_args(items):
+    """["rsi_buy=40,45,50", ...] 형식의 명령행 인자를 격자로 변환합니다."""
+    grid = {}
+    for item in items:
+        key, _, values = item.partition("=")
+        if not values:
+            raise ValueError(f"격자 인자 형식은 키=값1,값2 입니다: {item}")
+        grid[key.strip()] = [float(value) for value in values.split(",") if value.strip()]
+    return grid
+
+
+def _share(data):
+    """BacktestData 행렬을 공유 메모리에 복사하고 (블록 목록, 작업자 연결 정보)를 반환합니다."""
+    blocks = []
+    specs = {}
+    for key in BacktestData.MATRICES:
+        array = np.ascontiguousarray(getattr(data, key))
+        block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+        np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[...] = array
+        blocks.append(block)
+        specs[key] = (block.name, array.shape, array.dtype.str)
+    return blocks, specs
+
+
+def _init_worker(specs, dates, names, settings):
+    # 풀 작업자는 부모의 resource_tracker를 공유하므로 블록 해제(unlink)는 run_sweep에서 한 번만 합니다.
+    blocks = []
+    arrays = {}
+    for key, (name, shape, dtype) in specs.items():
+        block = shared_memory.SharedMemory(name=name)
+        blocks.append(block)
+        arrays[key] = np.ndarray(shape, dtype=np.dtype(dtype), buffer=block.buf)
+    _worker["blocks"] = blocks
+    _worker["data"] = BacktestData(dates, names, **arrays)
+    _worker["settings"] = settings
+
+
+def _evaluate(rules):
+    data = _worker["data"]
+    settings = _worker["settings"]
+    shard = simulate(data, rules, position_size=settings["position_size"], fee_bps=settings["fee_bps"],
+                     execution_lag=settings["execution_lag"], max_positions=settings["max_positions"])
+    summary = summarize(data, [shard], capital=settings["capital"])
+    drawdown = summary["max_drawdown_pct"]
+    annualized = summary["annualized_return_pct"]
+    summary["calmar"] = round(annualized / abs(drawdown), 4) if annualized is not None and drawdown else None
+    return {**rules, **{key: summary[key] for key in RESULT_METRICS}}
+
+
+def run_sweep(data, grid=None, rank_by="sharpe", workers=None, capital=DEFAULT_CAPITAL, position_size=None,
+              fee_bps=0.0, execution_lag=1, max_positions=None):
+    """
+    임계값 조합마다 백테스트를 실행하고 rank_by 순으로 정렬한 결과를 반환합니다.
+
+    Args:
+        data (BacktestData): load_backtest_data 결과 (한 번만 읽음)
+        grid (dict, optional): TRADING_RULES 키 → 값 목록 (기본값: DEFAULT_GRID)
+        rank_by (str): 정렬 기준 (RANK_METRICS)
+        workers (int, optional): 프로세스 수 (기본값: CPU 수, 1이면 현재 프로세스에서 실행)
+
+    Returns:
+        pd.DataFrame: 조합별 기준값과 백테스트 지표 (rank 컬럼 포함)
+    """
+    if rank_by not in RANK_METRICS:
+        raise ValueError(f"지원하지 않는 정렬 기준입니다: {rank_by} (사용 가능: {', '.join(RANK_METRICS)})")
+    configs = build_grid(grid or DEFAULT_GRID)
+    settings = {
+        "capital": capital,
+        "position_size": position_size or capital * POSITION_FRACTION,
+        "fee_bps": fee_bps,
+        "execution_lag": execution_lag,
+        "max_positions": max_positions,
+    }
+    workers = min(workers or os.cpu_count() or 1, len(configs)) if configs else 1
+    started = datetime.now()
+    print(f"임계값 조합 {len(configs)}개 평가 시작 (프로세스 {workers}개, 입력 {data.shape[0]}일 × {data.shape[1]}종목)")
+
+    if workers <= 1:
+        _worker.update(data=data, settings=settings)
+        results = [_evaluate(rules) for rules in configs]
+    else:
+        blocks, specs = _share(data)
+        try:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                     initargs=(specs, data.dates, data.names, settings)) as executor:
+                chunksize = max(1, len(configs) // (workers * 4))
+                results = list(executor.map(_evaluate, configs, chunksize=chunksize))
+        finally:
+            for block in blocks:
+                block.close()
+                block.unlink()
+
+    frame = pd.DataFrame(results)
+    if not frame.empty:
+        frame = frame.sort_values(rank_by, ascending=False, na_position="last", kind="stable").reset_index(drop=True)
+        frame.insert(0, "rank", np.arange(1, len(frame) + 1))
+    print(f"임계값 탐색 완료: {(datetime.now() - started).total_seconds():.1f}초")
+    return frame
+
+
+def main():
+    parser = argparse.ArgumentParser(description="매수/매도 임계값 격자 탐색 (공유 메모리 + 프로세스 풀)")
+    parser.add_argument("--start", required=True, help="시작일 (YYYY-MM-DD)")
+    parser.add_argument("--end", default=None, help="종료일 (기본값: 오늘)")
+    parser.add_argument("--grid", nargs="+", default=None, help="키=값1,값2 ... (기본값: DEFAULT_GRID)")
+    parser.add_argument("--grid-file", default=None, help="격자 JSON 파일 ({키: [값, ...]})")
+    parser.add_argument("--rank-by", default="sharpe", choices=RANK_METRICS, help="정렬 기준")
+    parser.add_argument("--top", type=int, default=10, help="출력할 상위 조합 수")
+    parser.add_argument("--workers", type=int, default=None, help="프로세스 수")
+    parser.add_argument("--capital", type=float, default=DEFAULT_CAPITAL, help="초기 자본")
+    parser.add_argument("--fee-bps", type=float, default=0.0, help="체결 금액 대비 수수료 (bp)")
+    parser.add_argument("--lag", type=int, default=1, help="신호 후 체결까지 거래일 수")
+    parser.add_argument("--max-positions", type=int, default=None, help="동시 보유 종목 수 상한 (가중치 탐색 시 필요)")
+    parser.add_argument("--recompute-indicators", action="store_true", help="indicator_history 대신 지표 재계산")
+    parser.add_argument("--output", default=None, help="전체 결과 CSV 저장 경로")
+    args = parser.parse_args()
+
+    grid = None
+    if args.grid_file:
+        with open(args.grid_file, "r", encoding="utf-8") as f:
+            grid = json.load(f)
+    if args.grid:
+        grid = {**(grid or {}), **parse_grid_args(args.grid)}
+
+    data = load_backtest_data(args.start, args.end, recompute_indicators=args.recompute_indicators)
+    results = run_sweep(data, grid, rank_by=args.rank_by, workers=args.workers, capital=args.capital,
+                        fee_bps=args.fee_bps, execution_lag=args.lag, max_positions=args.max_positions)
+
+    baseline = run_sweep(data, {key: [TRADING_RULES[key]] for key in (grid or DEFAULT_GRID)}, rank_by=args.rank_by,
+                         workers=1, capital=args.capital, fee_bps=args.fee_bps, execution_lag=args.lag,
+                         max_positions=args.max_positions)
+    with pd.option_context("display.max_columns", None, "display.width", 200):
+        print(f"\n현재 기준값(TRADING_RULES):\n{baseline.drop(columns='rank').to_string(index=False)}")
+        print(f"\n{args.rank_by} 상위 {args.top}개 조합:\n{results.head(args.top).to_string(index=False)}")
+    if args.output:
+        results.to_csv(args.output, index=False)
+        print(f"전체 결과 저장: {args.output}")
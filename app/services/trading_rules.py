@@ -0,0 +1,59 @@
+"""
+매수/매도 규칙 기준값
+
+실시간 매수/매도 판단(StockRecommendationService, 스케줄러)과 백테스트/임계값 탐색(app/services/backtest.py,
+app/services/threshold_sweep.py)이 같은 기준값을 사용합니다. 탐색 결과를 반영할 때는 이 값만 바꾸면 됩니다.
+"""
+
+TRADING_RULES = {
+    # 매수: AI 예측
+    "min_accuracy": 80.0,        # 예측 정확도(%) 하한
+    "min_rise": 3.0,             # 예상 상승률(%) 하한
+    # 매수: 기술적 지표 / 감성
+    "rsi_buy": 50.0,             # RSI < rsi_buy 이면 매수 조건
+    "buy_sentiment": 0.15,       # 감성 점수 >= buy_sentiment 이면 매수 조건
+    # 매도
+    "take_profit": 5.0,          # 매수가 대비 상승률(%) 익절 기준
+    "stop_loss": -5.0,           # 매수가 대비 하락률(%) 손절 기준
+    "rsi_sell": 70.0,            # RSI > rsi_sell 이면 과매수 매도 신호
+    "sell_sentiment": -0.15,     # 감성 점수 < sell_sentiment 이면 부정적 감성
+    # 매수 후보 종합 점수 가중치
+    "weight_rise": 0.3,
+    "weight_technical": 0.4,
+    "weight_sentiment": 0.3,
+    "weight_golden_cross": 1.5,  # 기술 점수에서 골든 크로스 가중치 (RSI, MACD는 1.0)
+}
+
+
+def composite_score(rise, golden_cross, rsi_ok, macd_buy, sentiment, rules=None):
+    """
+    매수 후보 종합 점수. 스칼라와 numpy 배열 모두 사용할 수 있습니다.
+
+    Args:
+        rise: 예상 상승률(%)
+        golden_cross, rsi_ok, macd_buy: 기술 조건 충족 여부
+        sentiment: 감성 점수 (없으면 0으로 전달)
+        rules (dict, optional): TRADING_RULES 중 바꿀 값
+    """
+    rules = {**TRADING_RULES, **(rules or {})}
+    technical = rules["weight_golden_cross"] * golden_cross + 1.0 * rsi_ok + 1.0 * macd_buy
+    return rules["weight_rise"] * rise + rules["weight_technical"] * technical + rules["weight_sentiment"] * sentiment
+
+
+def buy_reason(golden_cross, rsi_ok, macd_buy, sentiment, rules=None):
+    """
+    AI 예측 기준을 통과한 후보의 매수 근거. 매수 조건을 만족하지 않으면 None.
+
+    - 조건 A: 감성 점수 >= buy_sentiment 이고 기술 조건(골든 크로스, RSI, MACD) 2개 이상
+    - 조건 B: 기술 조건 3개 모두
+
+    Args:
+        sentiment: 감성 점수 (없으면 None)
+    """
+    rules = {**TRADING_RULES, **(rules or {})}
+    tech_count = int(bool(golden_cross)) + int(bool(rsi_ok)) + int(bool(macd_buy))
+    if sentiment is not None and sentiment >= rules["buy_sentiment"] and tech_count >= 2:
+        return f"조건 A (감정 점수 {sentiment:.3f} + 기술지표 {tech_count}/3개)"
+    if tech_count >= 3:
+        return f"조건 B (기술지표 {tech_count}/3개 만족)"
+    return None
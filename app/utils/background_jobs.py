@@ -0,0 +1,162 @@
+"""
+전용 작업자 스레드에서 실행하는 백그라운드 작업
+
+requests, Supabase 클라이언트, time.sleep, pandas 연산처럼 블로킹되는 작업을
+이벤트 루프가 아닌 전용 작업자 스레드에서 실행하고, 대기 가능한 작업 핸들과 진행 상황을 제공합니다.
+
+사용 예:
+    worker = JobWorker("economic-ingest")
+    job = worker.submit(run_economic_data_update)   # progress 콜백을 키워드 인자로 전달
+    result = await job.wait()                        # 비동기 코드: 이벤트 루프를 막지 않고 대기
+    result = job.result()                            # 동기 코드(스케줄러 스레드 등)
+    job.to_dict()                                    # 상태/단계/진행률 조회
+"""
+import asyncio
+import threading
+import uuid
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+PENDING = "pending"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+
+def _now():
+    return datetime.now().isoformat(timespec="seconds")
+
+
+class BackgroundJob:
+    """작업자 스레드에서 실행 중인 작업 하나의 핸들"""
+
+    def __init__(self, name):
+        self.id = uuid.uuid4().hex[:12]
+        self.name = name
+        self.status = PENDING
+        self.stage = None
+        self.message = None
+        self.done = 0
+        self.total = None
+        self.created_at = _now()
+        self.started_at = None
+        self.finished_at = None
+        self.error = None
+        self._result = None
+        self._future = None
+        self._lock = threading.Lock()
+
+    @property
+    def finished(self):
+        return self.status in (DONE, FAILED)
+
+    def report(self, stage=None, message=None, done=None, total=None):
+        """작업 함수가 호출하는 진행 상황 콜백"""
+        with self._lock:
+            if stage is not None:
+                self.stage = stage
+            if message is not None:
+                self.message = message
+            if done is not None:
+                self.done = done
+            if total is not None:
+                self.total = total
+
+    async def wait(self):
+        """이벤트 루프를 막지 않고 작업 완료를 기다린 뒤 결과를 반환합니다 (실패 시 예외 전파)."""
+        return await asyncio.wrap_future(self._future)
+
+    def result(self, timeout=None):
+        """동기 코드에서 작업 완료를 기다린 뒤 결과를 반환합니다 (실패 시 예외 전파)."""
+        return self._future.result(timeout)
+
+    def to_dict(self):
+        with self._lock:
+            percent = None
+            if self.total:
+                percent = round(100.0 * self.done / self.total, 1)
+            return {
+                "job_id": self.id,
+                "name": self.name,
+                "status": self.status,
+                "stage": self.stage,
+                "message": self.message,
+                "done": self.done,
+                "total": self.total,
+                "percent": percent,
+                "created_at": self.created_at,
+                "started_at": self.started_at,
+                "finished_at": self.finished_at,
+                "error": self.error,
+                "result": self._result if isinstance(self._result, dict) else None,
+            }
+
+
+class JobWorker:
+    """
+    작업을 하나씩 순서대로 실행하는 전용 작업자 스레드
+
+    같은 작업자에 실행 중인 작업이 있으면 새로 제출하지 않고 기존 작업 핸들을 반환해
+    수동 실행/스케줄러/서비스 시작 시 수집이 겹쳐 실행되지 않게 합니다.
+    """
+
+    def __init__(self, name, history_size=20):
+        self.name = name
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=name)
+        self._jobs = deque(maxlen=history_size)
+        self._current = None
+        self._lock = threading.Lock()
+
+    def submit(self, fn, *args, **kwargs):
+        """
+        fn(*args, progress=job.report, **kwargs)를 작업자 스레드에서 실행합니다.
+
+        Returns:
+            BackgroundJob: 작업 핸들 (이미 실행 중인 작업이 있으면 그 핸들)
+        """
+        with self._lock:
+            if self._current is not None and not self._current.finished:
+                print(f"{self.name} 작업이 이미 실행 중입니다 (job_id={self._current.id}).")
+                return self._current
+            job = BackgroundJob(self.name)
+            self._jobs.append(job)
+            self._current = job
+            job._future = self._executor.submit(self._run, job, fn, args, kwargs)
+            return job
+
+    def _run(self, job, fn, args, kwargs):
+        with job._lock:
+            job.status = RUNNING
+            job.started_at = _now()
+        try:
+            result = fn(*args, progress=job.report, **kwargs)
+        except Exception as e:
+            with job._lock:
+                job.status = FAILED
+                job.error = str(e)
+                job.finished_at = _now()
+            raise
+        with job._lock:
+            job._result = result
+            job.status = DONE
+            job.finished_at = _now()
+        return result
+
+    @property
+    def current(self):
+        """가장 최근에 제출된 작업 (없으면 None)"""
+        return self._current
+
+    def get(self, job_id):
+        for job in self._jobs:
+            if job.id == job_id:
+                return job
+        return None
+
+    def list_jobs(self):
+        """최근 작업 목록 (최신순)"""
+        return [job.to_dict() for job in reversed(self._jobs)]
+
+    def shutdown(self, wait=False):
+        self._executor.shutdown(wait=wait, cancel_futures=True)
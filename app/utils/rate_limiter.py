@@ -0,0 +1,224 @@
+"""
+외부 데이터 제공자별 적응형 요청 속도 제한기
+
+- AIMD: 성공하면 요청 속도를 조금씩 올리고(additive increase),
+  429/스로틀 응답을 받으면 속도를 비율로 낮춥니다(multiplicative decrease).
+- 429 또는 5xx, 네트워크 오류는 지수 백오프 + 지터 후 재시도합니다 (Retry-After 헤더 존중).
+  그 밖의 4xx는 재시도하지 않고, 인증 오류(401/403)만 실패로 집계합니다.
+- 연속 실패가 임계치를 넘으면 회로 차단기를 열어 쿨다운 동안 요청을 즉시 거부합니다.
+
+사용 예:
+    limiter = get_rate_limiter("yahoo")
+    response = limiter.call(lambda: session.get(url, params=params), tracker=call)
+"""
+import random
+import threading
+import time
+
+
+class CircuitOpenError(Exception):
+    """회로 차단기가 열려 있어 요청을 보내지 않았을 때 발생하는 예외"""
+
+
+# 연속 실패로 집계하는 인증 오류 상태 코드 (잘못되거나 만료된 API 키)
+AUTH_ERROR_STATUSES = (401, 403)
+
+# 제공자별 기본 설정 (속도 단위: 초당 요청 수)
+PROVIDER_LIMITS = {
+    # FRED: 분당 120건 제한
+    "fred": {"initial_rate": 2.0, "min_rate": 0.2, "max_rate": 2.0, "additive_increase": 0.1},
+    # Yahoo Finance Chart API: 공식 제한은 없지만 과도한 요청 시 429 반환
+    "yahoo": {"initial_rate": 1.0, "min_rate": 0.1, "max_rate": 5.0, "additive_increase": 0.2},
+    # Alpha Vantage: 무료 플랜 분당 5건 수준, 스로틀 시 200 응답에 Note/Information 메시지 반환
+    "alpha_vantage": {"initial_rate": 0.2, "min_rate": 0.02, "max_rate": 1.0, "additive_increase": 0.02,
+                      "max_retries": 2},
+}
+
+
+class AdaptiveRateLimiter:
+    """AIMD 속도 조절, 지수 백오프, 회로 차단기를 갖춘 제공자별 속도 제한기"""
+
+    def __init__(self, name, initial_rate=1.0, min_rate=0.1, max_rate=5.0, additive_increase=0.1,
+                 multiplicative_decrease=0.5, max_retries=4, base_backoff=1.0, max_backoff=60.0,
+                 failure_threshold=5, cooldown=60.0):
+        self.name = name
+        self.rate = initial_rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.additive_increase = additive_increase
+        self.multiplicative_decrease = multiplicative_decrease
+        self.max_retries = max_retries
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
+        self._consecutive_failures = 0
+        self._open_until = 0.0
+        self._random = random.Random()
+
+    # ---- 속도 제어 ----
+
+    def acquire(self):
+        """현재 속도에 맞는 다음 요청 시점까지 대기합니다."""
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + 1.0 / self.rate
+        delay = slot - now
+        if delay > 0:
+            time.sleep(delay)
+
+    def on_success(self):
+        with self._lock:
+            self.rate = min(self.max_rate, self.rate + self.additive_increase)
+            self._consecutive_failures = 0
+            self._open_until = 0.0
+
+    def on_throttle(self):
+        with self._lock:
+            self.rate = max(self.min_rate, self.rate * self.multiplicative_decrease)
+            self._register_failure()
+
+    def on_failure(self):
+        with self._lock:
+            self._register_failure()
+
+    def _register_failure(self):
+        # self._lock을 잡은 상태에서 호출
+        self._consecutive_failures += 1
+        if self._consecutive_failures >= self.failure_threshold:
+            self._open_until = time.monotonic() + self.cooldown
+
+    # ---- 회로 차단기 ----
+
+    @property
+    def circuit_open(self):
+        return time.monotonic() < self._open_until
+
+    def check_circuit(self):
+        """회로가 열려 있으면 CircuitOpenError를 발생시킵니다."""
+        remaining = self._open_until - time.monotonic()
+        if remaining > 0:
+            raise CircuitOpenError(f"{self.name} 회로 차단기 열림 ({remaining:.0f}초 후 재시도 가능)")
+
+    def wait_until_closed(self):
+        """회로가 열려 있으면 쿨다운이 끝날 때까지 대기합니다 (재시도 패스 전에 사용)."""
+        remaining = self._open_until - time.monotonic()
+        if remaining > 0:
+            print(f"{self.name} 회로 차단기 쿨다운 대기: {remaining:.0f}초")
+            time.sleep(remaining)
+        with self._lock:
+            # 반개방(half-open): 다음 요청 한 번의 결과로 다시 판단
+            self._consecutive_failures = max(0, self.failure_threshold - 1)
+
+    # ---- 요청 실행 ----
+
+    def backoff_delay(self, attempt, retry_after=None):
+        """지수 백오프 + 전체 지터(full jitter) 대기 시간을 계산합니다."""
+        ceiling = min(self.max_backoff, self.base_backoff * (2 ** attempt))
+        delay = self._random.uniform(0, ceiling)
+        if retry_after is not None:
+            delay = max(delay, min(self.max_backoff, retry_after))
+        return delay
+
+    @staticmethod
+    def _retry_after(response):
+        value = response.headers.get("Retry-After") if getattr(response, "headers", None) else None
+        try:
+            return float(value) if value is not None else None
+        except ValueError:
+            return None
+
+    def call(self, send, is_throttled=None, tracker=None):
+        """
+        요청을 속도 제한, 백오프, 회로 차단기 규칙에 따라 실행합니다.
+
+        Args:
+            send (callable): 인자 없이 호출하면 requests 응답 객체를 반환하는 함수
+            is_throttled (callable, optional): 200 응답이라도 스로틀로 간주할지 판단하는 함수
+            tracker (optional): 텔레메트리 추적기. 재시도 횟수를 기록합니다.
+
+        Returns:
+            마지막 응답 객체. 재시도를 모두 소진하면 마지막 429/5xx 응답을 그대로 반환합니다.
+            429 이외의 4xx 응답은 재시도하지 않고 바로 반환합니다.
+
+        Raises:
+            CircuitOpenError: 회로 차단기가 열려 있는 경우
+            OSError: 네트워크 오류가 재시도 후에도 계속되는 경우
+        """
+        response = None
+        for attempt in range(self.max_retries + 1):
+            if tracker is not None:
+                tracker.retries = attempt
+            self.check_circuit()
+            self.acquire()
+
+            try:
+                response = send()
+            except OSError as e:
+                # requests의 연결/타임아웃 오류 (RequestException은 OSError의 하위 클래스)
+                self.on_failure()
+                if attempt >= self.max_retries:
+                    raise
+                delay = self.backoff_delay(attempt)
+                print(f"{self.name} 요청 오류 ({e.__class__.__name__}), {delay:.1f}초 후 재시도 ({attempt + 1}/{self.max_retries})")
+                time.sleep(delay)
+                continue
+
+            status = response.status_code
+            throttled = status == 429 or (status == 200 and is_throttled is not None and is_throttled(response))
+            if throttled:
+                self.on_throttle()
+            elif status >= 500:
+                self.on_failure()
+            elif status < 400:
+                self.on_success()
+                return response
+            else:
+                # 그 밖의 4xx는 재시도해도 같은 결과이므로 바로 반환 (속도는 올리지 않음)
+                # 인증 오류(401/403)는 키 문제일 수 있으므로 연속 실패로 집계해 회로 차단기에 반영
+                if status in AUTH_ERROR_STATUSES:
+                    self.on_failure()
+                return response
+
+            if attempt >= self.max_retries:
+                break
+            delay = self.backoff_delay(attempt, self._retry_after(response))
+            print(f"{self.name} 응답 {status}{' (스로틀)' if throttled else ''}, "
+                  f"{delay:.1f}초 후 재시도 ({attempt + 1}/{self.max_retries}), 현재 속도 {self.rate:.2f}req/s")
+            time.sleep(delay)
+
+        return response
+
+    def status(self):
+        """현재 속도와 회로 상태를 반환합니다."""
+        return {
+            "provider": self.name,
+            "rate_per_sec": round(self.rate, 3),
+            "consecutive_failures": self._consecutive_failures,
+            "circuit_open": self.circuit_open,
+        }
+
+
+_limiters = {}
+_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(provider):
+    """제공자별 속도 제한기 싱글톤을 반환합니다."""
+    with _limiters_lock:
+        limiter = _limiters.get(provider)
+        if limiter is None:
+            limiter = AdaptiveRateLimiter(provider, **PROVIDER_LIMITS.get(provider, {}))
+            _limiters[provider] = limiter
+        return limiter
+
+
+def get_rate_limiter_status():
+    """생성된 모든 제공자별 속도 제한기의 현재 상태를 반환합니다."""
+    with _limiters_lock:
+        limiters = list(_limiters.values())
+    return [limiter.status() for limiter in limiters]
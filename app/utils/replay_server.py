@@ -0,0 +1,269 @@
+"""
+외부 데이터 제공자(FRED, Yahoo Finance, Alpha Vantage) 녹화/재생 대역 서버
+
+수집기(collect_economic_data, download_yahoo_chart, fetch_and_store_sentiment_for_recommendations)를
+네트워크 없이 반복 실행하고 벤치마크하기 위한 로컬 HTTP 서버입니다.
+
+- record 모드: 요청을 실제 제공자에게 전달하고 응답을 카세트 디렉터리에 저장합니다.
+- replay 모드: 저장된 응답을 재생합니다. 지연, 429, 서버 오류를 주입할 수 있습니다.
+
+수집기는 다음 환경 변수로 이 서버를 바라보게 합니다.
+    FRED_BASE_URL=http://127.0.0.1:8765
+    YAHOO_CHART_BASE_URL=http://127.0.0.1:8765
+    ALPHA_VANTAGE_BASE_URL=http://127.0.0.1:8765
+
+사용법:
+    python -m app.utils.replay_server --mode record --port 8765
+    python -m app.utils.replay_server --mode replay --latency-ms 150 --throttle-rate 0.05 --error-rate 0.02
+"""
+import argparse
+import glob
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+import urllib.error
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+# 경로 접두사별 실제 제공자 주소
+UPSTREAMS = {
+    "/fred/": ("fred", "https://api.stlouisfed.org"),
+    "/v8/finance/chart/": ("yahoo", "https://query1.finance.yahoo.com"),
+    "/query": ("alpha_vantage", "https://www.alphavantage.co"),
+}
+
+# 카세트 키에서 항상 제외하는 파라미터 (API 키는 카세트에 남기지 않음)
+SECRET_PARAMS = {"apikey", "api_key"}
+
+# 실행 날짜에 따라 달라지는 파라미터: 정확히 일치하는 카세트가 없으면 이 값들을 무시하고 재생
+VOLATILE_PARAMS = {"time_from", "observation_start", "observation_end", "range", "period1", "period2"}
+
+STATS_PATH = "/__replay__/stats"
+
+
+def resolve_upstream(path):
+    """요청 경로에 해당하는 (제공자명, 실제 주소)를 반환합니다."""
+    for prefix, upstream in UPSTREAMS.items():
+        if path.startswith(prefix):
+            return upstream
+    return None, None
+
+
+def cassette_keys(path, query):
+    """요청에 대한 (정확한 키, 느슨한 키)를 계산합니다."""
+    params = sorted((k, v) for k, v in parse_qsl(query, keep_blank_values=True) if k not in SECRET_PARAMS)
+    loose_params = [(k, v) for k, v in params if k not in VOLATILE_PARAMS]
+
+    exact = hashlib.sha1(f"{path}?{urlencode(params)}".encode("utf-8")).hexdigest()[:16]
+    loose = hashlib.sha1(f"{path}?{urlencode(loose_params)}".encode("utf-8")).hexdigest()[:16]
+    return exact, loose
+
+
+class ReplayState:
+    """서버 설정과 통계 (모든 요청 스레드가 공유)"""
+
+    def __init__(self, mode, cassette_dir, latency_ms=0, latency_jitter_ms=0,
+                 throttle_rate=0.0, error_rate=0.0, retry_after=1, seed=None):
+        self.mode = mode
+        self.cassette_dir = cassette_dir
+        self.latency_ms = latency_ms
+        self.latency_jitter_ms = latency_jitter_ms
+        self.throttle_rate = throttle_rate
+        self.error_rate = error_rate
+        self.retry_after = retry_after
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.stats = {
+            "requests": 0,
+            "served": 0,
+            "recorded": 0,
+            "misses": 0,
+            "injected_429": 0,
+            "injected_errors": 0,
+            "by_provider": {},
+        }
+
+    def count(self, key, provider=None):
+        with self.lock:
+            self.stats[key] += 1
+            if provider:
+                provider_stats = self.stats["by_provider"].setdefault(provider, {})
+                provider_stats[key] = provider_stats.get(key, 0) + 1
+
+    def draw(self):
+        with self.lock:
+            return self.random.random()
+
+    def cassette_path(self, provider, exact, loose):
+        return os.path.join(self.cassette_dir, provider, f"{loose}__{exact}.json")
+
+    def find_cassette(self, provider, exact, loose):
+        """정확히 일치하는 카세트를 우선 찾고, 없으면 느슨한 키로 가장 최근 녹화본을 찾습니다."""
+        exact_path = self.cassette_path(provider, exact, loose)
+        if os.path.exists(exact_path):
+            return exact_path
+        candidates = glob.glob(os.path.join(self.cassette_dir, provider, f"{loose}__*.json"))
+        if not candidates:
+            return None
+        return max(candidates, key=os.path.getmtime)
+
+
+class ReplayHandler(BaseHTTPRequestHandler):
+    """녹화/재생 요청 처리기"""
+
+    server_version = "StockmaruReplay/1.0"
+
+    @property
+    def state(self):
+        return self.server.state
+
+    def log_message(self, format, *args):
+        # 벤치마크 중 콘솔 출력 비용을 줄이기 위해 요청 로그는 생략
+        pass
+
+    def do_GET(self):
+        split = urlsplit(self.path)
+        if split.path == STATS_PATH:
+            with self.state.lock:
+                body = json.dumps(self.state.stats, ensure_ascii=False).encode("utf-8")
+            self._send(200, body, "application/json; charset=utf-8")
+            return
+
+        provider, upstream = resolve_upstream(split.path)
+        if provider is None:
+            self._send(404, json.dumps({"error": f"unknown path: {split.path}"}).encode("utf-8"), "application/json")
+            return
+
+        self.state.count("requests", provider)
+        exact, loose = cassette_keys(split.path, split.query)
+
+        if self.state.mode == "record":
+            self._record(provider, upstream, exact, loose)
+        else:
+            self._replay(provider, exact, loose)
+
+    def _record(self, provider, upstream, exact, loose):
+        url = f"{upstream}{self.path}"
+        request = urllib.request.Request(url, headers={"User-Agent": self.headers.get("User-Agent", "Mozilla/5.0")})
+        try:
+            with urllib.request.urlopen(request, timeout=60) as response:
+                status = response.status
+                content_type = response.headers.get("Content-Type", "application/json")
+                body = response.read()
+        except urllib.error.HTTPError as e:
+            status = e.code
+            content_type = e.headers.get("Content-Type", "application/json")
+            body = e.read()
+        except Exception as e:
+            self._send(502, json.dumps({"error": f"upstream error: {e}"}).encode("utf-8"), "application/json")
+            return
+
+        # 성공 응답만 카세트로 저장 (429/오류는 재생 시 주입 옵션으로 재현)
+        if status == 200:
+            path = self.state.cassette_path(provider, exact, loose)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump({
+                    "path": urlsplit(self.path).path,
+                    "status": status,
+                    "content_type": content_type,
+                    "body": body.decode("utf-8", errors="replace"),
+                    "recorded_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                }, f, ensure_ascii=False)
+            self.state.count("recorded", provider)
+
+        self._send(status, body, content_type)
+
+    def _replay(self, provider, exact, loose):
+        state = self.state
+
+        # 지연 주입
+        if state.latency_ms or state.latency_jitter_ms:
+            delay_ms = state.latency_ms + state.draw() * state.latency_jitter_ms
+            time.sleep(delay_ms / 1000.0)
+
+        # 429 주입
+        if state.throttle_rate and state.draw() < state.throttle_rate:
+            state.count("injected_429", provider)
+            self._send(429, b'{"error": "Too Many Requests"}', "application/json",
+                       extra_headers={"Retry-After": str(state.retry_after)})
+            return
+
+        # 서버 오류 주입
+        if state.error_rate and state.draw() < state.error_rate:
+            state.count("injected_errors", provider)
+            self._send(503, b'{"error": "Service Unavailable"}', "application/json")
+            return
+
+        path = state.find_cassette(provider, exact, loose)
+        if path is None:
+            state.count("misses", provider)
+            self._send(404, json.dumps({"error": "no recorded response", "path": self.path.split("?")[0]}).encode("utf-8"),
+                       "application/json")
+            return
+
+        with open(path, "r", encoding="utf-8") as f:
+            cassette = json.load(f)
+        state.count("served", provider)
+        self._send(cassette["status"], cassette["body"].encode("utf-8"), cassette["content_type"])
+
+    def _send(self, status, body, content_type, extra_headers=None):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (extra_headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def create_server(host="127.0.0.1", port=8765, **state_kwargs):
+    """설정된 대역 서버 인스턴스를 생성합니다 (serve_forever는 호출하지 않음)."""
+    server = ThreadingHTTPServer((host, port), ReplayHandler)
+    server.daemon_threads = True
+    server.state = ReplayState(**state_kwargs)
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="FRED/Yahoo/Alpha Vantage 녹화·재생 대역 서버")
+    parser.add_argument("--mode", choices=["record", "replay"], default="replay")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--cassettes", default="replay_cassettes", help="카세트 저장 디렉터리")
+    parser.add_argument("--latency-ms", type=float, default=0, help="재생 응답마다 추가할 고정 지연(ms)")
+    parser.add_argument("--latency-jitter-ms", type=float, default=0, help="고정 지연에 더할 무작위 지연 상한(ms)")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="429 응답을 주입할 확률 (0~1)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="503 응답을 주입할 확률 (0~1)")
+    parser.add_argument("--retry-after", type=int, default=1, help="주입된 429 응답의 Retry-After(초)")
+    parser.add_argument("--seed", type=int, default=None, help="주입 난수 시드 (반복 가능한 벤치마크용)")
+    args = parser.parse_args()
+
+    server = create_server(
+        host=args.host,
+        port=args.port,
+        mode=args.mode,
+        cassette_dir=args.cassettes,
+        latency_ms=args.latency_ms,
+        latency_jitter_ms=args.latency_jitter_ms,
+        throttle_rate=args.throttle_rate,
+        error_rate=args.error_rate,
+        retry_after=args.retry_after,
+        seed=args.seed,
+    )
+    print(f"대역 서버 시작 ({args.mode} 모드): http://{args.host}:{args.port} (카세트: {args.cassettes})")
+    print(f"통계: http://{args.host}:{args.port}{STATS_PATH}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
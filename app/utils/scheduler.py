@@ -8,7 +8,7 @@ from app.services.stock_recommendation_service import StockRecommendationService
 from app.services.balance_service import get_current_price, order_overseas_stock, get_all_overseas_balances
 from app.core.config import settings
 import logging
-from app.services.economic_service import update_economic_data_in_background
+from app.services.economic_service import submit_economic_data_update
 
 # 로깅 설정
 logging.basicConfig(
@@ -273,7 +273,7 @@ class StockScheduler:
             return
 
         # get_combined_recommendations_with_technical_and_sentiment() 호출하여 매수 대상 종목 추출
-        # 이 함수는 위의 매수 조건을 모두 확인하여 필터링된 결과를 반환함
+        # 위의 매수 조건으로 미리 계산된 결정 스냅샷을 반환함 (상위 테이블이 바뀐 경우에만 다시 계산)
         recommendations = self.recommendation_service.get_combined_recommendations_with_technical_and_sentiment()
 
         if not recommendations or not recommendations.get("results"):
@@ -294,18 +294,8 @@ class StockScheduler:
                 ticker = candidate["ticker"]
                 stock_name = candidate["stock_name"]
 
-                # 매수 근거 로그 출력
-                tech_conditions = [candidate.get("golden_cross"), candidate.get("rsi", 100) < 50, candidate.get("macd_buy_signal")]
-                tech_count = sum(tech_conditions)
-                has_sentiment = candidate.get("sentiment_score") is not None and candidate.get("sentiment_score", 0) >= 0.15
-
-                buy_reason = ""
-                if has_sentiment and tech_count >= 2:
-                    buy_reason = f"조건 A (감정 점수 {candidate.get('sentiment_score', 0):.3f} + 기술지표 {tech_count}/3개)"
-                elif tech_count >= 3:
-                    buy_reason = f"조건 B (기술지표 {tech_count}/3개 만족)"
-                else:
-                    buy_reason = "알 수 없음"
+                # 매수 근거 로그 출력 (결정 스냅샷에서 계산된 근거)
+                buy_reason = candidate.get("buy_reason") or "알 수 없음"
 
                 logger.info(f"{stock_name}({ticker}) 매수 근거: {buy_reason}")
                 logger.info(f"  - AI 예측: Accuracy {candidate.get('accuracy', 0):.1f}%, Rise Probability {candidate.get('rise_probability', 0):.1f}%")
@@ -428,7 +418,8 @@ def _run_economic_data_update():
     try:
         logger = logging.getLogger('economic_scheduler')
         logger.info("경제 데이터 업데이트 작업 시작")
-        asyncio.run(update_economic_data_in_background())
+        # 전용 작업자 스레드에 제출하고 완료를 기다림 (이미 실행 중이면 그 작업을 기다림)
+        submit_economic_data_update().result()
         logger.info("경제 데이터 업데이트 작업 완료")
         return True
     except Exception as e:
@@ -0,0 +1,290 @@
+"""
+외부 데이터 수집 텔레메트리
+
+FRED, Yahoo Finance, Alpha Vantage 요청마다 지연 시간, 응답 크기, HTTP 상태, 재시도 횟수,
+반환 행 수를 기록하고 수집 실행(run) 단위로 요약합니다.
+
+실행은 start_run()이 반환한 run_id로 구분하며, start_run을 호출한 컨텍스트(스레드/작업)에서는
+그 실행이 현재 실행이 되어 track()이 run_id 없이도 해당 실행에 기록합니다. 여러 작업(감성 수집,
+경제 데이터 수집 작업자, 백필 스레드 풀)이 동시에 실행되어도 서로의 실행에 섞이지 않습니다.
+다른 스레드에서 같은 실행에 기록하려면 run_id를 넘기거나 bind(run_id) 안에서 호출합니다.
+
+사용 예:
+    run_id = collection_telemetry.start_run("collect_economic_data")
+    with collection_telemetry.track("fred", "DGS10") as call:
+        response = requests.get(url, params=params)
+        call.response(response)
+        call.rows = len(observations)
+    collection_telemetry.finish_run(run_id)
+"""
+import contextlib
+import contextvars
+import threading
+import time
+import uuid
+from collections import deque
+from datetime import datetime
+
+# 지연 시간 히스토그램 버킷 상한 (ms). 마지막 버킷은 그 이상 전부
+LATENCY_BUCKETS_MS = (50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+# 현재 컨텍스트의 수집 실행 (start_run/bind에서 설정)
+_active_run = contextvars.ContextVar("collection_telemetry_run", default=None)
+
+
+def _percentile(sorted_values, q):
+    """정렬된 리스트에서 q(0~100) 분위수를 계산합니다 (최근접 순위 방식)."""
+    if not sorted_values:
+        return None
+    rank = max(0, min(len(sorted_values) - 1, int(round(q / 100.0 * (len(sorted_values) - 1)))))
+    return sorted_values[rank]
+
+
+def _histogram(latencies_ms):
+    """지연 시간 목록을 LATENCY_BUCKETS_MS 기준 히스토그램으로 변환합니다."""
+    labels = [f"<={bound}ms" for bound in LATENCY_BUCKETS_MS] + [f">{LATENCY_BUCKETS_MS[-1]}ms"]
+    counts = [0] * len(labels)
+    for latency in latencies_ms:
+        for i, bound in enumerate(LATENCY_BUCKETS_MS):
+            if latency <= bound:
+                counts[i] += 1
+                break
+        else:
+            counts[-1] += 1
+    return dict(zip(labels, counts))
+
+
+class _RequestTracker:
+    """요청 하나의 텔레메트리를 수집하는 컨텍스트 매니저"""
+
+    def __init__(self, telemetry, source, series, run_id=None):
+        self.telemetry = telemetry
+        self.source = source
+        self.series = series
+        self.run_id = run_id
+        self.status = None
+        self.bytes = 0
+        self.retries = 0
+        self.rows = None
+        self.error = None
+        self._started = None
+
+    def response(self, response):
+        """requests 응답 객체에서 상태 코드와 응답 크기를 기록합니다."""
+        self.status = response.status_code
+        self.bytes += len(response.content or b"")
+        return response
+
+    def __enter__(self):
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        latency_ms = (time.perf_counter() - self._started) * 1000.0
+        if exc is not None and self.error is None:
+            self.error = f"{exc_type.__name__}: {exc}"
+        self.telemetry.record(
+            source=self.source,
+            series=self.series,
+            latency_ms=latency_ms,
+            bytes=self.bytes,
+            status=self.status,
+            retries=self.retries,
+            rows=self.rows,
+            error=self.error,
+            run_id=self.run_id,
+        )
+        # 예외는 호출자에게 그대로 전달
+        return False
+
+
+class CollectionTelemetry:
+    """수집 실행 단위로 요청 텔레메트리를 보관하고 요약하는 클래스"""
+
+    def __init__(self, max_runs=20):
+        self._lock = threading.Lock()
+        self._runs = deque(maxlen=max_runs)
+        self._adhoc = None
+
+    @staticmethod
+    def _new_run(name):
+        return {
+            "run_id": uuid.uuid4().hex[:12],
+            "name": name,
+            "started_at": datetime.now().isoformat(timespec="seconds"),
+            "finished_at": None,
+            "requests": [],
+        }
+
+    def _find(self, run_id):
+        # self._lock 안에서 호출
+        for run in self._runs:
+            if run["run_id"] == run_id:
+                return run
+        return None
+
+    def start_run(self, name):
+        """새 수집 실행을 시작해 현재 컨텍스트의 실행으로 지정하고 run_id를 반환합니다."""
+        run = self._new_run(name)
+        with self._lock:
+            self._runs.append(run)
+        _active_run.set(run["run_id"])
+        return run["run_id"]
+
+    def finish_run(self, run_id=None):
+        """
+        수집 실행을 종료하고 요약을 반환합니다.
+
+        Args:
+            run_id (str, optional): 종료할 실행 (기본값: 현재 컨텍스트의 실행)
+        """
+        if run_id is None:
+            run_id = _active_run.get()
+        if _active_run.get() == run_id:
+            _active_run.set(None)
+        if run_id is None:
+            return None
+        with self._lock:
+            run = self._find(run_id)
+            if run is None:
+                return None
+            run["finished_at"] = datetime.now().isoformat(timespec="seconds")
+        return self.summarize(run)
+
+    @contextlib.contextmanager
+    def bind(self, run_id):
+        """블록 안에서 run_id를 현재 컨텍스트의 실행으로 지정합니다 (스레드 풀 작업자에서 사용)."""
+        token = _active_run.set(run_id)
+        try:
+            yield run_id
+        finally:
+            _active_run.reset(token)
+
+    def track(self, source, series, run_id=None):
+        """요청 하나를 추적하는 컨텍스트 매니저를 반환합니다 (run_id가 없으면 현재 컨텍스트의 실행에 기록)."""
+        return _RequestTracker(self, source, series, run_id=run_id or _active_run.get())
+
+    def record(self, source, series, latency_ms, bytes=0, status=None, retries=0, rows=None, error=None,
+               run_id=None):
+        """
+        요청 하나의 텔레메트리를 실행에 기록합니다.
+        run_id가 없고 현재 컨텍스트에도 실행이 없으면(수집 작업 밖의 단건 요청) 상시 "adhoc" 실행에 모읍니다.
+        """
+        entry = {
+            "source": source,
+            "series": series,
+            "latency_ms": round(latency_ms, 2),
+            "bytes": bytes,
+            "status": status,
+            "retries": retries,
+            "rows": rows,
+            "error": error,
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+        }
+        run_id = run_id or _active_run.get()
+        with self._lock:
+            run = self._find(run_id) if run_id is not None else None
+            if run is None:
+                run = self._adhoc_run()
+                run["finished_at"] = entry["timestamp"]
+            run["requests"].append(entry)
+
+    def _adhoc_run(self):
+        # self._lock 안에서 호출. 보관 목록에서 밀려났으면 새로 만듦
+        if self._adhoc is None or self._find(self._adhoc["run_id"]) is None:
+            self._adhoc = self._new_run("adhoc")
+            self._runs.append(self._adhoc)
+        return self._adhoc
+
+    @staticmethod
+    def _is_failure(entry):
+        return entry["error"] is not None or entry["status"] is None or not (200 <= entry["status"] < 300)
+
+    def summarize(self, run):
+        """실행 하나의 제공자별/시리즈별 요약을 계산합니다."""
+        with self._lock:
+            requests = list(run["requests"])
+
+        by_source = {}
+        for entry in requests:
+            by_source.setdefault(entry["source"], []).append(entry)
+
+        sources = {}
+        for source, entries in by_source.items():
+            latencies = sorted(e["latency_ms"] for e in entries)
+            sources[source] = {
+                "requests": len(entries),
+                "failures": sum(1 for e in entries if self._is_failure(e)),
+                "empty": sum(1 for e in entries if not self._is_failure(e) and e["rows"] == 0),
+                "retries": sum(e["retries"] for e in entries),
+                "bytes": sum(e["bytes"] for e in entries),
+                "rows": sum(e["rows"] or 0 for e in entries),
+                "status_counts": self._status_counts(entries),
+                "latency_ms": {
+                    "p50": _percentile(latencies, 50),
+                    "p95": _percentile(latencies, 95),
+                    "max": latencies[-1] if latencies else None,
+                    "total": round(sum(latencies), 2),
+                    "histogram": _histogram(latencies),
+                },
+            }
+
+        slowest = sorted(requests, key=lambda e: e["latency_ms"], reverse=True)[:10]
+        failed = [e for e in requests if self._is_failure(e) or e["rows"] == 0]
+
+        return {
+            "run_id": run["run_id"],
+            "name": run["name"],
+            "started_at": run["started_at"],
+            "finished_at": run["finished_at"],
+            "total_requests": len(requests),
+            "sources": sources,
+            "slowest_series": [
+                {k: e[k] for k in ("source", "series", "latency_ms", "status", "retries", "rows")}
+                for e in slowest
+            ],
+            "failed_series": [
+                {k: e[k] for k in ("source", "series", "status", "retries", "rows", "error")}
+                for e in failed
+            ],
+        }
+
+    @staticmethod
+    def _status_counts(entries):
+        counts = {}
+        for e in entries:
+            key = str(e["status"]) if e["status"] is not None else "error"
+            counts[key] = counts.get(key, 0) + 1
+        return counts
+
+    def get_summary(self, run_id=None):
+        """run_id의 요약을 반환합니다. 지정하지 않으면 가장 최근 실행의 요약을 반환합니다."""
+        with self._lock:
+            runs = list(self._runs)
+        if not runs:
+            return None
+        if run_id is None:
+            return self.summarize(runs[-1])
+        for run in runs:
+            if run["run_id"] == run_id:
+                return self.summarize(run)
+        return None
+
+    def list_runs(self):
+        """보관 중인 실행 목록을 최신순으로 반환합니다."""
+        with self._lock:
+            runs = list(self._runs)
+        return [
+            {
+                "run_id": run["run_id"],
+                "name": run["name"],
+                "started_at": run["started_at"],
+                "finished_at": run["finished_at"],
+                "total_requests": len(run["requests"]),
+            }
+            for run in reversed(runs)
+        ]
+
+
+# 싱글톤 인스턴스 생성
+collection_telemetry = CollectionTelemetry()
@@ -0,0 +1,4 @@
+from app.services.economic_backfill import main
+
+if __name__ == "__main__":
+    main()
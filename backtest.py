@@ -0,0 +1,4 @@
+from app.services.backtest import main
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,188 @@
+"""
+지표 커널 벤치마크
+
+indicator_kernels 레지스트리의 NumPy 커널과 기존 pandas 계산(종목별 Series에 rolling/ewm 적용,
+StockRecommendationService.calculate_*와 같은 식)을 같은 임의 가격 행렬로 실행해
+속도와 값 일치 여부, 증분 갱신(update) 결과가 전체 재계산과 같은지 비교합니다.
+
+    python benchmark_indicators.py                          # 27, 500, 5000 종목 × 250일, 전체 커널
+    python benchmark_indicators.py --tickers 27 500 --rows 180 --kernels sma20 rsi macd
+    python benchmark_indicators.py --skip-pandas-above 500  # 큰 규모는 커널만 측정
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from app.services.indicator_kernels import KERNELS, compute_kernels, get_kernel, update_kernels
+
+TOLERANCE = 1e-9
+
+
+def _ema(series, span):
+    return series.ewm(span=span, adjust=False).mean()
+
+
+def _diff_gain_loss(close):
+    delta = close.diff()
+    return delta.where(delta > 0, 0), -delta.where(delta < 0, 0)
+
+
+def _pandas_rsi(close, period):
+    gain, loss = _diff_gain_loss(close)
+    return 100 - (100 / (1 + gain.rolling(window=period).mean() / loss.rolling(window=period).mean()))
+
+
+def _pandas_wilder_rsi(close, period):
+    gain, loss = _diff_gain_loss(close)
+    avg_gain = gain.ewm(alpha=1.0 / period, adjust=False).mean()
+    avg_loss = loss.ewm(alpha=1.0 / period, adjust=False).mean()
+    return 100 - (100 / (1 + avg_gain / avg_loss))
+
+
+def _pandas_macd(close, kernel):
+    macd = _ema(close, kernel.short_period) - _ema(close, kernel.long_period)
+    return {"MACD": macd, "Signal": _ema(macd, kernel.signal_period)}
+
+
+def _pandas_bollinger(close, kernel):
+    middle = close.rolling(window=kernel.period).mean()
+    std = close.rolling(window=kernel.period).std()
+    return {"BB_middle": middle, "BB_upper": middle + kernel.num_std * std, "BB_lower": middle - kernel.num_std * std}
+
+
+def _pandas_atr(high, low, close, period):
+    prev_close = close.shift(1)
+    true_range = pd.concat([high - low, (high - prev_close).abs(), (low - prev_close).abs()], axis=1).max(axis=1)
+    return true_range.ewm(alpha=1.0 / period, adjust=False).mean()
+
+
+def pandas_reference(name, series):
+    """
+    기존 방식: 종목 하나의 Series에 pandas 지표 계산을 적용합니다.
+
+    Args:
+        name (str): 커널 이름
+        series (dict): 입력명 → pd.Series
+
+    Returns:
+        dict: 출력명 → pd.Series (커널 출력 중 비교 대상만)
+    """
+    kernel = get_kernel(name)
+    close = series["close"]
+    if name.startswith("sma"):
+        return {kernel.outputs[0]: close.rolling(window=kernel.period).mean()}
+    if name == "rsi":
+        return {"RSI": _pandas_rsi(close, kernel.period)}
+    if name == "rsi_wilder":
+        return {"RSI_Wilder": _pandas_wilder_rsi(close, kernel.period)}
+    if name == "macd":
+        return _pandas_macd(close, kernel)
+    if name == "bollinger":
+        return _pandas_bollinger(close, kernel)
+    if name == "atr":
+        return {"ATR": _pandas_atr(series["high"], series["low"], close, kernel.period)}
+    return None
+
+
+def make_prices(rows, tickers, seed=0, gap_ratio=0.002):
+    """임의 보행 종가와 고가/저가 행렬 (상장 전 구간과 중간 결측 포함)."""
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, (rows, tickers)), axis=0))
+    spread = np.abs(rng.normal(0, 0.01, (rows, tickers))) * close
+    high, low = close + spread, close - spread
+    # 일부 종목은 늦게 상장, 일부 셀은 결측
+    late = rng.choice(tickers, size=max(1, tickers // 20), replace=False)
+    close[: rows // 4, late] = np.nan
+    gaps = rng.random((rows, tickers)) < gap_ratio
+    close[gaps] = np.nan
+    high[np.isnan(close)] = np.nan
+    low[np.isnan(close)] = np.nan
+    return {"close": close, "high": high, "low": low}
+
+
+def _best_time(fn, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def _max_diff(a, b):
+    """NaN 위치가 다르면 inf, 같으면 최대 절대 오차."""
+    if not np.array_equal(np.isnan(a), np.isnan(b)):
+        return float("inf")
+    finite = ~np.isnan(a)
+    return float(np.max(np.abs(a[finite] - b[finite]))) if finite.any() else 0.0
+
+
+def benchmark_kernel(name, data, repeat=3, run_pandas=True):
+    kernel = get_kernel(name)
+    inputs = {key: data[key] for key in kernel.inputs}
+    outputs, _ = compute_kernels(inputs, [name])
+    kernel_seconds = _best_time(lambda: compute_kernels(inputs, [name]), repeat)
+
+    # 증분 갱신: 마지막 행을 제외하고 계산한 뒤 한 행만 update → 전체 계산의 마지막 행과 비교
+    _, states = compute_kernels({key: values[:-1] for key, values in inputs.items()}, [name])
+    updated = update_kernels(states, {key: values[-1] for key, values in inputs.items()})
+    update_diff = max(_max_diff(updated[key][None, :], outputs[key][-1:]) for key in kernel.outputs)
+
+    result = {"kernel": name, "kernel_ms": kernel_seconds * 1000, "update_diff": update_diff,
+              "pandas_ms": None, "speedup": None, "max_diff": None}
+    if not run_pandas:
+        return result
+
+    tickers = inputs["close"].shape[1]
+    columns = {key: [pd.Series(values[:, i]) for i in range(tickers)] for key, values in inputs.items()}
+
+    def run_reference():
+        return [pandas_reference(name, {key: columns[key][i] for key in columns}) for i in range(tickers)]
+
+    start = time.perf_counter()
+    reference = run_reference()
+    pandas_seconds = time.perf_counter() - start
+
+    max_diff = 0.0
+    for key in reference[0]:
+        expected = np.column_stack([ref[key].to_numpy(dtype=np.float64) for ref in reference])
+        max_diff = max(max_diff, _max_diff(outputs[key], expected))
+    result.update(pandas_ms=pandas_seconds * 1000, speedup=pandas_seconds / kernel_seconds, max_diff=max_diff)
+    return result
+
+
+def _fmt(value, pattern):
+    return "-" if value is None else pattern.format(value)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="지표 커널 속도/정확도 벤치마크 (NumPy 커널 vs 종목별 pandas)")
+    parser.add_argument("--tickers", type=int, nargs="+", default=[27, 500, 5000], help="종목 수 목록")
+    parser.add_argument("--rows", type=int, default=250, help="날짜 행 수")
+    parser.add_argument("--kernels", nargs="+", default=None, help="커널 이름 (기본값: 등록된 전체)")
+    parser.add_argument("--repeat", type=int, default=3, help="커널 반복 측정 횟수 (최솟값 사용)")
+    parser.add_argument("--skip-pandas-above", type=int, default=None, help="이 종목 수보다 크면 pandas 비교 생략")
+    args = parser.parse_args()
+
+    names = args.kernels or sorted(KERNELS)
+    failed = False
+    print(f"{'종목':>6} {'커널':<12} {'NumPy(ms)':>10} {'pandas(ms)':>11} {'배속':>8} {'최대오차':>10} {'증분오차':>10}")
+    for tickers in args.tickers:
+        data = make_prices(args.rows, tickers)
+        run_pandas = args.skip_pandas_above is None or tickers <= args.skip_pandas_above
+        for name in names:
+            result = benchmark_kernel(name, data, repeat=args.repeat, run_pandas=run_pandas)
+            ok = result["update_diff"] <= TOLERANCE and (result["max_diff"] is None or result["max_diff"] <= TOLERANCE)
+            failed = failed or not ok
+            print(f"{tickers:>6} {name:<12} {result['kernel_ms']:>10.2f} {_fmt(result['pandas_ms'], '{:.1f}'):>11} "
+                  f"{_fmt(result['speedup'], '{:.1f}x'):>8} {_fmt(result['max_diff'], '{:.1e}'):>10} "
+                  f"{result['update_diff']:>10.1e}{'' if ok else '  불일치'}")
+    if failed:
+        raise SystemExit(f"허용 오차({TOLERANCE})를 넘는 커널이 있습니다.")
+
+
+if __name__ == "__main__":
+    main()
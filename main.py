@@ -24,6 +24,7 @@ class UnicodeJSONResponse(JSONResponse):
 from dbConnection import supabase
 from getBalance import get_domestic_balance
 import stock  # stock.py 모듈 임포트
+from app.services.economic_ingest import DATA_COLUMNS, upsert_frame
 
 # API 라우터 임포트
 from app.api.routes import stock_management
@@ -131,65 +132,15 @@ async def update_economic_data(background_tasks: BackgroundTasks):
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"데이터 업데이트 중 오류 발생: {str(e)}")
 
-async def update_data_in_background():
-    """백그라운드에서 데이터를 업데이트하는 함수"""
+def update_data_in_background():
+    """백그라운드에서 데이터를 업데이트하는 함수 (동기 함수이므로 BackgroundTasks가 스레드 풀에서 실행)"""
     try:
         # 이미 처리된 stock.py의 result_df 데이터프레임 사용
         df = stock.result_df
         
-        # 날짜 형식 변환 (인덱스가 날짜인 경우)
-        df = df.reset_index()
-        df['날짜'] = pd.to_datetime(df['date']).dt.date if 'date' in df.columns else pd.to_datetime(df.index).date
-        
-        # 배치 크기 설정 (Supabase는 한 번에 너무 많은 레코드를 처리하지 못할 수 있음)
-        batch_size = 100
+        # 서비스 수집과 같은 공용 기록 경로 사용: DDL 컬럼만 벡터 연산으로 변환 후 배치 upsert
         total_records = len(df)
-        updated_records = 0
-        
-        # 배치 처리
-        for i in range(0, total_records, batch_size):
-            batch = df.iloc[i:min(i+batch_size, total_records)]
-            
-            # 각 레코드를 딕셔너리로 변환하여 Supabase에 업로드
-            records = []
-            for _, row in batch.iterrows():
-                record = {'날짜': str(row['날짜'])}
-                
-                # DDL에 정의된 컬럼만 포함
-                for column in [
-                    '10년 기대 인플레이션율', '장단기 금리차', '기준금리', '미시간대 소비자 심리지수',
-                    '실업률', '2년 만기 미국 국채 수익률', '10년 만기 미국 국채 수익률', '금융스트레스지수',
-                    '개인 소비 지출', '소비자 물가지수', '5년 변동금리 모기지', '미국 달러 환율',
-                    '통화 공급량 M2', '가계 부채 비율', 'GDP 성장률', '나스닥 종합지수',
-                    'S&P 500 지수', '금 가격', '달러 인덱스', '나스닥 100',
-                    'S&P 500 ETF', 'QQQ ETF', '러셀 2000 ETF', '다우 존스 ETF',
-                    'VIX 지수', '닛케이 225', '상해종합', '항셍',
-                    '영국 FTSE', '독일 DAX', '프랑스 CAC 40', '미국 전체 채권시장 ETF',
-                    'TIPS ETF', '투자등급 회사채 ETF', '달러/엔', '달러/위안',
-                    '미국 리츠 ETF', '애플', '마이크로소프트', '아마존',
-                    '구글 A', '구글 C', '메타', '테슬라',
-                    '엔비디아', '코스트코', '넷플릭스', '페이팔',
-                    '인텔', '시스코', '컴캐스트', '펩시코',
-                    '암젠', '허니웰 인터내셔널', '스타벅스', '몬델리즈',
-                    '마이크론', '브로드컴', '어도비', '텍사스 인스트루먼트',
-                    'AMD', '어플라이드 머티리얼즈'
-                ]:
-                    if column in row:
-                        # NaN, inf 값 처리
-                        value = row[column]
-                        if pd.isna(value) or pd.isinf(value):
-                            record[column] = None
-                        else:
-                            record[column] = float(value)
-                    else:
-                        record[column] = None
-                
-                records.append(record)
-            
-            # Upsert 연산 (기존 날짜가 있으면 업데이트, 없으면 삽입)
-            if records:
-                response = supabase.table("economic_and_stock_data").upsert(records).execute()
-                updated_records += len(records)
+        updated_records = upsert_frame(df, columns=DATA_COLUMNS)
         
         print(f"데이터 업데이트 완료: 총 {total_records}개 중 {updated_records}개 업데이트됨")
         
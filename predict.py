@@ -8,11 +8,9 @@ from dotenv import load_dotenv
 # .env 파일 로드
 load_dotenv()
 
-try:
-    from supabase import create_client, Client
-except ImportError:
-    subprocess.check_call([sys.executable, "-m", "pip", "install", "supabase"])
-    from supabase import create_client, Client
+from app.core.config import settings
+from app.db.repository import create_db_client, records_from_frame, LOCAL_BACKENDS
+from app.db.journal import WriteJournal
 import pandas as pd
 import numpy as np
 from sklearn.preprocessing import MinMaxScaler
@@ -74,10 +72,40 @@ print("=" * 50)
 url: str = os.getenv("SUPABASE_URL", "")
 key: str = os.getenv("SUPABASE_KEY", "")
 
-if not url or not key:
-    raise ValueError("SUPABASE_URL과 SUPABASE_KEY가 .env 파일에 설정되어 있어야 합니다.")
+# DB_BACKEND=sqlite/duckdb이면 Supabase 설정 없이 내장 SQL 클라이언트를 사용
+if settings.DB_BACKEND.lower() not in LOCAL_BACKENDS:
+    if not url or not key:
+        raise ValueError("SUPABASE_URL과 SUPABASE_KEY가 .env 파일에 설정되어 있어야 합니다.")
+    try:
+        import supabase as _supabase_package  # noqa: F401
+    except ImportError:
+        subprocess.check_call([sys.executable, "-m", "pip", "install", "supabase"])
+
+supabase = create_db_client(url, key)
+
+# 결과 테이블 쓰기 저널: 이전 실행이 저장 중 종료됐다면 학습 전에 남은 배치부터 반영해
+# 전체 삭제 후 일부만 기록된 상태로 남지 않게 함.
+# 저널 디렉터리는 API 서버와 공유하므로 이 스크립트가 쓰는 작업만 복구합니다.
+PREDICTION_JOBS = ("predicted_stocks", "stock_analysis_results")
+prediction_journal = WriteJournal(client=supabase)
+for _job in PREDICTION_JOBS:
+    prediction_journal.recover(_job)
+
+def replace_table_records(table_name, result_df, chunk_size=100):
+    """
+    테이블 전체를 삭제하고 결과를 chunk_size 단위로 다시 기록합니다.
+    삭제와 배치 목록을 쓰기 저널에 먼저 기록하므로 중간에 종료돼도 다음 실행에서 이어서 반영됩니다.
 
-supabase: Client = create_client(url, key)
+    Returns:
+        int: 기록한 행 수
+    """
+    records = records_from_frame(result_df)
+    operations = [{"op": "delete_all", "table": table_name, "key": "id"}]
+    operations += [
+        {"op": "insert", "table": table_name, "rows": records[i:i + chunk_size]}
+        for i in range(0, len(records), chunk_size)
+    ]
+    return prediction_journal.execute(table_name, operations)
 
 # Supabase에서 데이터 가져오기
 # def get_stock_data_from_db():
@@ -138,6 +166,19 @@ def get_stock_data_from_db():
         print(f"데이터 가져오기 오류: {e}")
         return None
 
+def get_latest_indexed_date():
+    """
+    economic_series_last_value 인덱스에서 가장 최근 유효값 날짜를 조회합니다.
+    인덱스가 없으면 None을 반환합니다.
+    """
+    try:
+        response = supabase.table("economic_series_last_value").select("last_valid_date") \
+            .order("last_valid_date", desc=True).limit(1).execute()
+        return str(response.data[0]["last_valid_date"])[:10] if response.data else None
+    except Exception as e:
+        print(f"마지막 유효값 인덱스 조회 실패: {e}")
+        return None
+
 def get_all_data(table_name, use_cache=True):
     """
     Supabase에서 모든 데이터 가져오기 (캐싱 지원)
@@ -152,9 +193,16 @@ def get_all_data(table_name, use_cache=True):
     if use_cache and os.path.exists(cache_file):
         cache_age = time.time() - os.path.getmtime(cache_file)
         if cache_age < 86400:  # 24시간 = 86400초
-            print(f"캐시된 데이터 사용 (캐시 나이: {cache_age/3600:.1f}시간)")
             with open(cache_file, 'rb') as f:
-                return pickle.load(f)
+                cached = pickle.load(f)
+            # 경제 데이터는 마지막 유효값 인덱스로 캐시 이후 새 데이터가 기록됐는지 확인 (이력 전체 조회 없음)
+            latest_date = get_latest_indexed_date() if table_name == "economic_and_stock_data" else None
+            cached_date = str(cached[-1].get("날짜", ""))[:10] if cached else ""
+            if latest_date and latest_date > cached_date:
+                print(f"캐시({cached_date}) 이후 새 데이터({latest_date})가 있어 다시 로딩합니다.")
+            else:
+                print(f"캐시된 데이터 사용 (캐시 나이: {cache_age/3600:.1f}시간)")
+                return cached
 
     print(f"{table_name} 테이블에서 데이터 로딩 중...")
     all_data = []
@@ -373,19 +421,10 @@ result_data['날짜'] = result_data['날짜'].dt.strftime('%Y-%m-%d')
 # # 결과를 Supabase에 저장
 def save_predictions_to_db(result_df):
     try:
-        # 기존 테이블이 없으면 생성 (predicted_stocks 테이블에 저장)
-        records = result_df.to_dict('records')
+        # 테이블에 먼저 데이터 삭제 후 청크 단위로 새로 삽입 (쓰기 저널로 재개 가능)
+        saved = replace_table_records("predicted_stocks", result_df)
 
-        # 테이블에 먼저 데이터 삭제 후 새로 삽입
-        supabase.table("predicted_stocks").delete().neq("id", 0).execute()
-
-        # 일괄 삽입 (큰 데이터라면 청크로 나누어 삽입)
-        chunk_size = 100
-        for i in range(0, len(records), chunk_size):
-            chunk = records[i:i+chunk_size]
-            response = supabase.table("predicted_stocks").insert(chunk).execute()
-
-        print(f"{len(records)}개의 예측 결과가 데이터베이스에 저장되었습니다.")
+        print(f"{saved}개의 예측 결과가 데이터베이스에 저장되었습니다.")
     except Exception as e:
         print(f"데이터베이스 저장 오류: {e}")
 
@@ -464,19 +503,10 @@ def get_predictions_from_db(chunk_size=1000):
 # 결과를 Supabase에 저장
 def save_analysis_to_db(result_df):
     try:
-        # stock_analysis_results 테이블에 저장
-        records = result_df.to_dict('records')
-
-        # 테이블에 먼저 데이터 삭제 후 새로 삽입
-        supabase.table("stock_analysis_results").delete().neq("id", 0).execute()
-
-        # 일괄 삽입 (큰 데이터라면 청크로 나누어 삽입)
-        chunk_size = 100
-        for i in range(0, len(records), chunk_size):
-            chunk = records[i:i+chunk_size]
-            response = supabase.table("stock_analysis_results").insert(chunk).execute()
+        # stock_analysis_results 테이블 전체 삭제 후 청크 단위로 새로 삽입 (쓰기 저널로 재개 가능)
+        saved = replace_table_records("stock_analysis_results", result_df)
 
-        print(f"{len(records)}개의 분석 결과가 데이터베이스에 저장되었습니다.")
+        print(f"{saved}개의 분석 결과가 데이터베이스에 저장되었습니다.")
     except Exception as e:
         print(f"데이터베이스 저장 오류: {e}")
 
@@ -6,6 +6,9 @@ import numpy as np
 import time
 import os
 from dotenv import load_dotenv
+from app.utils.telemetry import collection_telemetry
+from app.utils.rate_limiter import get_rate_limiter
+from app.services.ohlcv_store import OHLCV_FIELDS, covers, load_ohlcv, store_ohlcv
 
 # .env 파일 로드
 load_dotenv()
@@ -16,6 +19,10 @@ api_key = os.getenv('FRED_API_KEY', '')
 if not api_key:
     raise ValueError("FRED_API_KEY가 .env 파일에 설정되어 있어야 합니다.")
 
+# 외부 데이터 제공자 주소 (오프라인 벤치마크 시 app.utils.replay_server 주소로 지정)
+FRED_BASE_URL = os.getenv('FRED_BASE_URL', 'https://api.stlouisfed.org').rstrip('/')
+YAHOO_CHART_BASE_URL = os.getenv('YAHOO_CHART_BASE_URL', 'https://query1.finance.yahoo.com').rstrip('/')
+
 # FRED에서 제공하는 지표 코드와 명칭
 fred_indicators = {
     'T10YIE': '10년 기대 인플레이션율',  # 10년 만기 기대 인플레이션율 (일간)
@@ -140,81 +147,380 @@ result_df = None
 # yfinance.py에서 가져온 함수
 def download_yahoo_chart(symbol, start_date, end_date, interval="1d"):
     """
-    Yahoo Finance Chart API를 통해 주어진 symbol의 종가(Close) 시계열을 가져옵니다.
+    Yahoo Finance Chart API를 통해 주어진 symbol의 시가/고가/저가/종가/거래량(OHLCV) 시계열을
+    한 번의 요청으로 가져옵니다.
     - symbol: Yahoo Finance 티커 문자열 (예: "^GSPC", "AAPL")
     - start_date: 시작일 (YYYY-MM-DD)
     - end_date: 종료일 (YYYY-MM-DD)
     - interval: "1d", "1wk", "1mo"
+
+    반환: OHLCV_FIELDS 컬럼을 가진 날짜 인덱스 데이터프레임
     """
     sess = requests.Session()
     sess.headers.update({
         "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64)"
     })
     
-    # 날짜 범위로 변환
-    start_dt = datetime.strptime(start_date, '%Y-%m-%d')
-    end_dt = datetime.strptime(end_date, '%Y-%m-%d')
-    delta = end_dt - start_dt
-    
-    # 범위 문자열 결정 (차이가 1달 이하이면 1mo, 3달 이하이면 3mo, 6달 이하이면 6mo, 그 이상이면 max)
-    if delta.days <= 30:
-        range_str = "1mo"
-    elif delta.days <= 90:
-        range_str = "3mo"
-    elif delta.days <= 180:
-        range_str = "6mo"
-    elif delta.days <= 365:
-        range_str = "1y"
-    elif delta.days <= 730:
-        range_str = "2y"
-    elif delta.days <= 1825:
-        range_str = "5y"
-    else:
-        range_str = "max"
+    # 조회 기간을 UTC 기준 epoch 초로 지정 (range 문자열은 오늘 기준이라 과거 구간 백필에 쓸 수 없음)
+    period1 = int(pd.Timestamp(start_date, tz='UTC').timestamp())
+    period2 = int((pd.Timestamp(end_date, tz='UTC') + pd.Timedelta(days=1)).timestamp())
     
-    url = f"https://query1.finance.yahoo.com/v8/finance/chart/{symbol}"
+    url = f"{YAHOO_CHART_BASE_URL}/v8/finance/chart/{symbol}"
     params = {
-        "range": range_str,
+        "period1": period1,
+        "period2": period2,
         "interval": interval,
         "includePrePost": "false",
         "events": "div|split"
     }
     
-    r = sess.get(url, params=params)
-    r.raise_for_status()
-    result = r.json().get("chart", {}).get("result", [None])[0]
-    if not result:
-        raise ValueError(f"No data for symbol: {symbol}")
+    with collection_telemetry.track("yahoo", symbol) as call:
+        r = call.response(get_rate_limiter("yahoo").call(lambda: sess.get(url, params=params), tracker=call))
+        r.raise_for_status()
+        result = r.json().get("chart", {}).get("result", [None])[0]
+        if not result:
+            raise ValueError(f"No data for symbol: {symbol}")
     
-    timestamps = result["timestamp"]
-    closes = result["indicators"]["quote"][0]["close"]
+        timestamps = result.get("timestamp") or []
+        quote = result["indicators"]["quote"][0]
     
-    # 시작 - 수정된 부분: 날짜만 사용하도록 처리
-    # 각 타임스탬프를 datetime으로 변환하고 날짜 부분만 사용
-    date_only = [pd.Timestamp.fromtimestamp(ts).date() for ts in timestamps]
+        # 시작 - 수정된 부분: 날짜만 사용하도록 처리
+        # 각 타임스탬프를 datetime으로 변환하고 날짜 부분만 사용
+        date_only = [pd.Timestamp.fromtimestamp(ts).date() for ts in timestamps]
     
-    # 데이터프레임 생성 시 날짜만 포함하도록 수정
-    df = pd.DataFrame({
-        "Close": closes
-    }, index=pd.DatetimeIndex(date_only))
+        # 데이터프레임 생성 시 날짜만 포함하도록 수정
+        # 지수/환율처럼 거래량이 없는 심볼은 해당 필드가 비어 있을 수 있음
+        df = pd.DataFrame({
+            field: pd.to_numeric(pd.Series(quote.get(field.lower()) or [None] * len(timestamps)), errors='coerce').to_numpy()
+            for field in OHLCV_FIELDS
+        }, index=pd.DatetimeIndex(date_only))
     
-    # 중복된 날짜가 있는 경우 마지막 값만 유지
-    if df.index.duplicated().any():
-        df = df[~df.index.duplicated(keep='last')]
-    # 종료 - 수정된 부분
+        # 중복된 날짜가 있는 경우 마지막 값만 유지
+        if df.index.duplicated().any():
+            df = df[~df.index.duplicated(keep='last')]
+        # 종료 - 수정된 부분
     
-    # 시작일과 종료일 사이의 데이터만 필터링
-    df = df[(df.index >= pd.Timestamp(start_date)) & (df.index <= pd.Timestamp(end_date))]
+        # 시작일과 종료일 사이의 데이터만 필터링
+        df = df[(df.index >= pd.Timestamp(start_date)) & (df.index <= pd.Timestamp(end_date))]
+        call.rows = len(df)
     
     return df
 
-def collect_economic_data(start_date='2006-01-01', end_date=None):
+def _download_ohlcv_close(name, ticker, start_date, end_date, sink=None):
+    """
+    티커의 OHLCV를 한 번에 내려받아 종가 시리즈를 반환합니다.
+    sink(호출자가 넘긴 딕셔너리)가 있으면 OHLCV 데이터프레임을 sink[name]에 담습니다.
+    (_collect_series 작업 함수로 사용)
+    """
+    df = download_yahoo_chart(ticker, start_date, end_date)
+    if sink is not None:
+        sink[name] = df
+    return df['Close']
+
+def collect_ohlcv(name_to_ticker, start_date, end_date):
+    """
+    종목별 OHLCV 데이터프레임을 반환합니다.
+
+    collect_economic_data가 매일 stock_daily_ohlcv에 기록한 OHLCV로 기간을 빠짐없이 덮는 종목은
+    DB에서 읽고, 기록이 없거나 빠진 날이 있는 종목만 종목당 한 번씩 새로 요청해 기록합니다.
+
+    Args:
+        name_to_ticker (dict): 컬럼명(한글 이름) → 티커
+        start_date (str): 시작일 (YYYY-MM-DD)
+        end_date (str): 종료일 (YYYY-MM-DD)
+
+    Returns:
+        dict: 컬럼명 → OHLCV 데이터프레임
+    """
+    try:
+        stored = load_ohlcv(name_to_ticker, start_date, end_date)
+    except Exception as e:
+        print(f"저장된 OHLCV 조회 실패, 전체 종목을 새로 요청합니다: {str(e)}")
+        stored = {}
+    frames = {name: df for name, df in stored.items() if covers(df, start_date, end_date)}
+    missing = {name: ticker for name, ticker in name_to_ticker.items() if name not in frames}
+
+    if missing:
+        print(f"OHLCV 수집: {len(missing)}개 종목 요청, {len(frames)}개 종목 저장된 데이터 사용 ({start_date} ~ {end_date})")
+        downloaded = {}
+        _collect_series(
+            "yahoo",
+            [(name, ticker,
+              lambda name=name, ticker=ticker: _download_ohlcv_close(name, ticker, start_date, end_date, downloaded))
+             for name, ticker in missing.items()],
+        )
+        try:
+            store_ohlcv(downloaded)
+        except Exception as e:
+            print(f"OHLCV 기록 실패: {str(e)}")
+        frames.update(downloaded)
+    else:
+        print(f"OHLCV 수집: 저장된 데이터 사용 ({len(name_to_ticker)}개 종목)")
+
+    return {name: frames[name] for name in name_to_ticker if name in frames}
+
+def build_ohlcv_field_frame(frames, field):
+    """
+    종목별 OHLCV 데이터프레임에서 한 필드(예: "Volume")만 모아 날짜 × 종목 데이터프레임을 만듭니다.
+
+    Args:
+        frames (dict): 컬럼명 → OHLCV 데이터프레임
+        field (str): OHLCV_FIELDS 중 하나
+
+    Returns:
+        pd.DataFrame: 날짜 인덱스, 컬럼명 컬럼
+    """
+    columns = {name: df[field] for name, df in frames.items() if not df.empty}
+    if not columns:
+        return pd.DataFrame()
+    return pd.concat(columns, axis=1).sort_index()
+
+def _to_day_array(index):
+    """DatetimeIndex를 시간대/시간 정보가 제거된 datetime64[D] 배열로 변환합니다."""
+    index = pd.DatetimeIndex(index)
+    if index.tz is not None:
+        index = index.tz_localize(None)
+    return index.values.astype('datetime64[D]')
+
+def build_trading_day_index(series_list):
+    """
+    시장 데이터 시리즈들의 관측일 합집합으로 공유 거래일 인덱스를 만듭니다.
+
+    Args:
+        series_list (list): 날짜 인덱스를 가진 pd.Series 목록
+
+    Returns:
+        np.ndarray | None: 정렬된 datetime64[D] 배열. 시리즈가 없으면 None.
+    """
+    day_arrays = [_to_day_array(series.index) for series in series_list if len(series) > 0]
+    if not day_arrays:
+        return None
+    return np.unique(np.concatenate(day_arrays))
+
+def assemble_aligned_frame(sources, index=None, dtype=np.float32):
+    """
+    여러 시리즈를 미리 할당한 하나의 (날짜 × 시리즈) 행렬로 조립합니다.
+
+    시리즈마다 일간 리샘플링하고 pd.concat으로 외부 결합하는 대신,
+    각 관측값을 searchsorted로 공유 인덱스의 행에 as-of 정렬하여 배치한 뒤
+    전진 채우기(ffill)를 전체 배열에 대해 한 번만 수행합니다.
+    관측일이 인덱스에 없으면(예: 주말에 발표된 FRED 지표) 그 다음 거래일 행에 배치되고,
+    같은 행에 여러 관측이 겹치면 가장 마지막 관측값을 사용합니다.
+    마지막 거래일보다 뒤의 관측은 배치할 다음 거래일 행이 없으므로 그 관측일을 인덱스 끝에 추가합니다.
+
+    Args:
+        sources (list): (컬럼명, pd.Series) 튜플 목록. 값은 숫자로 변환 가능해야 합니다.
+        index (np.ndarray, optional): 공유 거래일 인덱스(datetime64[D]).
+            지정하지 않으면 모든 시리즈의 관측일 합집합을 사용합니다.
+        dtype: 행렬 자료형 (기본값: float32)
+
+    Returns:
+        pd.DataFrame: 날짜 인덱스와 시리즈별 컬럼을 가진 데이터프레임
+    """
+    names = [name for name, _ in sources]
+    if index is None:
+        index = build_trading_day_index([series for _, series in sources])
+    if index is None:
+        return pd.DataFrame(columns=names, dtype=dtype)
+
+    observations = []
+    for _, series in sources:
+        if len(series) == 0:
+            observations.append(None)
+            continue
+        days = _to_day_array(series.index)
+        values = pd.to_numeric(pd.Series(series.to_numpy()), errors='coerce').to_numpy(dtype=np.float64)
+
+        # 결측 관측은 버리고 날짜 순으로 정렬 (같은 날짜는 원래 순서 유지)
+        valid = ~np.isnan(values)
+        days, values = days[valid], values[valid]
+        order = np.argsort(days, kind='stable')
+        observations.append((days[order], values[order]))
+
+    # 마지막 거래일 이후의 관측일(예: 마지막 거래일 다음 날 발표된 FRED 지표)을 인덱스 끝에 추가
+    last_day = index[-1] if len(index) else None
+    trailing = [days if last_day is None else days[days > last_day] for days, _ in filter(None, observations)]
+    if trailing:
+        index = np.concatenate([index, np.unique(np.concatenate(trailing))])
+
+    n_rows, n_cols = len(index), len(sources)
+    matrix = np.full((n_rows, n_cols), np.nan, dtype=dtype)
+
+    for col, observed in enumerate(observations):
+        if observed is None:
+            continue
+        days, values = observed
+
+        # as-of 정렬: 관측일 이후의 첫 거래일 행에 배치
+        rows = np.searchsorted(index, days, side='left')
+        if len(rows) == 0:
+            continue
+
+        # 같은 행에 여러 관측이 떨어지면 마지막 관측만 유지
+        last_in_row = np.append(rows[1:] != rows[:-1], True)
+        matrix[rows[last_in_row], col] = values[last_in_row]
+
+    # 전체 배열에 대해 한 번만 전진 채우기
+    filled_pos = np.where(~np.isnan(matrix), np.arange(n_rows, dtype=np.int32)[:, None], 0).astype(np.int32)
+    np.maximum.accumulate(filled_pos, axis=0, out=filled_pos)
+    matrix = matrix[filled_pos, np.arange(n_cols)]
+
+    return pd.DataFrame(matrix, index=pd.DatetimeIndex(index), columns=names)
+
+def fetch_fred_series(code, start_date, end_date):
+    """
+    FRED API에서 지표 하나의 관측값을 가져옵니다.
+
+    Returns:
+        pd.Series: 관측일 인덱스의 숫자 시리즈 ('.' 결측은 NaN). 관측값이 없으면 빈 시리즈.
+
+    Raises:
+        requests.HTTPError: 재시도 후에도 정상 응답을 받지 못한 경우
+    """
+    # 지표별 제공 주기에 따른 요청 주기 설정
+    if code in ['FEDFUNDS', 'UMCSENT', 'UNRATE', 'USREC', 'PCE', 'INDPRO',
+                'HOUST', 'UNEMPLOY', 'RSAFS', 'CPIENGSL', 'AHETPI', 'PPIACO', 'CPIAUCSL',
+                'CSUSHPINSA', 'DTWEXM']:
+        frequency = 'm'
+    elif code in ['STLFSI4', 'M2', 'MORTGAGE30US', 'MORTGAGE15US', 'MORTGAGE5US']:
+        frequency = 'w'
+    elif code in ['TDSP', 'A939RX0Q048SBEA', 'GDPC1', 'W019RCQ027SBEA', 'DRBLACBS']:
+        frequency = 'q'
+    else:
+        frequency = 'd'
+
+    url = f'{FRED_BASE_URL}/fred/series/observations'
+    params = {
+        'series_id': code,
+        'api_key': api_key,
+        'file_type': 'json',
+        'observation_start': start_date,
+        'observation_end': end_date,
+        'frequency': frequency
+    }
+    with collection_telemetry.track("fred", code) as call:
+        response = call.response(get_rate_limiter("fred").call(lambda: requests.get(url, params=params), tracker=call))
+        response.raise_for_status()
+        data = response.json().get('observations', [])
+        call.rows = len(data)
+
+    if not data:
+        return pd.Series(dtype='float64')
+
+    # '.'(결측) 값은 NaN으로 변환하고, 일간 리샘플링 없이 관측일 그대로 보관
+    # (거래일 정렬과 전진 채우기는 assemble_aligned_frame에서 한 번에 처리)
+    df = pd.DataFrame(data)[['date', 'value']]
+    values = pd.to_numeric(df['value'], errors='coerce')
+    return pd.Series(values.to_numpy(), index=pd.to_datetime(df['date']))
+
+def _collect_series(provider, jobs):
+    """
+    시리즈 수집 작업들을 순서대로 실행하고, 실패한 작업은 마지막에 한 번 더 재시도합니다.
+
+    요청 간격은 제공자별 적응형 속도 제한기가 조절하므로 고정 sleep을 두지 않습니다.
+    회로 차단기가 열려 실패한 작업은 쿨다운이 끝난 뒤 재시도 패스에서 다시 수집합니다.
+
+    Args:
+        provider (str): 속도 제한기 이름 ("fred", "yahoo")
+        jobs (list): (컬럼명, 원본 코드/티커, 시리즈를 반환하는 함수) 튜플 목록
+
+    Returns:
+        list: 작업 순서를 유지한 (컬럼명, pd.Series) 튜플 목록
+    """
+    collected = {}
+    deferred = []
+    for name, source_id, fetch in jobs:
+        try:
+            collected[name] = fetch()
+        except Exception as e:
+            print(f"Error downloading data for {source_id} ({name}): {e} → 재시도 대기열에 추가")
+            deferred.append((name, source_id, fetch))
+
+    if deferred:
+        print(f"{provider}: 실패한 {len(deferred)}개 시리즈 재시도 중...")
+        get_rate_limiter(provider).wait_until_closed()
+        for name, source_id, fetch in deferred:
+            try:
+                collected[name] = fetch()
+            except Exception as e:
+                print(f"Error downloading data for {source_id} ({name}): {e}")
+
+    results = []
+    for name, source_id, _ in jobs:
+        series = collected.get(name)
+        if series is None:
+            continue
+        if series.empty:
+            print(f"No data found for indicator {name} ({source_id}).")
+            continue
+        results.append((name, series))
+        print(f"{name}({source_id}) 수집 완료, {len(series)}개")
+    return results
+
+def collect_series_frame(start_date, end_date, columns=None, ohlcv=None):
+    """
+    FRED와 Yahoo Finance 시리즈를 수집해 거래일 기준 행렬로 조립합니다.
+
+    전역 상태(result_df, 텔레메트리 실행)를 건드리지 않으므로 백필 작업자가 구간별로 병렬 호출할 수 있습니다.
+
+    Args:
+        start_date (str): 시작일 (YYYY-MM-DD)
+        end_date (str): 종료일 (YYYY-MM-DD)
+        columns (iterable, optional): 수집할 컬럼명(한글 이름). 생략하면 전체 지표
+        ohlcv (dict, optional): 전달하면 컬럼명 → 종목별 OHLCV 데이터프레임을 채움
+
+    Returns:
+        pd.DataFrame | None: 거래일 인덱스의 데이터프레임. 수집된 시리즈가 없으면 None.
+    """
+    wanted = set(columns) if columns is not None else None
+
+    def selected(name):
+        return wanted is None or name in wanted
+
+    # FRED API를 통한 데이터 수집
+    print("FRED 경제 지표 수집 중...")
+    fred_series = _collect_series(
+        "fred",
+        [(name, code, lambda code=code: fetch_fred_series(code, start_date, end_date))
+         for code, name in fred_indicators.items() if selected(name)],
+    )
+    
+    # yfinance를 통한 데이터 수집 (yfinance.py의 방식으로 대체)
+    # 종목당 한 번의 요청으로 OHLCV를 받아 ohlcv에 담고, 행렬에는 종가만 사용
+    print("\nYahoo Finance 지표 데이터 수집 중...")
+    market_series = _collect_series(
+        "yahoo",
+        [(name, ticker,
+          lambda name=name, ticker=ticker: _download_ohlcv_close(name, ticker, start_date, end_date, ohlcv))
+         for name, ticker in yfinance_indicators.items() if selected(name)],
+    )
+    
+    # 나스닥 100 상위 종목 데이터 수집 (yfinance.py의 방식으로 대체)
+    print("\n나스닥 100 상위 종목 데이터 수집 중...")
+    market_series += _collect_series(
+        "yahoo",
+        [(name, ticker,
+          lambda name=name, ticker=ticker: _download_ohlcv_close(name, ticker, start_date, end_date, ohlcv))
+         for ticker, name in nasdaq_top_100 if selected(name)],
+    )
+    
+    # 모든 시리즈를 공유 거래일 인덱스 위의 하나의 행렬로 조립
+    # (시장 시리즈 없이 FRED 컬럼만 수집하는 경우 관측일 합집합을 인덱스로 사용)
+    all_series = fred_series + market_series
+    if not all_series:
+        return None
+    print("거래일 기준 행렬 조립 중...")
+    trading_days = build_trading_day_index([series for _, series in market_series])
+    return assemble_aligned_frame(all_series, index=trading_days)
+
+def collect_economic_data(start_date='2006-01-01', end_date=None, columns=None):
     """
     경제 데이터를 수집하는 메인 함수
     
     Args:
         start_date (str): 데이터 수집 시작 날짜 (YYYY-MM-DD 형식)
         end_date (str, optional): 데이터 수집 종료 날짜. 기본값은 현재 날짜.
+        columns (iterable, optional): 수집할 컬럼명(한글 이름). 기본값은 전체 지표.
     
     Returns:
         pd.DataFrame: 수집된 모든 경제 및 주식 데이터
@@ -226,149 +532,54 @@ def collect_economic_data(start_date='2006-01-01', end_date=None):
         end_date = datetime.today().strftime('%Y-%m-%d')
     
     print(f"경제 데이터 수집 시작: {start_date} ~ {end_date}")
+    run_id = collection_telemetry.start_run("collect_economic_data")
     
-    # FRED API를 통한 데이터 수집
-    print("FRED 경제 지표 수집 중...")
-    fred_data_frames = []
-    for code, name in fred_indicators.items():
-        # 지표별 제공 주기에 따른 요청 주기 설정
-        if code in ['FEDFUNDS', 'UMCSENT', 'UNRATE', 'USREC', 'PCE', 'INDPRO',
-                    'HOUST', 'UNEMPLOY', 'RSAFS', 'CPIENGSL', 'AHETPI', 'PPIACO', 'CPIAUCSL',
-                    'CSUSHPINSA', 'DTWEXM']:
-            frequency = 'm'
-        elif code in ['STLFSI4', 'M2', 'MORTGAGE30US', 'MORTGAGE15US', 'MORTGAGE5US']:
-            frequency = 'w'
-        elif code in ['TDSP', 'A939RX0Q048SBEA', 'GDPC1', 'W019RCQ027SBEA', 'DRBLACBS']:
-            frequency = 'q'
-        else:
-            frequency = 'd'
-    
-        url = f'https://api.stlouisfed.org/fred/series/observations'
-        params = {
-            'series_id': code,
-            'api_key': api_key,
-            'file_type': 'json',
-            'observation_start': start_date,
-            'observation_end': end_date,
-            'frequency': frequency
-        }
-        response = requests.get(url, params=params)
-    
-        if response.status_code == 200:
-            data = response.json().get('observations', [])
-            if data:
-                df = pd.DataFrame(data)[['date', 'value']]
-                df.columns = ['date', name]
-                df['date'] = pd.to_datetime(df['date']).dt.tz_localize(None)
-                fred_data_frames.append(df.set_index('date'))
-            else:
-                print(f"No data found for indicator {name} ({code}).")
+    try:
+        ohlcv = {}
+        frame = collect_series_frame(start_date, end_date, columns=columns, ohlcv=ohlcv)
+        if ohlcv:
+            # 거래량 수집(collect_ohlcv)이 같은 기간을 다시 내려받지 않도록 DB에 기록
+            try:
+                store_ohlcv(ohlcv)
+            except Exception as e:
+                print(f"OHLCV 기록 실패: {str(e)}")
+        if frame is not None:
+            result_df = frame
+            
+            # 결과 데이터프레임 로그 출력
+            print("\n=== 결과 데이터프레임 정보 ===")
+            print(f"행 수: {len(result_df)}")
+            print(f"열 수: {len(result_df.columns)}")
+            print("컬럼 목록:")
+            for col in result_df.columns:
+                print(f"  - {col}")
+            
+            print("\n=== 결과 데이터프레임 처음 5행 ===")
+            print(result_df.head())
+            
+            print("\n=== 결과 데이터프레임 마지막 5행 ===")
+            print(result_df.tail())
+            
+            print(f"\n데이터 수집 완료")
+            return result_df
         else:
-            print(f"Failed to fetch data for indicator {name} ({code}): {response.status_code}")
-    
-    # 데이터 빈도에 따른 리샘플링 처리
-    for i, df in enumerate(fred_data_frames):
-        if df.empty:
-            print(f"DataFrame {i} is empty, skipping resampling.")
-            continue
-        try:
-            inferred_freq = df.index.inferred_freq
-            # 빈도에 따라 일간 데이터로 변환
-            if inferred_freq in ['M', 'MS']:  # 월간 데이터
-                fred_data_frames[i] = df.resample('D').ffill()
-            elif inferred_freq in ['W', 'W-FRI']:  # 주간 데이터
-                fred_data_frames[i] = df.resample('D').ffill()
-            elif inferred_freq in ['Q', 'QS-OCT']:  # 분기 데이터
-                fred_data_frames[i] = df.resample('D').ffill()
-            elif inferred_freq in ['B']:  # 영업일 데이터
-                fred_data_frames[i] = df.resample('D').ffill()
-            else:
-                fred_data_frames[i] = df.resample('D').ffill()
-        except Exception as e:
-            print(f"Error processing DataFrame {i}: {e}")
-    
-    # yfinance를 통한 데이터 수집 (yfinance.py의 방식으로 대체)
-    print("\nYahoo Finance 지표 데이터 수집 중...")
-    yfinance_data_frames = []
-    for name, ticker in yfinance_indicators.items():
-        try:
-            # download_yahoo_chart 함수를 사용하여 데이터 수집
-            df = download_yahoo_chart(ticker, start_date, end_date)
-            if not df.empty:
-                df.columns = [name]  # 'Close' 컬럼명을 지표 이름으로 변경
-                df.index = df.index.tz_localize(None)  # 시간대 정보 제거
-                yfinance_data_frames.append(df)
-                print(f"{name}({ticker}) 수집 완료, {len(df)}개")
-            else:
-                print(f"No data found for indicator {name} ({ticker}).")
-        except Exception as e:
-            print(f"Error downloading data for {ticker} ({name}): {e}")
-        # 요청 간 간격을 두어 rate limit 방지
-        time.sleep(1)
-    
-    # 나스닥 100 상위 종목 데이터 수집 (yfinance.py의 방식으로 대체)
-    print("\n나스닥 100 상위 종목 데이터 수집 중...")
-    nasdaq_data_frames = []
-    for ticker, name in nasdaq_top_100:
-        try:
-            # download_yahoo_chart 함수를 사용하여 데이터 수집
-            df = download_yahoo_chart(ticker, start_date, end_date)
-            if not df.empty:
-                df.columns = [name]  # 'Close' 컬럼명을 종목 한글 이름으로 변경
-                df.index = df.index.tz_localize(None)  # 시간대 정보 제거
-                nasdaq_data_frames.append(df)
-                print(f"{name}({ticker}) 수집 완료, {len(df)}개")
-            else:
-                print(f"No data found for stock {name} ({ticker}).")
-        except Exception as e:
-            print(f"Error downloading data for {ticker} ({name}): {e}")
-        # 요청 간 간격을 두어 rate limit 방지
-        time.sleep(1)
-    
-    # 모든 데이터를 날짜 기준으로 외부 결합하여 하나의 데이터프레임으로 결합
-    all_data_frames = fred_data_frames + yfinance_data_frames + nasdaq_data_frames
-    if all_data_frames:
-        # 중복된 인덱스 처리
-        for i, df in enumerate(all_data_frames):
-            if df.index.duplicated().any():
-                all_data_frames[i] = df[~df.index.duplicated(keep='first')]
-        
-        # 결합
-        print("데이터프레임 병합 중...")
-        result_df = pd.concat(all_data_frames, axis=1, join='outer')
-    
-        # 결측치 및 비정상적인 값 처리
-        result_df.replace('.', pd.NA, inplace=True)
-        
-        # 결측치를 이전 값으로 채움
-        result_df.sort_index(inplace=True)
-        result_df.ffill(inplace=True)
-        
-        # 주요 수정: 날짜 인덱스의 시간 부분을 제거하고 일자만 남김
-        # 동일 날짜의 데이터가 여러 개 있는 경우, 마지막 데이터만 사용
-        print("날짜 인덱스 표준화 중...")
-        result_df.index = pd.to_datetime(result_df.index.date)  # 날짜만 남김
-        result_df = result_df[~result_df.index.duplicated(keep='last')]  # 중복 날짜 제거, 마지막 값 유지
-        
-        # 결과 데이터프레임 로그 출력
-        print("\n=== 결과 데이터프레임 정보 ===")
-        print(f"행 수: {len(result_df)}")
-        print(f"열 수: {len(result_df.columns)}")
-        print("컬럼 목록:")
-        for col in result_df.columns:
-            print(f"  - {col}")
-        
-        print("\n=== 결과 데이터프레임 처음 5행 ===")
-        print(result_df.head())
-        
-        print("\n=== 결과 데이터프레임 마지막 5행 ===")
-        print(result_df.tail())
-        
-        print(f"\n데이터 수집 완료")
-        return result_df
-    else:
-        print("No data collected for any indicators.")
-        return None
+            print("No data collected for any indicators.")
+            return None
+    finally:
+        # 수집 중 예외가 나도 실행을 종료해 작업자 스레드의 다음 작업에 남지 않게 함
+        _print_telemetry_summary(collection_telemetry.finish_run(run_id))
+
+def _print_telemetry_summary(summary):
+    """수집 실행의 제공자별 텔레메트리 요약을 출력합니다."""
+    if not summary:
+        return
+    print(f"\n=== 수집 텔레메트리 (run_id: {summary['run_id']}) ===")
+    for source, stats in summary["sources"].items():
+        latency = stats["latency_ms"]
+        print(f"  {source}: 요청 {stats['requests']}건, 실패 {stats['failures']}건, 빈 응답 {stats['empty']}건, "
+              f"재시도 {stats['retries']}회, {stats['bytes']:,} bytes, p50 {latency['p50']}ms, p95 {latency['p95']}ms")
+    for failed in summary["failed_series"]:
+        print(f"  누락 시리즈: {failed['source']}/{failed['series']} (status={failed['status']}, error={failed['error']})")
 
 # 스크립트가 직접 실행될 때만 데이터 수집 진행
 if __name__ == "__main__":
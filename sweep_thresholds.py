@@ -0,0 +1,4 @@
+from app.services.threshold_sweep import main
+
+if __name__ == "__main__":
+    main()
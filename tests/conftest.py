@@ -0,0 +1,39 @@
+"""
+테스트 공통 설정
+
+app.db 모듈은 가져올 때 설정된 백엔드로 DB 클라이언트를 만들므로,
+앱 모듈을 가져오기 전에 내장 SQLite(메모리) 백엔드와 임시 저널 디렉터리를 지정합니다.
+각 테스트는 자체 LocalClient와 WriteJournal을 만들어 사용합니다.
+"""
+import os
+import tempfile
+
+os.environ.setdefault("DB_BACKEND", "sqlite")
+os.environ.setdefault("LOCAL_DB_PATH", ":memory:")
+os.environ.setdefault("WRITE_JOURNAL_DIR", os.path.join(tempfile.mkdtemp(prefix="stockmaru-journal-"), "journal"))
+
+import pytest
+
+from app.db.journal import WriteJournal
+from app.db.local import LocalClient
+from app.db.read_cache import read_cache
+
+
+@pytest.fixture
+def client():
+    """테스트마다 새로 만드는 메모리 SQLite 클라이언트"""
+    return LocalClient(":memory:", engine="sqlite")
+
+
+@pytest.fixture
+def journal(tmp_path, client):
+    """임시 디렉터리에 기록하는 쓰기 저널"""
+    return WriteJournal(str(tmp_path / "journal"), client=client, max_failures=3)
+
+
+@pytest.fixture(autouse=True)
+def clear_read_cache():
+    """조회 캐시는 프로세스 전체에서 공유하므로 테스트 사이에 비웁니다."""
+    read_cache.invalidate()
+    yield
+    read_cache.invalidate()
@@ -0,0 +1,47 @@
+from app.db.queries import TableQuery
+from app.db.read_cache import read_cache
+
+TABLE = "indicator_history"
+
+
+def history_row(name, rsi):
+    return {"날짜": "2024-01-02", "종목": name, "RSI": rsi}
+
+
+def test_journal_write_invalidates_cached_reads(journal, client):
+    client.table(TABLE).upsert([history_row("애플", 40.0)], on_conflict="날짜,종목").execute()
+    query = TableQuery(TABLE, ["종목", "RSI"], client=client).cached()
+    assert query.fetch() == [{"종목": "애플", "RSI": 40.0}]
+
+    # 캐시를 거치지 않고 바뀐 값은 TTL 동안 보이지 않음
+    client.table(TABLE).upsert([history_row("애플", 41.0)], on_conflict="날짜,종목").execute()
+    assert query.fetch() == [{"종목": "애플", "RSI": 40.0}]
+
+    # 쓰기 저널로 반영하면 해당 테이블 캐시를 무효화
+    journal.execute("indicator_history", [
+        {"op": "upsert", "table": TABLE, "on_conflict": "날짜,종목", "rows": [history_row("애플", 42.0)]},
+    ])
+    assert query.fetch() == [{"종목": "애플", "RSI": 42.0}]
+    assert read_cache.stats()["tables"][TABLE]["invalidations"] >= 1
+
+
+def test_cache_key_separates_clients(client):
+    from app.db.local import LocalClient
+
+    other = LocalClient(":memory:", engine="sqlite")
+    client.table(TABLE).upsert([history_row("애플", 40.0)], on_conflict="날짜,종목").execute()
+    other.table(TABLE).upsert([history_row("테슬라", 55.0)], on_conflict="날짜,종목").execute()
+
+    assert TableQuery(TABLE, ["종목"], client=client).cached().fetch() == [{"종목": "애플"}]
+    assert TableQuery(TABLE, ["종목"], client=other).cached().fetch() == [{"종목": "테슬라"}]
+
+
+def test_cache_key_survives_client_release():
+    from app.db.local import LocalClient
+
+    # 캐시에 남은 결과가 해제된 클라이언트의 것이라도 새 클라이언트의 조회에 쓰이지 않아야 함
+    for rsi in (40.0, 41.0, 42.0):
+        client = LocalClient(":memory:", engine="sqlite")
+        client.table(TABLE).upsert([history_row("애플", rsi)], on_conflict="날짜,종목").execute()
+        assert TableQuery(TABLE, ["RSI"], client=client).cached().fetch() == [{"RSI": rsi}]
+        del client
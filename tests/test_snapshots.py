@@ -0,0 +1,66 @@
+import pytest
+
+from app.db.snapshots import SnapshotStore
+
+TABLE = "ticker_sentiment_analysis"
+
+
+class ManualWorker:
+    """게시 후 정리 작업을 바로 실행하지 않고 테스트가 직접 prune()을 호출하게 합니다."""
+
+    def __init__(self):
+        self.submitted = []
+
+    def submit(self, fn, *args, **kwargs):
+        self.submitted.append(fn)
+
+
+@pytest.fixture
+def store(client, journal):
+    return SnapshotStore(client=client, journal=journal, worker=ManualWorker())
+
+
+def sentiment(ticker, score):
+    return {"ticker": ticker, "average_sentiment_score": score, "article_count": 1,
+            "calculation_date": "2024-01-02T00:00:00"}
+
+
+def stored_run_ids(client):
+    return {row["run_id"] for row in client.table(TABLE).select("run_id").execute().data}
+
+
+def test_publish_then_prune_keeps_current_and_previous_run(store, client):
+    # 버전 도입 이전 행 (run_id 없음)
+    client.table(TABLE).insert([sentiment("AAPL", 0.5)]).execute()
+
+    first = store.publish(TABLE, [sentiment("AAPL", 0.1), sentiment("MSFT", 0.2)])
+    second = store.publish(TABLE, [sentiment("AAPL", 0.3)])
+    third = store.publish(TABLE, [sentiment("NVDA", 0.4)])
+    assert len(store.worker.submitted) == 3
+
+    removed = store.prune()
+    assert removed[TABLE] == 3  # 첫 버전 2행 + run_id 없는 이전 행 1행
+    assert stored_run_ids(client) == {second, third}
+    assert first not in stored_run_ids(client)
+
+    pointer = store.pointer(TABLE)
+    assert (pointer["run_id"], pointer["previous_run_id"], pointer["row_count"]) == (third, second, 1)
+
+
+def test_query_reads_only_published_version(store, client):
+    store.publish(TABLE, [sentiment("AAPL", 0.1), sentiment("MSFT", 0.2)])
+    store.publish(TABLE, [sentiment("AAPL", 0.3)])
+
+    rows = store.query(TABLE, ["ticker", "average_sentiment_score"]).fetch()
+    assert rows == [{"ticker": "AAPL", "average_sentiment_score": 0.3}]
+
+
+def test_query_without_pointer_reads_latest_row_per_ticker(store, client):
+    client.table(TABLE).insert([
+        {**sentiment("AAPL", 0.1), "created_at": "2024-01-01T00:00:00"},
+        {**sentiment("AAPL", 0.2), "created_at": "2024-01-02T00:00:00"},
+        {**sentiment("MSFT", 0.3), "created_at": "2024-01-01T00:00:00"},
+    ]).execute()
+
+    rows = store.query(TABLE, ["ticker", "average_sentiment_score"]).fetch()
+    assert sorted((row["ticker"], row["average_sentiment_score"]) for row in rows) == [("AAPL", 0.2), ("MSFT", 0.3)]
@@ -0,0 +1,90 @@
+import os
+
+import pytest
+
+from app.db.journal import WriteJournal
+
+
+class FlakyClient:
+    """fail_at번째 table() 호출에서 예외를 발생시켜 반영 도중 종료된 상황을 흉내 냅니다."""
+
+    def __init__(self, client, fail_at):
+        self.client = client
+        self.fail_at = fail_at
+        self.calls = 0
+
+    def table(self, name):
+        self.calls += 1
+        if self.calls == self.fail_at:
+            raise RuntimeError("connection reset")
+        return self.client.table(name)
+
+
+def insert_batches(table, count, size=2):
+    return [
+        {"op": "insert", "table": table, "rows": [{"batch": b, "seq": i} for i in range(size)]}
+        for b in range(count)
+    ]
+
+
+def journal_files(journal, suffix=".jsonl"):
+    if not os.path.isdir(journal.directory):
+        return []
+    return sorted(name for name in os.listdir(journal.directory) if name.endswith(suffix))
+
+
+def test_interrupted_entry_resumes_only_pending_batches(journal, client):
+    entry = journal.plan("ingest", insert_batches("events", 3))
+    with pytest.raises(RuntimeError):
+        journal.run(entry, client=FlakyClient(client, fail_at=2))
+
+    pending = journal.pending("ingest")
+    assert [e.pending_batches for e in pending] == [[1, 2]]
+
+    # insert 배치는 다시 반영하면 중복되므로, 완료된 배치 0이 한 번만 기록됐는지 확인
+    assert journal.recover("ingest") == 4
+    rows = client.table("events").select("batch").execute().data
+    assert sorted(row["batch"] for row in rows) == [0, 0, 1, 1, 2, 2]
+    assert journal_files(journal) == []
+
+
+def test_failing_batch_is_quarantined_after_max_failures(journal, client):
+    journal.plan("broken", [{"op": "bogus", "table": "events"}])
+
+    for _ in range(journal.max_failures):
+        assert journal.recover("broken") == 0
+    assert len(journal_files(journal)) == 1
+
+    # 실패가 max_failures번 쌓이면 다음 조회에서 격리되고 복구 대상에서 빠짐
+    assert journal.pending("broken") == []
+    assert journal_files(journal) == []
+    assert len(journal_files(journal, ".quarantine")) == 1
+
+    # 격리된 작업이 같은 이름의 새 작업을 막지 않음
+    assert journal.execute("broken", insert_batches("events", 1)) == 2
+
+
+def test_recover_is_scoped_to_job(journal, client):
+    # predict.py처럼 작업 이름을 지정해 복구하면 다른 작업의 파일은 건드리지 않음
+    journal.plan("predicted_stocks", insert_batches("predicted", 1))
+    journal.plan("economic_ingest", insert_batches("economic", 1))
+
+    assert journal.recover("predicted_stocks") == 2
+    assert [entry.job for entry in journal.pending()] == ["economic_ingest"]
+    assert len(client.table("predicted").select("*").execute().data) == 2
+    assert len(journal_files(journal)) == 1
+
+
+def test_execute_replays_leftover_entry_before_new_work(tmp_path, client):
+    directory = str(tmp_path / "journal")
+    crashed = WriteJournal(directory, client=client)
+    entry = crashed.plan("sync", insert_batches("events", 2))
+    with pytest.raises(RuntimeError):
+        crashed.run(entry, client=FlakyClient(client, fail_at=2))
+
+    # 재시작한 프로세스의 저널이 남은 배치부터 반영한 뒤 새 작업을 실행
+    restarted = WriteJournal(directory, client=client)
+    restarted.execute("sync", insert_batches("events", 1))
+    rows = client.table("events").select("batch").execute().data
+    assert sorted(row["batch"] for row in rows) == [0, 0, 0, 0, 1, 1]
+    assert restarted.pending() == []